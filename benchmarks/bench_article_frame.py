@@ -0,0 +1,178 @@
+"""
+Compare the analytics data loaders for memory and load time: the former
+row-level frame (every article with object columns and Period columns) vs
+the per-day counts frame, with Period columns and as the dashboards'
+ArticleAggregates (period labels as strings).
+
+Articles are generated into a temporary SQLite file, so no MySQL server is
+needed; the GROUP BY runs in SQLite instead.
+
+Usage:
+    python benchmarks/bench_article_frame.py [--rows 1000000] [--days 1095] [--json results.json]
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+import fixtures  # noqa: F401  (puts project_file on sys.path)
+
+from dashboard_data import PERIOD_FREQUENCIES, ArticleAggregates, normalize_counts
+
+SITES = ['MoneyControl', 'ZeeBiz', 'Economic Times', 'Livemint', 'Entrackr', 'MNA Critique', 'ZeeBiz Economy']
+KEYWORDS = ['IPO', 'M&A', 'Demerger']
+
+ROWS_QUERY = """
+SELECT Scraped_Date, Website, Keyword, Title, Article_Link, inserted_at
+FROM IPO_Scraped_Articles
+ORDER BY Scraped_Date DESC
+"""
+
+COUNTS_QUERY = """
+SELECT Scraped_Date, Website, Keyword, COUNT(*) AS Count
+FROM IPO_Scraped_Articles
+GROUP BY Scraped_Date, Website, Keyword
+"""
+
+
+def build_database(path: str, rows: int, days: int) -> None:
+    """Write `rows` synthetic articles spread over `days` days."""
+    rng = random.Random(42)
+    start = date.today() - timedelta(days=days)
+    db = sqlite3.connect(path)
+    db.execute("""
+        CREATE TABLE IPO_Scraped_Articles (
+            id INTEGER PRIMARY KEY, Scraped_Date DATE, Website TEXT, Keyword TEXT,
+            Title TEXT, Article_Link TEXT, inserted_at TIMESTAMP)
+    """)
+    batch = []
+    for i in range(rows):
+        day = (start + timedelta(days=rng.randrange(days))).isoformat()
+        site = rng.choice(SITES)
+        batch.append((day, site, rng.choice(KEYWORDS),
+                      f"Company {i} files draft papers for Rs {i % 5000} crore IPO",
+                      f"https://{site.lower().replace(' ', '')}.example/news/{i}.html",
+                      f"{day} 10:00:00"))
+        if len(batch) == 100_000:
+            db.executemany("INSERT INTO IPO_Scraped_Articles VALUES (NULL, ?, ?, ?, ?, ?, ?)", batch)
+            batch = []
+    db.executemany("INSERT INTO IPO_Scraped_Articles VALUES (NULL, ?, ?, ?, ?, ?, ?)", batch)
+    db.commit()
+    db.close()
+
+
+def load_rows(db) -> pd.DataFrame:
+    """The row-level frame the dashboards used to load."""
+    df = pd.read_sql(ROWS_QUERY, db)
+    df['Scraped_Date'] = pd.to_datetime(df['Scraped_Date'])
+    df['inserted_at'] = pd.to_datetime(df['inserted_at'])
+    df['Year'] = df['Scraped_Date'].dt.year
+    df['Month'] = df['Scraped_Date'].dt.month
+    df['Week'] = df['Scraped_Date'].dt.isocalendar().week
+    df['Quarter'] = df['Scraped_Date'].dt.quarter
+    df['YearMonth'] = df['Scraped_Date'].dt.to_period('M')
+    df['YearWeek'] = df['Scraped_Date'].dt.to_period('W')
+    df['YearQuarter'] = df['Scraped_Date'].dt.to_period('Q')
+    return df
+
+
+def load_counts_object(db) -> pd.DataFrame:
+    """Per-day counts with object columns and Period columns per row."""
+    counts = pd.read_sql(COUNTS_QUERY, db)
+    counts['Scraped_Date'] = pd.to_datetime(counts['Scraped_Date'])
+    counts['YearMonth'] = counts['Scraped_Date'].dt.to_period('M')
+    counts['YearWeek'] = counts['Scraped_Date'].dt.to_period('W')
+    counts['YearQuarter'] = counts['Scraped_Date'].dt.to_period('Q')
+    return counts
+
+
+def load_counts_aggregates(db) -> ArticleAggregates:
+    """Per-day counts as ArticleAggregates, with every period label derived up front."""
+    aggregates = ArticleAggregates(normalize_counts(pd.read_sql(COUNTS_QUERY, db)))
+    for name in PERIOD_FREQUENCIES:
+        aggregates.period(name)
+    return aggregates
+
+
+def frame_nbytes(loaded) -> int:
+    """Deep memory of a loaded frame, including its period labels."""
+    if isinstance(loaded, ArticleAggregates):
+        return int(loaded.daily.memory_usage(deep=True).sum()
+                   + sum(loaded.period(name).memory_usage(deep=True) for name in PERIOD_FREQUENCIES))
+    return int(loaded.memory_usage(deep=True).sum())
+
+
+def rollups(loaded) -> None:
+    """The per-period, per-source and per-keyword series drawn by the dashboards."""
+    if isinstance(loaded, ArticleAggregates):
+        for name in PERIOD_FREQUENCIES:
+            for column in ('Website', 'Keyword'):
+                loaded.period_counts(name, column).unstack(fill_value=0)
+        loaded.counts_by('Website')
+        loaded.counts_by('Keyword')
+        return
+    value = 'Count' if 'Count' in loaded else None
+    for name in PERIOD_FREQUENCIES:
+        for column in ('Website', 'Keyword'):
+            grouped = loaded.groupby([name, column])
+            (grouped[value].sum() if value else grouped.size()).unstack(fill_value=0)
+    for column in ('Website', 'Keyword'):
+        loaded.groupby(column)[value].sum() if value else loaded[column].value_counts()
+
+
+def bench_loader(name: str, loader, db, repeat: int) -> dict:
+    load_times, rollup_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        loaded = loader(db)
+        load_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        rollups(loaded)
+        rollup_times.append(time.perf_counter() - start)
+    frame = loaded.daily if isinstance(loaded, ArticleAggregates) else loaded
+    return {
+        'loader': name,
+        'frame_rows': len(frame),
+        'memory_mb': round(frame_nbytes(loaded) / 1024 / 1024, 2),
+        'load_s': round(min(load_times), 3),
+        'rollups_s': round(min(rollup_times), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark analytics frame loaders.")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--days', type=int, default=1095, help="Days of history the articles are spread over")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'articles.db')
+        start = time.perf_counter()
+        build_database(path, args.rows, args.days)
+        print(f"Generated {args.rows:,} articles over {args.days} days in {time.perf_counter() - start:.1f}s")
+
+        db = sqlite3.connect(path)
+        results = []
+        for name, loader in (('rows', load_rows), ('counts-object', load_counts_object),
+                             ('aggregates', load_counts_aggregates)):
+            result = bench_loader(name, loader, db, args.repeat)
+            results.append(result)
+            print(f"{result['loader']:>14}: {result['frame_rows']:>9,} rows  {result['memory_mb']:>9.2f} MB  "
+                  f"load {result['load_s']:.3f}s  roll-ups {result['rollups_s']:.4f}s")
+        db.close()
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'rows': args.rows, 'days': args.days, 'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
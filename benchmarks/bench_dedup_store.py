@@ -0,0 +1,99 @@
+"""
+Compare the duplicate-index stores (plain set of normalized strings vs
+FingerprintSet) for memory and lookup time at 1M and 10M articles.
+
+Usage:
+    python benchmarks/bench_dedup_store.py [--sizes 1000000 10000000] [--lookups 200000]
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+import fixtures  # noqa: F401  (puts project_file on sys.path)
+
+from dedup_index import FingerprintSet
+
+
+def synthetic_title(i: int) -> str:
+    """Normalized headline-like string, unique per i (~60-80 characters)."""
+    return f"company {i} announces ipo of {i % 997} lakh shares worth rs {i * 7 % 100003} crore"
+
+
+def set_nbytes(store: set) -> int:
+    """Memory held by a set of strings: the table plus every string object."""
+    return sys.getsizeof(store) + sum(sys.getsizeof(item) for item in store)
+
+
+def bench_store(kind: str, size: int, lookups: int) -> dict:
+    """Build a store of `size` titles, then time hit and miss lookups."""
+    start = time.perf_counter()
+    if kind == 'set':
+        store = {synthetic_title(i) for i in range(size)}
+    else:
+        store = FingerprintSet()
+        store.update(synthetic_title(i) for i in range(size))
+    build_s = time.perf_counter() - start
+
+    memory = set_nbytes(store) if kind == 'set' else store.nbytes()
+
+    rng = random.Random(42)
+    hits = [synthetic_title(rng.randrange(size)) for _ in range(lookups)]
+    misses = [synthetic_title(size + rng.randrange(size)) for _ in range(lookups)]
+
+    start = time.perf_counter()
+    found = sum(1 for title in hits if title in store)
+    hit_us = (time.perf_counter() - start) / lookups * 1e6
+    start = time.perf_counter()
+    false_hits = sum(1 for title in misses if title in store)
+    miss_us = (time.perf_counter() - start) / lookups * 1e6
+
+    # Incremental inserts through the buffered add() path
+    start = time.perf_counter()
+    for i in range(size, size + lookups):
+        store.add(synthetic_title(i))
+    add_us = (time.perf_counter() - start) / lookups * 1e6
+
+    return {
+        'store': kind,
+        'size': size,
+        'build_s': round(build_s, 2),
+        'memory_mb': round(memory / 1024 / 1024, 1),
+        'bytes_per_entry': round(memory / size, 1),
+        'hit_lookup_us': round(hit_us, 3),
+        'miss_lookup_us': round(miss_us, 3),
+        'add_us': round(add_us, 3),
+        'hits_found': found == lookups,
+        'false_positives': false_hits,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark duplicate-index stores.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--lookups', type=int, default=200_000)
+    parser.add_argument('--stores', nargs='+', default=['set', 'fingerprint'])
+    parser.add_argument('--json', help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'Store':<12}{'Size':>12}{'Build s':>9}{'Memory MB':>11}{'B/entry':>9}"
+          f"{'Hit us':>8}{'Miss us':>9}{'Add us':>8}{'False+':>8}")
+    print("-" * 86)
+    for size in args.sizes:
+        for kind in args.stores:
+            row = bench_store(kind, size, args.lookups)
+            results.append(row)
+            print(f"{row['store']:<12}{row['size']:>12,}{row['build_s']:>9}{row['memory_mb']:>11}"
+                  f"{row['bytes_per_entry']:>9}{row['hit_lookup_us']:>8}{row['miss_lookup_us']:>9}"
+                  f"{row['add_us']:>8}{row['false_positives']:>8}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
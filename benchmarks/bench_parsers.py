@@ -0,0 +1,137 @@
+"""
+Compare HTML parser backends on source pages.
+
+Pages are deterministic synthetic ones (fixtures.synthetic_page) unless
+--pages-dir points at pages recorded with --record. For every site with a
+page, reports parse time, extract time and
+peak Python-heap memory per backend, and checks that each backend produces
+the same (url, title) pairs as the default html.parser backend. A built-in
+UTF-8 page without a <meta charset> is always included, so the check also
+covers pages whose encoding the parser has to detect.
+
+Usage:
+    python benchmarks/bench_parsers.py [--repeat 20] [--json results.json]
+    python benchmarks/bench_parsers.py --record      # capture live pages once (needs network)
+    python benchmarks/bench_parsers.py --pages-dir benchmarks/pages
+"""
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+from typing import Optional
+
+from fixtures import DEFAULT_PAGES_DIR, OfflineScraper, load_pages, record_pages, synthetic_pages
+
+from html_parsers import PARSER_BACKENDS
+
+# UTF-8 headlines with no charset in the page (served without one in the headers either)
+UNDECLARED_CHARSET_SITE = 'MoneyControl'
+UNDECLARED_CHARSET_PAGE = """<!DOCTYPE html>
+<html><head><title>Markets</title></head><body>
+<h2><a href="/news/ipo-1.html">Café Coffee Day lenders file ₹1,200 crore claim – IPO plans on hold</a></h2>
+<h3><a href="/news/ipo-2.html">Zomato’s “quick commerce” arm eyes listing; bankers say ₹8,000 crore</a></h3>
+<div class="item"><a href="/news/ipo-3.html">Nestlé India demerger: what shareholders get — explained</a></div>
+</body></html>
+""".encode('utf-8')
+
+
+def time_call(func, repeat: int) -> float:
+    """Median wall time of func() in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def peak_memory_kb(func) -> float:
+    """Peak Python-heap allocation of one func() call in KB (libxml2 memory is not tracked)."""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def benchmark(pages_dir: Optional[str], repeat: int) -> list:
+    """Run every backend over every page (synthetic without pages_dir) and collect one result row per pair."""
+    scrapers = {name: OfflineScraper({'html_parser': name}) for name in PARSER_BACKENDS}
+    site_names = next(iter(scrapers.values())).urls
+    pages = synthetic_pages(site_names) if pages_dir is None else load_pages(site_names, pages_dir)
+    cases = [(site_name, site_name, content) for site_name, content in pages.items()]
+    cases.append((f"{UNDECLARED_CHARSET_SITE} (no charset)", UNDECLARED_CHARSET_SITE, UNDECLARED_CHARSET_PAGE))
+    results = []
+
+    for label, site_name, content in cases:
+        url = scrapers['html.parser'].urls[site_name]
+        baseline = None
+
+        for backend_name, scraper in scrapers.items():
+            document = scraper.parser.parse(content)
+            articles, _ = scraper.extract_site_articles(site_name, document, url)
+            if baseline is None:
+                baseline = articles
+
+            parse_ms = time_call(lambda: scraper.parser.parse(content), repeat)
+            extract_ms = time_call(lambda: scraper.extract_site_articles(site_name, document, url), repeat)
+            peak_kb = peak_memory_kb(
+                lambda: scraper.extract_site_articles(site_name, scraper.parser.parse(content), url)
+            )
+
+            results.append({
+                'site': label,
+                'backend': backend_name,
+                'page_kb': round(len(content) / 1024, 1),
+                'parse_ms': round(parse_ms, 3),
+                'extract_ms': round(extract_ms, 3),
+                'peak_kb': round(peak_kb, 1),
+                'articles': len(articles),
+                'matches_baseline': articles == baseline,
+            })
+
+    for scraper in scrapers.values():
+        scraper.close_connection()
+    return results
+
+
+def print_results(results: list) -> None:
+    """Print a per-site, per-backend table."""
+    print(f"\n{'Site':<28}{'Backend':<13}{'Page KB':>9}{'Parse ms':>10}{'Extract ms':>12}"
+          f"{'Peak KB':>10}{'Articles':>10}  Same output")
+    print("-" * 104)
+    for row in results:
+        print(f"{row['site']:<28}{row['backend']:<13}{row['page_kb']:>9}{row['parse_ms']:>10}"
+              f"{row['extract_ms']:>12}{row['peak_kb']:>10}{row['articles']:>10}  "
+              f"{'yes' if row['matches_baseline'] else 'NO'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends on source pages.")
+    parser.add_argument('--pages-dir', help="Use pages recorded in this directory instead of synthetic ones "
+                                            f"(--record writes to {DEFAULT_PAGES_DIR} unless given)")
+    parser.add_argument('--record', action='store_true', help="Record pages from the live sites first")
+    parser.add_argument('--repeat', type=int, default=20, help="Timing repetitions per measurement")
+    parser.add_argument('--json', help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    if args.record:
+        args.pages_dir = args.pages_dir or DEFAULT_PAGES_DIR
+        record_pages(args.pages_dir)
+
+    results = benchmark(args.pages_dir, args.repeat)
+    if not results:
+        return
+    print_results(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Shared helpers for the offline benchmarks: deterministic synthetic source
+pages (the default input), recording pages from the live sites once and
+loading them back, building a scraper that never touches MySQL or the
+network, and an in-memory stand-in for the articles table.
+"""
+import html
+import os
+import random
+import re
+import sqlite3
+import sys
+from typing import Callable, Dict, Iterable, List, Optional
+
+import mysql.connector
+
+PROJECT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'project_file')
+sys.path.insert(0, os.path.abspath(PROJECT_DIR))
+
+from financial_news_tracker import NewsArticleScraper  # noqa: E402
+
+DEFAULT_PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pages')
+
+
+class OfflineScraper(NewsArticleScraper):
+    """NewsArticleScraper that skips the MySQL connection (db may be injected later)."""
+
+    def __init__(self, scraper_config: Optional[dict] = None, db=None):
+        self._injected_db = db
+        config = {'conditional_get': False, 'http_cache_path': None, 'dedup_snapshot_path': None,
+                  **(scraper_config or {})}
+        super().__init__({}, config)
+
+    def connect_to_database(self) -> None:
+        self.db = self._injected_db
+
+
+def site_slug(site_name: str) -> str:
+    """File-system friendly name for a site, e.g. 'ZeeBiz Economy' -> 'zeebiz_economy'."""
+    return site_name.lower().replace(' ', '_')
+
+
+def record_pages(pages_dir: str = DEFAULT_PAGES_DIR) -> None:
+    """Fetch every configured source once and store the raw HTML under pages_dir."""
+    scraper = OfflineScraper()
+    os.makedirs(pages_dir, exist_ok=True)
+    for site_name, url in scraper.urls.items():
+        response = scraper.fetch_page(url, timeout=scraper.config['request_timeout'])
+        if response is None:
+            print(f"Skipping {site_name}: fetch failed")
+            continue
+        path = os.path.join(pages_dir, f"{site_slug(site_name)}.html")
+        with open(path, 'wb') as f:
+            f.write(response.content)
+        print(f"Recorded {site_name} -> {path} ({len(response.content) / 1024:.1f} KB)")
+    scraper.close_connection()
+
+
+def load_pages(site_names: Iterable[str], pages_dir: str = DEFAULT_PAGES_DIR) -> Dict[str, bytes]:
+    """Load recorded pages keyed by site name, for every site that has one."""
+    pages = {}
+    for site_name in site_names:
+        path = os.path.join(pages_dir, f"{site_slug(site_name)}.html")
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                pages[site_name] = f.read()
+    if not pages:
+        print(f"No recorded pages found in {pages_dir}. Run with --record first.")
+    return pages
+
+
+COMPANIES = [
+    'Tata Technologies', 'Nestlé India', 'Zomato', 'Paytm', 'Ola Electric', 'Swiggy', 'Hyundai Motor India',
+    'Bajaj Housing Finance', 'Mamaearth', 'boAt', 'PhysicsWallah', 'Lenskart', 'Reliance Retail',
+    'JSW Cement', 'Vedanta', 'ITC Hotels', 'Raymond Lifestyle', 'Zee Entertainment', 'Infosys', 'HDFC Bank',
+]
+UNITS = ['consumer', 'cement', 'hotels', 'realty', 'lifestyle', 'power', 'logistics']
+SECTORS = ['IT', 'banking', 'auto', 'pharma', 'metal', 'FMCG']
+
+# Headline templates by the way the scraper classifies them: a keyword
+# category, an exclusion keyword on top of one, or no keyword at all
+RELEVANT_TITLES = [
+    "{company} files draft papers for ₹{amount} crore IPO",
+    "{company} IPO: price band fixed at ₹{price}–{price_high} per share",
+    "{company} acquires {other} in ₹{amount} crore all-cash transaction",
+    "{company} completes merger with {other}; shareholders get {ratio} shares",
+    "{company} board approves demerger of its {unit} business",
+    "{company} to restructure {unit} arm ahead of listing",
+]
+EXCLUDED_TITLES = [
+    "{company} IPO opens today: grey market premium and subscription status on day one",
+    "Cricket sponsor {company} plans ₹{amount} crore IPO",
+    "{company} merger offer: festive sale discounts extended",
+]
+IRRELEVANT_TITLES = [
+    "Sensex ends {points} points higher as {sector} stocks gain",
+    "RBI keeps repo rate unchanged at {rate}%, says governor",
+    "{company} Q{quarter} profit rises {percent}% to ₹{amount} crore",
+    "Rupee settles {paise} paise lower at {fx} against US dollar",
+    "{company}’s “next phase” of growth: CEO outlines capex plans",
+]
+
+
+def synthetic_title(rng: random.Random) -> str:
+    """One headline: about a third relevant, a tenth excluded, the rest without keywords."""
+    roll = rng.random()
+    templates = RELEVANT_TITLES if roll < 0.35 else EXCLUDED_TITLES if roll < 0.45 else IRRELEVANT_TITLES
+    company, other = rng.sample(COMPANIES, 2)
+    price = rng.randrange(50, 900)
+    return rng.choice(templates).format(
+        company=company, other=other, unit=rng.choice(UNITS), sector=rng.choice(SECTORS),
+        amount=f"{rng.randrange(100, 20000):,}", price=price, price_high=price + rng.randrange(5, 40),
+        ratio=f"{rng.randrange(1, 20)}:{rng.randrange(1, 10)}", points=rng.randrange(10, 900),
+        rate=f"{rng.choice([6.25, 6.5, 6.75])}", quarter=rng.randrange(1, 5), percent=rng.randrange(1, 80),
+        paise=rng.randrange(1, 40), fx=f"{rng.uniform(82, 88):.2f}",
+    )
+
+
+def slugify(title: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')
+
+
+# Markup for one headline per site, matching the selectors of its extract_articles_* method
+STORY_MARKUP: Dict[str, Callable[[str, str], str]] = {
+    'MoneyControl': lambda href, title: (
+        f'<li class="clearfix"><div class="item"><h2><a href="{href}" title="{title}">{title}</a></h2>'
+        f'<p>{title} — full story inside.</p></div></li>'),
+    'ZeeBiz Economy': lambda href, title: (
+        f'<div class="section-article"><a class="swdetl-mrgn0" href="{href}">{title}</a></div>'),
+    'ZeeBiz': lambda href, title: f'<div class="news-block"><h3><a href="{href}">{title}</a></h3></div>',
+    'Economic Times': lambda href, title: (
+        f'<div class="eachStory"><h3><a href="{href}">{title}</a></h3>'
+        f'<a href="javascript:void(0)" class="share">Share</a></div>'),
+    'MNA Critique': lambda href, title: (
+        f'<article class="post"><h2 class="entry-title"><a href="{href}" rel="bookmark">{title}</a></h2>'
+        f'<div class="entry-summary"><p>{title}.</p></div></article>'),
+    'Entrackr': lambda href, title: f'<div class="post"><a href="{href}"><h2>{title}</h2></a></div>',
+    'Livemint': lambda href, title: (
+        f'<div class="listingNew"><h2 class="imgStory"><a href="{href}">{title}</a></h2>'
+        f'<a href="#comments">Comments</a></div>'),
+}
+
+
+def synthetic_page(site_name: str, articles: int = 60, seed: int = 0, filler_kb: int = 150) -> bytes:
+    """
+    A deterministic listing page for one source: a navigation bar, `articles`
+    headlines in the site's markup (a few repeated in a trending box, as live
+    pages do), inline scripts and about filler_kb of unrelated markup.
+    UTF-8 without a <meta charset>, like several of the live sources.
+    """
+    rng = random.Random(f"{seed}:{site_name}")
+    story = STORY_MARKUP[site_name]
+    stories = []
+    for _ in range(articles):
+        title = synthetic_title(rng)
+        stories.append((f"/news/business/{slugify(title)}-{rng.randrange(10 ** 7, 10 ** 8)}.html",
+                        html.escape(title)))
+
+    parts = ['<!DOCTYPE html><html><head><title>Business News</title>',
+             '<link rel="stylesheet" href="/static/site.css"></head><body>',
+             '<nav><ul>', *(f'<li><a href="/{section.lower()}">{section}</a></li>'
+                            for section in ['Markets', 'Economy', 'Companies', 'Tech', 'Opinion', 'Videos']),
+             '</ul></nav><main>']
+    parts.extend(story(href, title) for href, title in stories)
+    parts.append('<aside class="trending">')
+    parts.extend(story(href, title) for href, title in rng.sample(stories, min(5, len(stories))))
+    parts.append('</aside></main>')
+    parts.append(f'<script>window.__DATA__ = {{"site": "{site_name}", "stories": {len(stories)}}};</script>')
+
+    filler = []
+    size = 0
+    while size < filler_kb * 1024:
+        row = (f'<tr><td class="name">{rng.choice(COMPANIES)}</td><td>{rng.uniform(10, 5000):.2f}</td>'
+               f'<td class="chg">{rng.uniform(-5, 5):+.2f}%</td></tr>')
+        filler.append(row)
+        size += len(row)
+    parts.append(f'<section class="market-widget"><table>{"".join(filler)}</table></section>')
+    parts.append('<footer><p>© Business News. All rights reserved.</p></footer></body></html>')
+    return ''.join(parts).encode('utf-8')
+
+
+def synthetic_pages(site_names: Iterable[str], articles: int = 60, seed: int = 0) -> Dict[str, bytes]:
+    """Synthetic pages keyed by site name, for every site the generator knows."""
+    return {site_name: synthetic_page(site_name, articles, seed) for site_name in site_names
+            if site_name in STORY_MARKUP}
+
+
+# MySQL-only syntax used by the scraper, rewritten for SQLite
+SQL_REWRITES = [
+    (re.compile(r'%s'), '?'),
+    (re.compile(r'UNIX_TIMESTAMP\((\w+)\)'), r"CAST(strftime('%s', \1) AS INTEGER)"),
+    (re.compile(r'NOW\(\) - INTERVAL \? DAY'), "datetime('now', '-' || ? || ' days')"),
+    (re.compile(r'NOW\(\)'), 'CURRENT_TIMESTAMP'),
+    (re.compile(r'ON DUPLICATE KEY UPDATE id = id'), 'ON CONFLICT DO NOTHING'),
+]
+
+ARTICLES_TABLE = """
+CREATE TABLE IPO_Scraped_Articles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    Scraped_Date DATE NOT NULL,
+    Website TEXT NOT NULL,
+    Keyword TEXT NOT NULL,
+    Title TEXT NOT NULL,
+    Article_Link TEXT NOT NULL,
+    sent_status INTEGER DEFAULT 0,
+    inserted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    Title_Hash INTEGER UNIQUE,
+    Link_Hash INTEGER UNIQUE,
+    Cluster_Id INTEGER
+)
+"""
+
+
+def to_sqlite(query: str) -> str:
+    for pattern, replacement in SQL_REWRITES:
+        query = pattern.sub(replacement, query)
+    return query
+
+
+def to_sqlite_params(params) -> tuple:
+    """SQLite integers are signed 64-bit; store BIGINT UNSIGNED fingerprints as their signed equivalent."""
+    return tuple(value - 2 ** 64 if isinstance(value, int) and value >= 2 ** 63 else value for value in params)
+
+
+class InMemoryCursor:
+    """Cursor over InMemoryDatabase that accepts the scraper's MySQL queries."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._cursor = connection.cursor()
+
+    def execute(self, query: str, params=()) -> None:
+        try:
+            self._cursor.execute(to_sqlite(query), to_sqlite_params(params))
+        except sqlite3.Error as e:
+            raise mysql.connector.Error(msg=str(e))
+
+    def executemany(self, query: str, seq_params) -> None:
+        try:
+            self._cursor.executemany(to_sqlite(query), [to_sqlite_params(params) for params in seq_params])
+        except sqlite3.Error as e:
+            raise mysql.connector.Error(msg=str(e))
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self) -> None:
+        self._cursor.close()
+
+
+class InMemoryDatabase:
+    """
+    SQLite stand-in for the MySQL connection, holding only IPO_Scraped_Articles
+    (with the fingerprint and cluster columns). Enough for get_existing_articles,
+    load_recent_clusters and insert_into_db; the article text table is not supported.
+    """
+
+    def __init__(self):
+        self._connection = sqlite3.connect(':memory:', check_same_thread=False)
+        self._connection.execute(ARTICLES_TABLE)
+
+    def cursor(self, **kwargs) -> InMemoryCursor:
+        return InMemoryCursor(self._connection)
+
+    def commit(self) -> None:
+        self._connection.commit()
+
+    def rollback(self) -> None:
+        self._connection.rollback()
+
+    def is_connected(self) -> bool:
+        return True
+
+    def reconnect(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self._connection.close()
@@ -0,0 +1,327 @@
+"""
+Replay source pages through a full scraper run, offline.
+
+By default every source gets a deterministic synthetic page
+(fixtures.synthetic_page), so runs are comparable across machines and
+commits without network access; --pages-dir replays pages recorded with
+--record instead. Every source with a page is served from a local HTTP server (one server per original host, keeping the original
+path, so relative links and per-host limits behave as they do live). The
+scraper is pointed at those servers and run end to end against an in-memory
+SQLite stand-in for IPO_Scraped_Articles, or a local MySQL database with
+--mysql. Reports per-stage throughput, latency percentiles and peak RSS, and
+writes them as JSON so runs can be compared across commits.
+
+With --mysql the articles are really inserted into DB_NAME from .env, so use
+a scratch database; repeats after the first then measure the all-duplicates path.
+
+Usage:
+    python benchmarks/replay_benchmark.py [--repeat 5] [--delay-ms 50] [--concurrent] [--streaming]
+                                          [--set insert_batch_size=50] [--json results.json]
+    python benchmarks/replay_benchmark.py --record      # capture live pages once (needs network)
+    python benchmarks/replay_benchmark.py --pages-dir benchmarks/pages
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse, urlunparse
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; peak RSS is then omitted
+    resource = None
+
+from fixtures import DEFAULT_PAGES_DIR, InMemoryDatabase, OfflineScraper, load_pages, record_pages, synthetic_pages
+
+import mysql.connector
+from dotenv import load_dotenv
+
+STAGES = ['load_existing', 'fetch', 'parse', 'extract', 'classify', 'insert']
+
+
+class ReplayServer:
+    """Serves fixed pages for one original host on a local port."""
+
+    def __init__(self, pages: Dict[str, bytes], delay_seconds: float = 0.0):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                content = pages.get(self.path)
+                if delay_seconds:
+                    time.sleep(delay_seconds)
+                if content is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.netloc = f"127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def start_servers(urls: Dict[str, str], pages: Dict[str, bytes],
+                  delay_seconds: float) -> Tuple[Dict[str, str], List[ReplayServer]]:
+    """
+    Start one replay server per original host.
+    Returns tuple of (site name -> local URL, servers).
+    """
+    pages_by_host = {}
+    for site_name, content in pages.items():
+        parts = urlparse(urls[site_name])
+        path = parts.path or '/'
+        if parts.query:
+            path += f"?{parts.query}"
+        pages_by_host.setdefault(parts.netloc.lower(), {})[path] = content
+
+    servers = {host: ReplayServer(host_pages, delay_seconds) for host, host_pages in pages_by_host.items()}
+    local_urls = {}
+    for site_name in pages:
+        parts = urlparse(urls[site_name])
+        local_urls[site_name] = urlunparse(('http', servers[parts.netloc.lower()].netloc, parts.path or '/',
+                                            parts.params, parts.query, ''))
+    return local_urls, list(servers.values())
+
+
+class ReplayScraper(OfflineScraper):
+    """OfflineScraper that times each pipeline stage."""
+
+    def __init__(self, scraper_config: Optional[dict] = None, db=None):
+        self.timings = {stage: [] for stage in STAGES}
+        self.inserted_rows = 0
+        super().__init__(scraper_config, db)
+
+    def _timed(self, stage: str, func, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            # list.append is atomic, so worker threads can record without a lock
+            self.timings[stage].append(time.perf_counter() - start)
+
+    def get_existing_articles(self):
+        return self._timed('load_existing', super().get_existing_articles)
+
+    def fetch_page(self, url: str, timeout: int = 15):
+        return self._timed('fetch', super().fetch_page, url, timeout)
+
+    def parse_html(self, url: str, content: bytes, encoding: Optional[str] = None):
+        return self._timed('parse', super().parse_html, url, content, encoding)
+
+    def extract_site_articles(self, site_name: str, soup, url: str):
+        return self._timed('extract', super().extract_site_articles, site_name, soup, url)
+
+    def process_article(self, *args, **kwargs):
+        return self._timed('classify', super().process_article, *args, **kwargs)
+
+    def insert_into_db(self, scraped_articles, batch_size=None):
+        self.inserted_rows += len(scraped_articles)
+        return self._timed('insert', super().insert_into_db, scraped_articles, batch_size)
+
+
+def connect_mysql():
+    load_dotenv()
+    return mysql.connector.connect(
+        host=os.getenv('DB_HOST'),
+        user=os.getenv('DB_USER'),
+        password=os.getenv('MYSQL_ROOT_PASSWORD'),
+        database=os.getenv('DB_NAME')
+    )
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summarize(samples: List[float], items: int) -> dict:
+    """Call count, busy time, throughput (items per busy second) and latency percentiles in ms."""
+    if not samples:
+        return {'calls': 0, 'items': items, 'busy_s': 0.0}
+    ordered = sorted(samples)
+    busy = sum(ordered)
+    return {
+        'calls': len(ordered),
+        'items': items,
+        'busy_s': round(busy, 4),
+        'items_per_s': round(items / busy, 1) if busy else None,
+        'p50_ms': round(percentile(ordered, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(ordered, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 0.99) * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3),
+    }
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_overrides(pairs: List[str]) -> dict:
+    """KEY=VALUE scraper config overrides; values are read as JSON where possible."""
+    overrides = {}
+    for pair in pairs:
+        key, _, value = pair.partition('=')
+        try:
+            overrides[key] = json.loads(value)
+        except ValueError:
+            overrides[key] = value
+    return overrides
+
+
+def benchmark(pages_dir: Optional[str], repeat: int, delay_ms: float, config: dict, use_mysql: bool,
+              verbose: bool) -> dict:
+    """Replay every page `repeat` times and aggregate the stage timings (synthetic pages without pages_dir)."""
+    site_names = OfflineScraper().urls
+    pages = synthetic_pages(site_names) if pages_dir is None else load_pages(site_names, pages_dir)
+    if not pages:
+        return {}
+
+    timings = {stage: [] for stage in STAGES}
+    totals = {'pages': 0, 'pages_failed': 0, 'articles': 0, 'inserted': 0}
+    wall_times = []
+
+    for run in range(1, repeat + 1):
+        db = connect_mysql() if use_mysql else InMemoryDatabase()
+        scraper = ReplayScraper(config, db)
+        local_urls, servers = start_servers(scraper.urls, pages, delay_ms / 1000)
+        scraper.urls = local_urls
+        output = None if verbose else io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output) if output is not None else contextlib.nullcontext():
+                try:
+                    start = time.perf_counter()
+                    new_per_site = scraper.run_scraper()
+                    wall = time.perf_counter() - start
+                finally:
+                    scraper.close_connection()
+        finally:
+            for server in servers:
+                server.close()
+
+        failed = len(local_urls) - len(scraper.timings['parse'])
+        print(f"Run {run}/{repeat}: {wall:.2f}s, {len(scraper.timings['classify'])} articles, "
+              f"{sum(new_per_site.values())} new, {failed} pages failed")
+        wall_times.append(wall)
+        totals['pages'] += len(local_urls)
+        totals['pages_failed'] += failed
+        totals['articles'] += len(scraper.timings['classify'])
+        totals['inserted'] += scraper.inserted_rows
+        for stage in STAGES:
+            timings[stage].extend(scraper.timings[stage])
+
+    wall_total = sum(wall_times)
+    items = {
+        'load_existing': len(timings['load_existing']),
+        'fetch': len(timings['fetch']),
+        'parse': len(timings['parse']),
+        'extract': len(timings['extract']),
+        'classify': totals['articles'],
+        'insert': totals['inserted'],
+    }
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'database': 'mysql' if use_mysql else 'sqlite-memory',
+        'config': config,
+        'repeat': repeat,
+        'delay_ms': delay_ms,
+        'pages': 'synthetic' if pages_dir is None else pages_dir,
+        'sites': sorted(pages),
+        'totals': totals,
+        'wall_s': {
+            'total': round(wall_total, 4),
+            'per_run_median': round(sorted(wall_times)[len(wall_times) // 2], 4),
+        },
+        'pages_per_s': round(totals['pages'] / wall_total, 2) if wall_total else None,
+        'articles_per_s': round(totals['articles'] / wall_total, 1) if wall_total else None,
+        'stages': {stage: summarize(timings[stage], items[stage]) for stage in STAGES},
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def print_report(result: dict) -> None:
+    print(f"\nReplayed {len(result['sites'])} sites x {result['repeat']} runs "
+          f"({result['database']}): {result['pages_per_s']} pages/s, {result['articles_per_s']} articles/s, "
+          f"peak RSS {result['peak_rss_mb']} MB")
+    print(f"{'Stage':<15} {'Calls':>7} {'Items/s':>11} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for stage, stats in result['stages'].items():
+        if not stats['calls']:
+            continue
+        print(f"{stage:<15} {stats['calls']:>7} {stats['items_per_s'] or 0:>11.1f} "
+              f"{stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay source pages through a full scraper run.")
+    parser.add_argument('--record', action='store_true', help="Fetch and store pages from the live sites")
+    parser.add_argument('--pages-dir', help="Replay pages recorded in this directory instead of synthetic ones "
+                                            f"(--record writes to {DEFAULT_PAGES_DIR} unless given)")
+    parser.add_argument('--repeat', type=int, default=3, help="Number of full runs")
+    parser.add_argument('--delay-ms', type=float, default=0.0, help="Simulated server latency per page")
+    parser.add_argument('--concurrent', action='store_true', help="Enable concurrent fetching")
+    parser.add_argument('--streaming', action='store_true', help="Use the streaming pipeline")
+    parser.add_argument('--set', action='append', default=[], metavar='KEY=VALUE',
+                        help="Extra scraper config override (repeatable)")
+    parser.add_argument('--mysql', action='store_true', help="Insert into the MySQL database from .env")
+    parser.add_argument('--verbose', action='store_true', help="Show the scraper's own output")
+    parser.add_argument('--json', help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    if args.record:
+        record_pages(args.pages_dir or DEFAULT_PAGES_DIR)
+        return
+
+    # The local servers answer instantly, so the politeness limit would dominate the timings
+    config = {'rate_limit_per_second': 1000.0, 'rate_limit_burst': 100,
+              'concurrent_fetch': args.concurrent, 'streaming_pipeline': args.streaming,
+              **parse_overrides(args.set)}
+    try:
+        result = benchmark(args.pages_dir, args.repeat, args.delay_ms, config, args.mysql, args.verbose)
+    except mysql.connector.Error as err:
+        sys.exit(f"Database connection error: {err}")
+    if not result:
+        return
+
+    print_report(result)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -34,9 +34,48 @@ EMAIL_CONFIG = {
 # Scraper Configuration
 SCRAPER_CONFIG = {
     'scrape_interval_minutes': 90,  # Time between scraping cycles
+    'adaptive_schedule': False,  # Poll each source on its own adaptive interval
+    'min_poll_minutes': 15,  # Shortest interval for a busy source
+    'max_poll_minutes': 360,  # Longest interval for a quiet source
+    'schedule_state_path': 'schedule_state.json',  # Persisted per-source schedule
     'request_timeout': 15,  # Timeout for HTTP requests (seconds)
-    'batch_pause_seconds': 30,  # Pause after every 10 articles
-    'site_pause_seconds': 2,  # Pause between different websites
+    'rate_limit_per_second': 0.5,  # Requests per second allowed against one host
+    'rate_limit_burst': 1,  # Back-to-back requests allowed before throttling
+    'rate_limits': {},  # Per-host (requests per second, burst) overrides, e.g. {'www.livemint.com': (0.2, 1)}
+    'concurrent_fetch': False,  # Fetch all sources in parallel
+    'max_workers': 8,  # Global limit on concurrent fetches
+    'max_per_host': 2,  # Concurrent fetches allowed against one host
+    'streaming_pipeline': False,  # Fetch -> extract -> classify -> insert as concurrent stages
+    'pipeline_queue_size': 100,  # Items buffered between pipeline stages
+    'pipeline_flush_seconds': 2,  # Max wait before a partial insert batch is written
+    'conditional_get': True,  # Skip unchanged pages via ETag / Last-Modified
+    'http_cache_path': 'http_cache.json',  # On-disk validator cache
+    'html_parser': 'html.parser',  # html.parser, lxml or lxml-css
+    'dedup_snapshot_path': 'dedup_index.pkl',  # Warm-start file for the duplicate index
+    'dedup_store': 'set',  # set or fingerprint (compact 64-bit hashes)
+    'db_fingerprints': False,  # Upsert on unique Title_Hash / Link_Hash columns
+    'preload_existing': True,  # Load existing articles before each run
+    'near_duplicates': False,  # Store a Cluster_Id grouping the same story across sources
+    'near_duplicate_threshold': 0.6,  # Headline word-set similarity for the same story
+    'near_duplicate_window_days': 7,  # How far back new headlines are compared
+    'near_duplicate_snapshot_path': 'near_duplicates.pkl',  # Warm-start file
+    'fetch_article_text': False,  # Extract body text of relevant articles into IPO_Article_Content
+    'article_workers': 4,  # Concurrent article page fetches
+    'article_max_per_host': 2,  # Concurrent article fetches per host
+    'article_cache_dir': 'article_cache',  # On-disk cache keyed by canonical URL
+    'article_cache_max_mb': 200,  # Size cap of the article cache
+    'article_max_chars': 100000,  # Longest body text kept per article
+    'page_snapshots': False,  # Keep compressed copies of fetched pages
+    'snapshot_dir': 'page_snapshots',  # Content-addressed snapshot store
+    'snapshot_compression': 'gzip',  # gzip or zstd (needs zstandard)
+    'snapshot_retention_days': 30,  # Days of manifests kept
+    'snapshot_max_mb': 1024,  # Size cap for stored pages
+    'metrics_enabled': False,  # Serve stage timings and counters at /metrics
+    'metrics_host': '127.0.0.1',  # Metrics endpoint interface
+    'metrics_port': 9108,  # Metrics endpoint port
+    'parquet_cache_dir': '',  # Parquet copy of the article table for the dashboards ('' disables)
+    'insert_batch_size': 100,  # Articles per multi-row INSERT and commit
+    'daily_rollups': False,  # Keep IPO_Article_Daily_Counts current (run rollups.py --rebuild first)
 }
 
 # Logging Configuration
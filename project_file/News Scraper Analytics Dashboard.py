@@ -8,6 +8,9 @@ from matplotlib.dates import DateFormatter, MonthLocator, WeekdayLocator
 import warnings
 import os
 from dotenv import load_dotenv
+
+from dashboard_data import ArticleAggregates, normalize_counts
+from parquet_cache import ParquetArticleCache
 load_dotenv()
 warnings.filterwarnings('ignore')
 
@@ -20,8 +23,11 @@ class NewsScraperAnalytics:
         self.generated_figures = [] 
         self.db_config = db_config
         self.db = None
-        self.df = None
-        self.connect_to_database()
+        self.use_rollups = os.getenv('DAILY_ROLLUPS', 'false').strip().lower() in ('1', 'true', 'yes', 'on')
+        self.parquet_cache_dir = os.getenv('PARQUET_CACHE_DIR', '')
+        self.agg = None
+        if not self.parquet_cache_dir:
+            self.connect_to_database()
         
     def connect_to_database(self):
         """Establish database connection."""
@@ -33,35 +39,30 @@ class NewsScraperAnalytics:
             raise
     
     def load_data(self):
-        """Load data from database into pandas DataFrame."""
-        query = """
-        SELECT 
-            Scraped_Date,
-            Website,
-            Keyword,
-            Title,
-            Article_Link,
-            inserted_at
-        FROM IPO_Scraped_Articles
-        ORDER BY Scraped_Date DESC
-        """
+        """Load article counts per day, source and keyword from the Parquet cache or the database."""
+        if self.parquet_cache_dir:
+            counts = ParquetArticleCache(self.parquet_cache_dir).daily_counts()
+            self.agg = ArticleAggregates(normalize_counts(counts))
+            print(f"Loaded {self.agg.total()} articles from the Parquet cache in {self.parquet_cache_dir}.")
+            return self.agg
+
+        if self.use_rollups:
+            # Kept current by the scraper (see rollups.py)
+            query = """
+            SELECT Scraped_Date, Website, Keyword, Article_Count AS Count
+            FROM IPO_Article_Daily_Counts
+            """
+        else:
+            query = """
+            SELECT Scraped_Date, Website, Keyword, COUNT(*) AS Count
+            FROM IPO_Scraped_Articles
+            GROUP BY Scraped_Date, Website, Keyword
+            """
         
         try:
-            self.df = pd.read_sql(query, self.db)
-            self.df['Scraped_Date'] = pd.to_datetime(self.df['Scraped_Date'])
-            self.df['inserted_at'] = pd.to_datetime(self.df['inserted_at'])
-            
-            # Add time period columns
-            self.df['Year'] = self.df['Scraped_Date'].dt.year
-            self.df['Month'] = self.df['Scraped_Date'].dt.month
-            self.df['Week'] = self.df['Scraped_Date'].dt.isocalendar().week
-            self.df['Quarter'] = self.df['Scraped_Date'].dt.quarter
-            self.df['YearMonth'] = self.df['Scraped_Date'].dt.to_period('M')
-            self.df['YearWeek'] = self.df['Scraped_Date'].dt.to_period('W')
-            self.df['YearQuarter'] = self.df['Scraped_Date'].dt.to_period('Q')
-            
-            print(f"Loaded {len(self.df)} articles from database.")
-            return self.df
+            self.agg = ArticleAggregates(normalize_counts(pd.read_sql(query, self.db)))
+            print(f"Loaded {self.agg.total()} articles from database.")
+            return self.agg
         except Exception as e:
             print(f"Error loading data: {e}")
             raise
@@ -70,7 +71,7 @@ class NewsScraperAnalytics:
         """Plot overall distribution of articles by source."""
         plt.figure(figsize=(14, 6))
         
-        source_counts = self.df['Website'].value_counts()
+        source_counts = self.agg.counts_by('Website')
         
         plt.subplot(1, 2, 1)
         source_counts.plot(kind='bar', color='steelblue')
@@ -103,7 +104,7 @@ class NewsScraperAnalytics:
         """Plot overall distribution of articles by keyword."""
         plt.figure(figsize=(10, 6))
         
-        keyword_counts = self.df['Keyword'].value_counts()
+        keyword_counts = self.agg.counts_by('Keyword')
         
         plt.subplot(1, 2, 1)
         keyword_counts.plot(kind='bar', color='coral')
@@ -127,7 +128,7 @@ class NewsScraperAnalytics:
         """Plot daily article frequency."""
         plt.figure(figsize=(14, 6))
         
-        daily_counts = self.df.groupby('Scraped_Date').size()
+        daily_counts = self.agg.daily_totals()
         
         plt.plot(daily_counts.index, daily_counts.values, marker='o', linewidth=2, markersize=4)
         plt.title('Daily Article Frequency', fontsize=14, fontweight='bold')
@@ -147,7 +148,7 @@ class NewsScraperAnalytics:
         fig, axes = plt.subplots(2, 1, figsize=(14, 10))
         
         # Weekly by source
-        weekly_source = self.df.groupby(['YearWeek', 'Website']).size().unstack(fill_value=0)
+        weekly_source = self.agg.period_counts('YearWeek', 'Website').unstack(fill_value=0)
         weekly_source.plot(kind='bar', stacked=False, ax=axes[0], width=0.8)
         axes[0].set_title('Weekly Articles by Source', fontsize=14, fontweight='bold')
         axes[0].set_xlabel('Week', fontsize=11)
@@ -157,7 +158,7 @@ class NewsScraperAnalytics:
         axes[0].tick_params(axis='x', rotation=45)
         
         # Weekly by keyword
-        weekly_keyword = self.df.groupby(['YearWeek', 'Keyword']).size().unstack(fill_value=0)
+        weekly_keyword = self.agg.period_counts('YearWeek', 'Keyword').unstack(fill_value=0)
         weekly_keyword.plot(kind='bar', stacked=False, ax=axes[1], width=0.8)
         axes[1].set_title('Weekly Articles by Keyword', fontsize=14, fontweight='bold')
         axes[1].set_xlabel('Week', fontsize=11)
@@ -177,7 +178,7 @@ class NewsScraperAnalytics:
         fig, axes = plt.subplots(2, 1, figsize=(14, 10))
         
         # Monthly by source
-        monthly_source = self.df.groupby(['YearMonth', 'Website']).size().unstack(fill_value=0)
+        monthly_source = self.agg.period_counts('YearMonth', 'Website').unstack(fill_value=0)
         monthly_source.plot(kind='bar', stacked=False, ax=axes[0], width=0.8)
         axes[0].set_title('Monthly Articles by Source', fontsize=14, fontweight='bold')
         axes[0].set_xlabel('Month', fontsize=11)
@@ -187,7 +188,7 @@ class NewsScraperAnalytics:
         axes[0].tick_params(axis='x', rotation=45)
         
         # Monthly by keyword
-        monthly_keyword = self.df.groupby(['YearMonth', 'Keyword']).size().unstack(fill_value=0)
+        monthly_keyword = self.agg.period_counts('YearMonth', 'Keyword').unstack(fill_value=0)
         monthly_keyword.plot(kind='bar', stacked=False, ax=axes[1], width=0.8)
         axes[1].set_title('Monthly Articles by Keyword', fontsize=14, fontweight='bold')
         axes[1].set_xlabel('Month', fontsize=11)
@@ -207,7 +208,7 @@ class NewsScraperAnalytics:
         fig, axes = plt.subplots(2, 1, figsize=(14, 10))
         
         # Quarterly by source
-        quarterly_source = self.df.groupby(['YearQuarter', 'Website']).size().unstack(fill_value=0)
+        quarterly_source = self.agg.period_counts('YearQuarter', 'Website').unstack(fill_value=0)
         quarterly_source.plot(kind='bar', stacked=False, ax=axes[0], width=0.8)
         axes[0].set_title('Quarterly Articles by Source', fontsize=14, fontweight='bold')
         axes[0].set_xlabel('Quarter', fontsize=11)
@@ -217,7 +218,7 @@ class NewsScraperAnalytics:
         axes[0].tick_params(axis='x', rotation=45)
         
         # Quarterly by keyword
-        quarterly_keyword = self.df.groupby(['YearQuarter', 'Keyword']).size().unstack(fill_value=0)
+        quarterly_keyword = self.agg.period_counts('YearQuarter', 'Keyword').unstack(fill_value=0)
         quarterly_keyword.plot(kind='bar', stacked=False, ax=axes[1], width=0.8)
         axes[1].set_title('Quarterly Articles by Keyword', fontsize=14, fontweight='bold')
         axes[1].set_xlabel('Quarter', fontsize=11)
@@ -239,7 +240,7 @@ class NewsScraperAnalytics:
         
         # 1. Daily comparison
         ax1 = fig.add_subplot(gs[0, :2])
-        daily_total = self.df.groupby('Scraped_Date').size()
+        daily_total = self.agg.daily_totals()
         ax1.plot(daily_total.index, daily_total.values, marker='o', linewidth=2, markersize=3, label='Total')
         ax1.set_title('Daily Article Count', fontsize=12, fontweight='bold', pad= 10)
         ax1.set_xlabel('Date', fontsize=10)
@@ -250,7 +251,7 @@ class NewsScraperAnalytics:
         
         # 2. Source totals
         ax2 = fig.add_subplot(gs[0, 2])
-        source_counts = self.df['Website'].value_counts()
+        source_counts = self.agg.counts_by('Website')
         ax2.barh(range(len(source_counts)), source_counts.values, color='steelblue')
         ax2.set_yticks(range(len(source_counts)))
         ax2.set_yticklabels(source_counts.index, fontsize=9)
@@ -260,7 +261,7 @@ class NewsScraperAnalytics:
         
         # 3. Weekly source comparison
         ax3 = fig.add_subplot(gs[1, :2])
-        weekly_source = self.df.groupby(['YearWeek', 'Website']).size().unstack(fill_value=0)
+        weekly_source = self.agg.period_counts('YearWeek', 'Website').unstack(fill_value=0)
         for col in weekly_source.columns:
             ax3.plot(range(len(weekly_source)), weekly_source[col].values, marker='o', label=col, linewidth=2, markersize=4)
         ax3.set_title('Weekly Articles by Source', fontsize=12, fontweight='bold')
@@ -271,7 +272,7 @@ class NewsScraperAnalytics:
         
         # 4. Keyword totals
         ax4 = fig.add_subplot(gs[1, 2])
-        keyword_counts = self.df['Keyword'].value_counts()
+        keyword_counts = self.agg.counts_by('Keyword')
         ax4.barh(range(len(keyword_counts)), keyword_counts.values, color='coral')
         ax4.set_yticks(range(len(keyword_counts)))
         ax4.set_yticklabels(keyword_counts.index, fontsize=9)
@@ -281,7 +282,7 @@ class NewsScraperAnalytics:
         
         # 5. Monthly keyword comparison
         ax5 = fig.add_subplot(gs[2, :2])
-        monthly_keyword = self.df.groupby(['YearMonth', 'Keyword']).size().unstack(fill_value=0)
+        monthly_keyword = self.agg.period_counts('YearMonth', 'Keyword').unstack(fill_value=0)
         for col in monthly_keyword.columns:
             ax5.plot(range(len(monthly_keyword)), monthly_keyword[col].values, marker='s', label=col, linewidth=2, markersize=4)
         ax5.set_title('Monthly Articles by Keyword', fontsize=12, fontweight='bold')
@@ -292,7 +293,7 @@ class NewsScraperAnalytics:
         
         # 6. Source vs Keyword heatmap
         ax6 = fig.add_subplot(gs[2, 2])
-        heatmap_data = pd.crosstab(self.df['Keyword'], self.df['Website'])
+        heatmap_data = self.agg.crosstab('Keyword', 'Website')
         sns.heatmap(heatmap_data, annot=True, fmt='d', cmap='YlOrRd', ax=ax6, cbar_kws={'label': 'Count'}, annot_kws={'size': 8})
         ax6.set_title('Keyword vs Source', fontsize=12, fontweight='bold')
         ax6.set_xlabel('Source')
@@ -310,7 +311,7 @@ class NewsScraperAnalytics:
         """Create detailed heatmap of source vs keyword."""
         plt.figure(figsize=(12, 6))
         
-        heatmap_data = pd.crosstab(self.df['Website'], self.df['Keyword'])
+        heatmap_data = self.agg.crosstab('Website', 'Keyword')
         sns.heatmap(heatmap_data, annot=True, fmt='d', cmap='Blues', linewidths=0.5, cbar_kws={'label': 'Article Count'})
         
         plt.title('Source vs Keyword Heatmap', fontsize=14, fontweight='bold')
@@ -329,27 +330,28 @@ class NewsScraperAnalytics:
         print("SUMMARY STATISTICS")
         print("="*60)
         
-        print(f"\nTotal Articles: {len(self.df)}")
-        print(f"Date Range: {self.df['Scraped_Date'].min().date()} to {self.df['Scraped_Date'].max().date()}")
-        print(f"Total Days: {(self.df['Scraped_Date'].max() - self.df['Scraped_Date'].min()).days + 1}")
+        first_date, last_date = self.agg.date_range()
+        print(f"\nTotal Articles: {self.agg.total()}")
+        print(f"Date Range: {first_date.date()} to {last_date.date()}")
+        print(f"Total Days: {(last_date - first_date).days + 1}")
         
         print("\n--- Top Sources ---")
-        print(self.df['Website'].value_counts().to_string())
+        print(self.agg.counts_by('Website').to_string())
         
         print("\n--- Keyword Distribution ---")
-        print(self.df['Keyword'].value_counts().to_string())
+        print(self.agg.counts_by('Keyword').to_string())
         
         print("\n--- Average Articles per Day ---")
-        daily_avg = self.df.groupby('Scraped_Date').size().mean()
+        daily_avg = self.agg.daily_totals().mean()
         print(f"{daily_avg:.2f}")
         
         print("\n--- Most Active Week ---")
-        weekly_counts = self.df.groupby('YearWeek').size()
+        weekly_counts = self.agg.period_counts('YearWeek')
         max_week = weekly_counts.idxmax()
         print(f"{max_week}: {weekly_counts.max()} articles")
         
         print("\n--- Most Active Month ---")
-        monthly_counts = self.df.groupby('YearMonth').size()
+        monthly_counts = self.agg.period_counts('YearMonth')
         max_month = monthly_counts.idxmax()
         print(f"{max_month}: {monthly_counts.max()} articles")
         
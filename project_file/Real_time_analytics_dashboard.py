@@ -1,12 +1,15 @@
 import dash
-from dash import dcc, html, Input, Output
+from dash import dcc, html, Input, Output, State, no_update
 import plotly.express as px
-import plotly.graph_objs as go
-import pandas as pd
 from sqlalchemy import create_engine
 from datetime import datetime, timedelta
+import json
 import os
 from dotenv import load_dotenv
+from flask import Response
+
+from dashboard_data import ChangeNotifier, DashboardData, RenderCache
+from parquet_cache import ParquetArticleCache
 
 load_dotenv()
 
@@ -20,46 +23,36 @@ DB_PORT = os.getenv('DB_PORT', '3306')
 DB_USER = os.getenv('DB_USER', 'root')
 DB_PASSWORD = os.getenv('MYSQL_ROOT_PASSWORD', '')
 DB_NAME = os.getenv('DB_NAME', '')
+# Read IPO_Article_Daily_Counts instead of counting articles (see rollups.py)
+DAILY_ROLLUPS = os.getenv('DAILY_ROLLUPS', 'false').strip().lower() in ('1', 'true', 'yes', 'on')
+# Read counts from the Parquet article cache kept by the scraper or parquet_cache.py instead of MySQL
+PARQUET_CACHE_DIR = os.getenv('PARQUET_CACHE_DIR', '')
+# How often the change notifier checks for new articles while browsers are connected
+CHANGE_POLL_SECONDS = float(os.getenv('DASHBOARD_POLL_SECONDS', '2'))
 
 # Create SQLAlchemy engine
 DATABASE_URL = f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 engine = create_engine(DATABASE_URL, pool_pre_ping=True, pool_recycle=3600)
 
+# One cached copy of the article counts shared by every callback and browser session
+dashboard_data = DashboardData(
+    engine,
+    use_rollups=DAILY_ROLLUPS,
+    parquet_cache=ParquetArticleCache(PARQUET_CACHE_DIR) if PARQUET_CACHE_DIR else None
+)
+change_notifier = ChangeNotifier(dashboard_data, poll_seconds=CHANGE_POLL_SECONDS)
+
+# Rendered tab content per (tab, data version). Six tabs over the current and
+# previous version; tabs nobody opens are never built
+tab_cache = RenderCache(max_entries=12)
+summary_cache = RenderCache(max_entries=4)
+
 def fetch_data():
-    """Fetch latest data from database using SQLAlchemy."""
-    try:
-        query = """
-        SELECT 
-            Scraped_Date,
-            Website,
-            Keyword,
-            Title,
-            Article_Link,
-            inserted_at
-        FROM IPO_Scraped_Articles
-        ORDER BY Scraped_Date DESC
-        """
-        
-        # Use SQLAlchemy engine with pandas
-        df = pd.read_sql(query, engine)
-        
-        # Process data
-        df['Scraped_Date'] = pd.to_datetime(df['Scraped_Date'])
-        df['inserted_at'] = pd.to_datetime(df['inserted_at'])
-        df['Year'] = df['Scraped_Date'].dt.year
-        df['Month'] = df['Scraped_Date'].dt.month
-        df['Week'] = df['Scraped_Date'].dt.isocalendar().week
-        df['Quarter'] = df['Scraped_Date'].dt.quarter
-        df['YearMonth'] = df['Scraped_Date'].dt.to_period('M').astype(str)
-        df['YearWeek'] = df['Scraped_Date'].dt.to_period('W').astype(str)
-        df['YearQuarter'] = df['Scraped_Date'].dt.to_period('Q').astype(str)
-        
-        return df
-    except Exception as e:
-        print(f"Error fetching data: {e}")
-        import traceback
-        traceback.print_exc()
-        return pd.DataFrame()
+    """
+    Latest article counts per day, source and keyword, refreshed only when new rows were inserted.
+    Returns tuple of (data version, aggregates).
+    """
+    return dashboard_data.current()
 
 # App layout
 app.layout = html.Div([
@@ -72,12 +65,12 @@ app.layout = html.Div([
                style={'textAlign': 'center', 'color': '#7f8c8d', 'fontSize': 14}),
     ], style={'backgroundColor': '#ecf0f1', 'padding': '20px', 'marginBottom': '20px'}),
     
-    # Auto-refresh interval component
-    dcc.Interval(
-        id='interval-component',
-        interval=60*1000,  # Update every 60 seconds
-        n_intervals=0
-    ),
+    # Latest (version, date) pushed by the server over /events; see the script in index_string
+    dcc.Store(id='data-version'),
+    
+    # What this browser is showing, so ticks without new data send nothing
+    dcc.Store(id='summary-key'),
+    dcc.Store(id='tab-key'),
     
     # Summary Cards Row
     html.Div([
@@ -157,11 +150,40 @@ app.index_string = '''
             {%config%}
             {%scripts%}
             {%renderer%}
+            <script>
+                // Live updates: the server sends an event only when articles were added
+                // (or the day changed); copying it into the data-version store runs the callbacks.
+                // EventSource reconnects by itself after network errors or server restarts.
+                if (window.EventSource) {
+                    new EventSource('/events').onmessage = function (event) {
+                        try {
+                            window.dash_clientside.set_props('data-version', {data: JSON.parse(event.data)});
+                        } catch (e) {
+                            // Layout not rendered yet; its initial callbacks load the current data
+                        }
+                    };
+                }
+            </script>
         </footer>
     </body>
 </html>
 '''
 
+@app.server.route('/events')
+def events():
+    """Server-sent events stream of data changes for the script in index_string."""
+    def stream():
+        for state in change_notifier.listen():
+            if state is None:
+                # Comment line keeps proxies from closing an idle connection
+                yield ": keepalive\n\n"
+            else:
+                version, day = state
+                yield f"data: {json.dumps({'version': version, 'day': day})}\n\n"
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 # Callback to update summary cards
 @app.callback(
     [Output('last-update', 'children'),
@@ -170,27 +192,38 @@ app.index_string = '''
      Output('week-articles', 'children'),
      Output('month-articles', 'children'),
      Output('top-source', 'children'),
-     Output('date-range', 'children')],
-    [Input('interval-component', 'n_intervals')]
+     Output('date-range', 'children'),
+     Output('summary-key', 'data')],
+    [Input('data-version', 'data')],
+    [State('summary-key', 'data')]
 )
-def update_summary(n):
-    """Update summary cards."""
-    df = fetch_data()
+def update_summary(pushed, shown_key):
+    """Update summary cards when the data or the current day changed."""
+    version, agg = fetch_data()
+    # Today / week / month counts move at midnight even without new articles
+    key = [version, datetime.now().date().isoformat()]
+    if key == shown_key:
+        return (no_update,) * 8
     
-    if df.empty:
+    return summary_cache.get(tuple(key), lambda: build_summary(agg)) + (key,)
+
+def build_summary(agg):
+    """Returns tuple of the summary card values."""
+    if agg.empty:
         return ("No data available", "0", "0", "0", "0", "N/A", "")
     
     # Calculate metrics
-    total_articles = len(df)
+    total_articles = agg.total()
     today = datetime.now().date()
-    today_articles = len(df[df['Scraped_Date'].dt.date == today])
+    today_articles = agg.count_on(today)
     week_start = datetime.now() - timedelta(days=7)
-    week_articles = len(df[df['Scraped_Date'] >= week_start])
+    week_articles = agg.count_since(week_start)
     month_start = datetime.now() - timedelta(days=30)
-    month_articles = len(df[df['Scraped_Date'] >= month_start])
-    top_source = df['Website'].value_counts().index[0] if len(df) > 0 else "N/A"
+    month_articles = agg.count_since(month_start)
+    top_source = agg.counts_by('Website').index[0]
     
-    date_range = f"{df['Scraped_Date'].min().strftime('%Y-%m-%d')} to {df['Scraped_Date'].max().strftime('%Y-%m-%d')}"
+    first_date, last_date = agg.date_range()
+    date_range = f"{first_date.strftime('%Y-%m-%d')} to {last_date.strftime('%Y-%m-%d')}"
     
     last_update = f"Last Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
     
@@ -206,34 +239,43 @@ def update_summary(n):
 
 # Callback to render tab content
 @app.callback(
-    Output('tabs-content', 'children'),
+    [Output('tabs-content', 'children'),
+     Output('tab-key', 'data')],
     [Input('tabs', 'value'),
-     Input('interval-component', 'n_intervals')]
+     Input('data-version', 'data')],
+    [State('tab-key', 'data')]
 )
-def render_content(tab, n):
-    """Render content based on selected tab."""
-    df = fetch_data()
+def render_content(tab, pushed, shown_key):
+    """Render the selected tab, or nothing when it already shows the current data."""
+    version, agg = fetch_data()
+    key = [tab, version]
+    if key == shown_key:
+        return no_update, no_update
     
-    if df.empty:
+    return tab_cache.get(tuple(key), lambda: build_tab(tab, agg)), key
+
+def build_tab(tab, agg):
+    """Content of one tab for the given aggregates."""
+    if agg.empty:
         return html.Div("No data available", style={'textAlign': 'center', 'padding': '50px'})
     
     if tab == 'overview':
-        return create_overview_tab(df)
+        return create_overview_tab(agg)
     elif tab == 'daily':
-        return create_daily_tab(df)
+        return create_daily_tab(agg)
     elif tab == 'weekly':
-        return create_weekly_tab(df)
+        return create_weekly_tab(agg)
     elif tab == 'monthly':
-        return create_monthly_tab(df)
+        return create_monthly_tab(agg)
     elif tab == 'quarterly':
-        return create_quarterly_tab(df)
+        return create_quarterly_tab(agg)
     elif tab == 'heatmaps':
-        return create_heatmaps_tab(df)
+        return create_heatmaps_tab(agg)
 
-def create_overview_tab(df):
+def create_overview_tab(agg):
     """Create overview tab with source and keyword distributions."""
     # Source Distribution Bar Chart
-    source_counts = df['Website'].value_counts()
+    source_counts = agg.counts_by('Website')
     fig_source_bar = px.bar(
         x=source_counts.index, 
         y=source_counts.values,
@@ -255,7 +297,7 @@ def create_overview_tab(df):
     fig_source_pie.update_layout(height=400)
     
     # Keyword Distribution Bar Chart
-    keyword_counts = df['Keyword'].value_counts()
+    keyword_counts = agg.counts_by('Keyword')
     fig_keyword_bar = px.bar(
         x=keyword_counts.index,
         y=keyword_counts.values,
@@ -296,10 +338,11 @@ def create_overview_tab(df):
         ]),
     ])
 
-def create_daily_tab(df):
+def create_daily_tab(agg):
     """Create daily analysis tab."""
     # Daily Trends
-    daily_counts = df.groupby(df['Scraped_Date'].dt.date).size().reset_index()
+    daily_totals = agg.daily_totals()
+    daily_counts = daily_totals.reset_index()
     daily_counts.columns = ['Date', 'Count']
     fig_daily = px.line(
         daily_counts,
@@ -312,7 +355,7 @@ def create_daily_tab(df):
     fig_daily.update_traces(line_color='#3498db', marker=dict(size=8))
     
     # Daily Average
-    daily_avg = df.groupby(df['Scraped_Date'].dt.date).size().mean()
+    daily_avg = daily_totals.mean()
     
     return html.Div([
         html.H3("📅 Daily Analysis", style={'color': '#2c3e50', 'marginBottom': 20}),
@@ -327,10 +370,10 @@ def create_daily_tab(df):
         dcc.Graph(figure=fig_daily, style={'padding': '10px'}),
     ])
 
-def create_weekly_tab(df):
+def create_weekly_tab(agg):
     """Create weekly analysis tab."""
     # Weekly by Source
-    weekly_source = df.groupby(['YearWeek', 'Website']).size().reset_index()
+    weekly_source = agg.period_counts('YearWeek', 'Website').reset_index()
     weekly_source.columns = ['Week', 'Source', 'Count']
     fig_weekly_source = px.line(
         weekly_source,
@@ -343,7 +386,7 @@ def create_weekly_tab(df):
     fig_weekly_source.update_layout(height=450)
     
     # Weekly by Keyword
-    weekly_keyword = df.groupby(['YearWeek', 'Keyword']).size().reset_index()
+    weekly_keyword = agg.period_counts('YearWeek', 'Keyword').reset_index()
     weekly_keyword.columns = ['Week', 'Keyword', 'Count']
     fig_weekly_keyword = px.line(
         weekly_keyword,
@@ -356,7 +399,7 @@ def create_weekly_tab(df):
     fig_weekly_keyword.update_layout(height=450)
     
     # Most Active Week
-    weekly_counts = df.groupby('YearWeek').size()
+    weekly_counts = agg.period_counts('YearWeek')
     max_week = weekly_counts.idxmax()
     max_week_count = weekly_counts.max()
     
@@ -375,10 +418,10 @@ def create_weekly_tab(df):
         dcc.Graph(figure=fig_weekly_keyword, style={'padding': '10px'}),
     ])
 
-def create_monthly_tab(df):
+def create_monthly_tab(agg):
     """Create monthly analysis tab."""
     # Monthly by Source
-    monthly_source = df.groupby(['YearMonth', 'Website']).size().reset_index()
+    monthly_source = agg.period_counts('YearMonth', 'Website').reset_index()
     monthly_source.columns = ['Month', 'Source', 'Count']
     fig_monthly_source = px.bar(
         monthly_source,
@@ -391,7 +434,7 @@ def create_monthly_tab(df):
     fig_monthly_source.update_layout(height=450)
     
     # Monthly by Keyword
-    monthly_keyword = df.groupby(['YearMonth', 'Keyword']).size().reset_index()
+    monthly_keyword = agg.period_counts('YearMonth', 'Keyword').reset_index()
     monthly_keyword.columns = ['Month', 'Keyword', 'Count']
     fig_monthly_keyword = px.bar(
         monthly_keyword,
@@ -404,7 +447,7 @@ def create_monthly_tab(df):
     fig_monthly_keyword.update_layout(height=450)
     
     # Most Active Month
-    monthly_counts = df.groupby('YearMonth').size()
+    monthly_counts = agg.period_counts('YearMonth')
     max_month = monthly_counts.idxmax()
     max_month_count = monthly_counts.max()
     
@@ -423,10 +466,10 @@ def create_monthly_tab(df):
         dcc.Graph(figure=fig_monthly_keyword, style={'padding': '10px'}),
     ])
 
-def create_quarterly_tab(df):
+def create_quarterly_tab(agg):
     """Create quarterly analysis tab."""
     # Quarterly by Source
-    quarterly_source = df.groupby(['YearQuarter', 'Website']).size().reset_index()
+    quarterly_source = agg.period_counts('YearQuarter', 'Website').reset_index()
     quarterly_source.columns = ['Quarter', 'Source', 'Count']
     fig_quarterly_source = px.bar(
         quarterly_source,
@@ -439,7 +482,7 @@ def create_quarterly_tab(df):
     fig_quarterly_source.update_layout(height=450)
     
     # Quarterly by Keyword
-    quarterly_keyword = df.groupby(['YearQuarter', 'Keyword']).size().reset_index()
+    quarterly_keyword = agg.period_counts('YearQuarter', 'Keyword').reset_index()
     quarterly_keyword.columns = ['Quarter', 'Keyword', 'Count']
     fig_quarterly_keyword = px.bar(
         quarterly_keyword,
@@ -458,10 +501,10 @@ def create_quarterly_tab(df):
         dcc.Graph(figure=fig_quarterly_keyword, style={'padding': '10px'}),
     ])
 
-def create_heatmaps_tab(df):
+def create_heatmaps_tab(agg):
     """Create heatmaps tab."""
     # Source vs Keyword Heatmap
-    heatmap_data_1 = pd.crosstab(df['Keyword'], df['Website'])
+    heatmap_data_1 = agg.crosstab('Keyword', 'Website')
     fig_heatmap_1 = px.imshow(
         heatmap_data_1,
         title="Keyword vs Source Heatmap",
@@ -472,7 +515,7 @@ def create_heatmaps_tab(df):
     fig_heatmap_1.update_layout(height=450)
     
     # Website vs Keyword Heatmap (reversed)
-    heatmap_data_2 = pd.crosstab(df['Website'], df['Keyword'])
+    heatmap_data_2 = agg.crosstab('Website', 'Keyword')
     fig_heatmap_2 = px.imshow(
         heatmap_data_2,
         title="Source vs Keyword Heatmap",
@@ -493,7 +536,7 @@ if __name__ == '__main__':
     print("🚀 Starting Enhanced Real-time Dashboard...")
     print(f"📊 Dashboard will be available at: http://127.0.0.1:8050")
     print(f"🔗 Database: {DB_HOST}:{DB_PORT}/{DB_NAME}")
-    print("🔄 Auto-refresh interval: 60 seconds")
+    print(f"🔄 Live updates pushed on new articles (checked every {CHANGE_POLL_SECONDS:g}s while browsers are connected)")
     print("✨ All features from Analytics Dashboard included!")
     print("Press Ctrl+C to stop")
     app.run(debug=True, host='0.0.0.0', port=8050)
\ No newline at end of file
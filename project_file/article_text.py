@@ -0,0 +1,283 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import requests
+
+from html_parsers import response_encoding
+
+# Query parameters that only track the visit and never change the article
+TRACKING_PARAMS = re.compile(r'^(utm_\w+|fbclid|gclid|ref|source|from)$', re.IGNORECASE)
+
+PUBLISHED_SELECTORS = [
+    ('meta[property="article:published_time"]', 'content'),
+    ('meta[itemprop="datePublished"]', 'content'),
+    ('meta[name="publish-date"]', 'content'),
+    ('meta[name="pubdate"]', 'content'),
+    ('time[datetime]', 'datetime'),
+]
+JSON_LD_PUBLISHED = re.compile(rb'"datePublished"\s*:\s*"([^"]+)"')
+
+# Paragraphs shorter than this are usually captions, bylines or share widgets
+MIN_PARAGRAPH_CHARS = 40
+
+
+class ArticleText(NamedTuple):
+    """Extracted body of one article."""
+    url: str
+    canonical_url: str
+    body: str
+    published_at: Optional[datetime]
+
+
+def canonical_url(url: str) -> str:
+    """URL used as the cache key: lowercase scheme and host, no fragment, no tracking parameters."""
+    parts = urlparse(url.strip())
+    query = urlencode([(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                       if not TRACKING_PARAMS.match(key)])
+    path = parts.path.rstrip('/') or '/'
+    return urlunparse((parts.scheme.lower(), parts.netloc.lower(), path, parts.params, query, ''))
+
+
+def parse_published(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO-8601 publish time into a naive UTC datetime, or None."""
+    if not value:
+        return None
+    value = value.strip().replace('Z', '+00:00')
+    try:
+        published = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            published = datetime.strptime(value[:10], '%Y-%m-%d')
+        except ValueError:
+            return None
+    if published.tzinfo is not None:
+        published = published.astimezone(timezone.utc).replace(tzinfo=None)
+    return published
+
+
+def extract_article_text(parser, content: bytes, max_chars: int,
+                         encoding: Optional[str] = None) -> Tuple[str, Optional[datetime]]:
+    """
+    Extract body text and publish time from an article page with a parser backend.
+    Body text is the article's paragraphs (falling back to every paragraph on
+    the page), truncated to max_chars.
+    """
+    document = parser.parse(content, encoding)
+
+    published_at = None
+    for selector, attribute in PUBLISHED_SELECTORS:
+        for node in parser.select(document, selector):
+            published_at = parse_published(parser.attr(node, attribute))
+            if published_at is not None:
+                break
+        if published_at is not None:
+            break
+    if published_at is None:
+        match = JSON_LD_PUBLISHED.search(content)
+        if match:
+            published_at = parse_published(match.group(1).decode('utf-8', 'ignore'))
+
+    paragraphs = parser.select(document, 'article p') or parser.select(document, 'p')
+    texts = []
+    length = 0
+    for node in paragraphs:
+        text = re.sub(r'\s+', ' ', parser.text(node)).strip()
+        if len(text) < MIN_PARAGRAPH_CHARS:
+            continue
+        texts.append(text)
+        length += len(text) + 2
+        if length >= max_chars:
+            break
+    return '\n\n'.join(texts)[:max_chars], published_at
+
+
+class ArticleContentCache:
+    """
+    On-disk cache of extracted article text, one JSON file per canonical URL.
+    The directory is kept under max_bytes by evicting the least recently
+    written entries. The directory is scanned once on start; after that puts
+    keep a running byte total and only scan again when it passes max_bytes.
+    """
+
+    # Eviction frees space down to this fraction of max_bytes, so the next
+    # puts do not trigger another scan straight away
+    EVICT_TO = 0.9
+
+    def __init__(self, cache_dir: Optional[str], max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._total = sum(size for _, size, _ in self._entries())
+
+    def _path(self, canonical: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(canonical.encode('utf-8')).hexdigest() + '.json')
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """(mtime, size, path) of every cache entry."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.json'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def get(self, canonical: str) -> Optional[Tuple[str, Optional[datetime]]]:
+        """Cached (body, published_at) for a canonical URL, or None."""
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(canonical), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        published_at = entry.get('published_at')
+        return entry['body'], datetime.fromisoformat(published_at) if published_at else None
+
+    def put(self, canonical: str, body: str, published_at: Optional[datetime]) -> None:
+        """Store an entry, then evict old entries if the cache is over its size cap."""
+        if not self.cache_dir:
+            return
+        entry = {
+            'url': canonical,
+            'body': body,
+            'published_at': published_at.isoformat() if published_at else None,
+        }
+        path = self._path(canonical)
+        try:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            size = os.path.getsize(tmp_path)
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not write article cache entry {path}: {e}")
+            return
+        with self._lock:
+            self._total += size - replaced
+            over_limit = self._total > self.max_bytes
+        if over_limit:
+            self.evict()
+
+    def evict(self) -> None:
+        """Delete the oldest entries until the cache fits in EVICT_TO of max_bytes."""
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            if total > self.max_bytes:
+                target = self.max_bytes * self.EVICT_TO
+                for _, size, path in sorted(entries):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        continue
+                    total -= size
+                    if total <= target:
+                        break
+            self._total = total
+
+
+class ArticleTextFetcher:
+    """
+    Follow-up stage that fetches relevant articles and extracts their text.
+
+    submit() queues articles on a bounded worker pool and returns immediately,
+    so fetching overlaps with the rest of the run; collect() waits for the
+    queued work and returns the results. Fetches go through the scraper's
+    pooled HTTP client and per-host rate limiter, with at most max_per_host
+    in flight per host, and hits in the on-disk cache skip the network.
+    """
+
+    def __init__(self, http, rate_limiter, parser, cache: ArticleContentCache, max_workers: int = 4,
+                 max_per_host: int = 2, timeout: int = 15, max_chars: int = 100000):
+        self.http = http
+        self.rate_limiter = rate_limiter
+        self.parser = parser
+        self.cache = cache
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.max_chars = max_chars
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='article-text')
+        self._host_limits = {}
+        self._lock = threading.Lock()
+        self._pending: List[Future] = []
+        self.stats = {'fetched': 0, 'cached': 0, 'failed': 0}
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_limits[host]
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def fetch(self, url: str) -> Optional[ArticleText]:
+        """Fetch and extract one article, using the cache when possible."""
+        canonical = canonical_url(url)
+        cached = self.cache.get(canonical)
+        if cached is not None:
+            self._count('cached')
+            return ArticleText(url, canonical, cached[0], cached[1])
+
+        try:
+            with self._host_limit(url):
+                self.rate_limiter.acquire(url)
+                response = self.http.get(url, timeout=self.timeout, conditional=False)
+            response.raise_for_status()
+            if 'html' not in response.headers.get('content-type', '').lower():
+                raise ValueError("response is not HTML")
+            body, published_at = extract_article_text(self.parser, response.content, self.max_chars,
+                                                       response_encoding(response))
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Could not extract article text from {url}: {e}")
+            self._count('failed')
+            return None
+        except Exception as e:
+            print(f"Unexpected error extracting article text from {url}: {e}")
+            self._count('failed')
+            return None
+
+        self.cache.put(canonical, body, published_at)
+        self._count('fetched')
+        return ArticleText(url, canonical, body, published_at)
+
+    def submit(self, articles: List[Dict]) -> None:
+        """Queue article dicts (with a 'link' key) for text extraction."""
+        for article in articles:
+            self._pending.append(self._executor.submit(self.fetch, article['link']))
+
+    def collect(self) -> List[ArticleText]:
+        """Wait for every queued article and return the successful extractions."""
+        pending, self._pending = self._pending, []
+        return [result for result in (future.result() for future in pending) if result is not None]
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats = {'fetched': 0, 'cached': 0, 'failed': 0}
+
+    def print_stats(self) -> None:
+        with self._lock:
+            stats = dict(self.stats)
+        print(f"Article text: {stats['fetched']} fetched, {stats['cached']} from cache, {stats['failed']} failed")
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
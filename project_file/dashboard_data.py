@@ -0,0 +1,350 @@
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Callable, Hashable, Iterator, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import text
+
+# Article counts per day, source and keyword for the rows between two ids.
+# Every dashboard chart is a roll-up of these counts, so row-level data
+# (titles, links) never leaves the database
+DAILY_COUNTS_QUERY = """
+SELECT
+    Scraped_Date,
+    Website,
+    Keyword,
+    COUNT(*) AS Count
+FROM IPO_Scraped_Articles
+WHERE id > :last_id AND id <= :version
+GROUP BY Scraped_Date, Website, Keyword
+"""
+
+# The same counts kept by the scraper in IPO_Article_Daily_Counts (see rollups.py)
+ROLLUP_COUNTS_QUERY = """
+SELECT Scraped_Date, Website, Keyword, Article_Count AS Count
+FROM IPO_Article_Daily_Counts
+"""
+
+# Highest id and number of rows above the settled id (see DashboardData),
+# answered from a short range of the primary key without touching the rows
+PROBE_QUERY = "SELECT MAX(id), COUNT(*) FROM IPO_Scraped_Articles WHERE id > :last_id"
+
+# Rows between two ids, for the rollup path where no counts are loaded
+RANGE_COUNT_QUERY = "SELECT COUNT(*) FROM IPO_Scraped_Articles WHERE id > :last_id AND id <= :version"
+
+COUNT_KEYS = ['Scraped_Date', 'Website', 'Keyword']
+
+# Period label columns, formatted like pandas Period strings
+# (e.g. 2025-11, 2025-11-03/2025-11-09, 2025Q4)
+PERIOD_FREQUENCIES = {'YearMonth': 'M', 'YearWeek': 'W', 'YearQuarter': 'Q'}
+
+
+def normalize_counts(counts: pd.DataFrame) -> pd.DataFrame:
+    counts['Scraped_Date'] = pd.to_datetime(counts['Scraped_Date'])
+    counts['Count'] = counts['Count'].astype('int64')
+    return counts
+
+
+def load_daily_counts(engine, last_id: int, version: int) -> pd.DataFrame:
+    """Counts per (Scraped_Date, Website, Keyword) for articles with last_id < id <= version."""
+    counts = pd.read_sql(text(DAILY_COUNTS_QUERY), engine, params={'last_id': last_id, 'version': version})
+    return normalize_counts(counts)
+
+
+def load_rollup_counts(engine) -> pd.DataFrame:
+    """Every row of the daily rollup table."""
+    return normalize_counts(pd.read_sql(text(ROLLUP_COUNTS_QUERY), engine))
+
+
+def merge_counts(counts: pd.DataFrame, new_counts: pd.DataFrame) -> pd.DataFrame:
+    """Add new_counts into counts, summing rows with the same day, source and keyword."""
+    if counts.empty:
+        return new_counts
+    if new_counts.empty:
+        return counts
+    merged = pd.concat([counts, new_counts], ignore_index=True)
+    return merged.groupby(COUNT_KEYS, as_index=False, sort=False)['Count'].sum()
+
+
+class ArticleAggregates:
+    """
+    Article counts per (Scraped_Date, Website, Keyword) and the roll-ups the
+    dashboard draws from them. The frame has one row per day, source and
+    keyword with articles, so every roll-up works on a few thousand rows
+    however many articles are stored.
+    """
+
+    def __init__(self, daily: pd.DataFrame):
+        self.daily = daily
+        self._periods = {}
+
+    @property
+    def empty(self) -> bool:
+        return self.daily.empty
+
+    def total(self) -> int:
+        return int(self.daily['Count'].sum())
+
+    def count_since(self, start: datetime) -> int:
+        """Articles scraped on or after start."""
+        return int(self.daily.loc[self.daily['Scraped_Date'] >= start, 'Count'].sum())
+
+    def count_on(self, day) -> int:
+        return int(self.daily.loc[self.daily['Scraped_Date'].dt.date == day, 'Count'].sum())
+
+    def date_range(self):
+        """Tuple of (first, last) Scraped_Date."""
+        return self.daily['Scraped_Date'].min(), self.daily['Scraped_Date'].max()
+
+    def counts_by(self, column: str) -> pd.Series:
+        """Totals per value of column, largest first (like value_counts)."""
+        return self.daily.groupby(column)['Count'].sum().sort_values(ascending=False, kind='stable')
+
+    def daily_totals(self) -> pd.Series:
+        """Totals per scrape date."""
+        return self.daily.groupby(self.daily['Scraped_Date'].dt.date)['Count'].sum()
+
+    def period(self, name: str) -> pd.Series:
+        """Label of each row's YearMonth, YearWeek or YearQuarter period, derived once per frame."""
+        if name not in self._periods:
+            labels = self.daily['Scraped_Date'].dt.to_period(PERIOD_FREQUENCIES[name]).astype(str)
+            self._periods[name] = labels.rename(name)
+        return self._periods[name]
+
+    def period_counts(self, name: str, column: Optional[str] = None) -> pd.Series:
+        """Totals per period, or per (period, column value) when column is given."""
+        keys = [self.period(name)] if column is None else [self.period(name), self.daily[column]]
+        return self.daily.groupby(keys)['Count'].sum()
+
+    def crosstab(self, index: str, columns: str) -> pd.DataFrame:
+        """Totals for every (index, columns) value pair, zero-filled (like pd.crosstab)."""
+        return self.daily.pivot_table(index=index, columns=columns, values='Count', aggfunc='sum', fill_value=0)
+
+
+class DashboardData:
+    """
+    Process-wide cache of the dashboard's article counts.
+
+    Every callback of every connected browser asks aggregates() for the data.
+    Nothing is read while the version probe is unchanged, and the probe
+    itself runs at most once per probe_ttl seconds, so the callbacks fired by
+    one refresh tick share a single cheap query.
+
+    Ids are handed out at insert time, not at commit, so a batch from the
+    streaming pipeline or another scraper can commit below an id already
+    seen. Counts are therefore split at a settled id, trailing_ids below the
+    highest id at the last refresh: rows up to it are counted once and kept,
+    rows above it are recounted on every refresh. The version is the number
+    of stored articles (settled rows plus rows above the settled id), so a
+    late commit changes it even when the highest id does not. A refresh
+    costs a GROUP BY (day, source, keyword) over the new and trailing rows
+    only, so neither transfer nor memory grows with the number of articles. With
+    use_rollups the scraper already keeps those counts in
+    IPO_Article_Daily_Counts, so a version change rereads that small table
+    instead of counting any articles. With a parquet_cache
+    (parquet_cache.ParquetArticleCache) the version and the counts come from
+    the exported Parquet files instead, and MySQL is not queried at all.
+    Concurrent callers wait for one refresh instead of each starting their
+    own. The returned aggregates are shared: callers must treat them as
+    read-only.
+    """
+
+    def __init__(self, engine, probe_ttl: float = 5.0, use_rollups: bool = False, parquet_cache=None,
+                 trailing_ids: int = 1000):
+        self.engine = engine
+        self.probe_ttl = probe_ttl
+        self.use_rollups = use_rollups
+        self.parquet_cache = parquet_cache
+        self.trailing_ids = trailing_ids
+        self._lock = threading.Lock()
+        self._aggregates = ArticleAggregates(pd.DataFrame(columns=COUNT_KEYS + ['Count']))
+        self._loaded = False
+        self._loaded_version = None
+        self._settled = self._aggregates.daily
+        self._settled_id = 0
+        self._settled_rows = 0
+        self._probed_max_id = None
+        self._probed_version = None
+        self._probed_at = None
+
+    def version(self, max_age: Optional[float] = None) -> Optional[int]:
+        """
+        Current data version (number of stored articles, None when there are
+        none), probed at most once per probe_ttl, or per max_age seconds when given.
+        """
+        with self._lock:
+            return self._probe(max_age)
+
+    def _probe_tail(self) -> Tuple[Optional[int], int]:
+        """Returns tuple of (highest id, rows above the settled id)."""
+        if self.parquet_cache is not None:
+            return self.parquet_cache.tail(self._settled_id)
+        with self.engine.connect() as connection:
+            max_id, rows = connection.execute(text(PROBE_QUERY), {'last_id': self._settled_id}).one()
+        return max_id, int(rows)
+
+    def _probe(self, max_age: Optional[float] = None) -> Optional[int]:
+        now = time.monotonic()
+        max_age = self.probe_ttl if max_age is None else max_age
+        if self._probed_at is None or now - self._probed_at >= max_age:
+            max_id, rows = self._probe_tail()
+            if max_id is None and self._settled_id:
+                # Table was emptied or restored from an older backup: count everything again
+                self._settle(0, self._aggregates.daily.iloc[0:0], 0)
+                self._loaded = False
+                max_id, rows = self._probe_tail()
+            self._probed_max_id = max_id
+            self._probed_version = None if max_id is None else self._settled_rows + rows
+            self._probed_at = now
+        return self._probed_version
+
+    def _settle(self, settled_id: int, settled: pd.DataFrame, settled_rows: int) -> None:
+        self._settled_id = settled_id
+        self._settled = settled
+        self._settled_rows = settled_rows
+
+    def aggregates(self) -> ArticleAggregates:
+        """Counts for the current data version; empty if nothing could be loaded."""
+        return self.current()[1]
+
+    def current(self) -> Tuple[Optional[int], ArticleAggregates]:
+        """
+        Returns tuple of (version the aggregates were loaded at, aggregates),
+        read together so the version can key anything derived from them.
+        """
+        with self._lock:
+            try:
+                version = self._probe()
+                if not self._loaded or version != self._loaded_version:
+                    self._refresh(version)
+            except Exception as e:
+                # Keep serving the last good counts while the database is unavailable
+                print(f"Error fetching data: {e}")
+                traceback.print_exc()
+            return self._loaded_version, self._aggregates
+
+    def _load_counts(self, last_id: int, max_id: int) -> pd.DataFrame:
+        if self.parquet_cache is not None:
+            return normalize_counts(self.parquet_cache.daily_counts(last_id, max_id))
+        return load_daily_counts(self.engine, last_id, max_id)
+
+    def _refresh(self, version: Optional[int]) -> None:
+        """Settle counts up to trailing_ids below the highest id, then recount the rows above."""
+        max_id = self._probed_max_id
+        settled_id = self._settled_id if max_id is None else max(self._settled_id, max_id - self.trailing_ids)
+
+        if self.use_rollups and self.parquet_cache is None:
+            # The rollup table is complete by itself; settling only keeps the probe short
+            if settled_id > self._settled_id:
+                with self.engine.connect() as connection:
+                    rows = connection.execute(text(RANGE_COUNT_QUERY),
+                                              {'last_id': self._settled_id, 'version': settled_id}).scalar()
+                self._settle(settled_id, self._settled, self._settled_rows + int(rows))
+            self._aggregates = ArticleAggregates(load_rollup_counts(self.engine))
+            self._loaded = True
+            self._loaded_version = version
+            return
+
+        if settled_id > self._settled_id:
+            counts = self._load_counts(self._settled_id, settled_id)
+            self._settle(settled_id, merge_counts(self._settled, counts),
+                         self._settled_rows + int(counts['Count'].sum()))
+        daily = self._settled
+        if max_id is not None and max_id > self._settled_id:
+            daily = merge_counts(daily, self._load_counts(self._settled_id, max_id))
+        # A new object rather than an in-place update, so aggregates handed out earlier stay intact
+        self._aggregates = ArticleAggregates(daily)
+        self._loaded = True
+        self._loaded_version = version
+
+
+class ChangeNotifier:
+    """
+    Wakes dashboard clients when new articles are stored.
+
+    One background thread probes the data version every poll_seconds and
+    publishes (version, today's date) whenever it changes; the date is part
+    of the state so the "today" cards roll over at midnight. The thread runs
+    only while at least one client is listening, so an idle dashboard sends
+    no queries at all, and the number of open browsers never multiplies the
+    probe rate.
+    """
+
+    def __init__(self, data: DashboardData, poll_seconds: float = 2.0):
+        self.data = data
+        self.poll_seconds = poll_seconds
+        self._condition = threading.Condition()
+        self._state = None
+        self._listeners = 0
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._listeners > 0)
+            try:
+                state = (self.data.version(max_age=0), date.today().isoformat())
+            except Exception as e:
+                print(f"Error probing data version: {e}")
+            else:
+                with self._condition:
+                    if state != self._state:
+                        self._state = state
+                        self._condition.notify_all()
+            time.sleep(self.poll_seconds)
+
+    def listen(self, keepalive: float = 15.0) -> Iterator[Optional[Tuple[Optional[int], str]]]:
+        """
+        Yield the current (version, date) state, then every new one as it is
+        published, or None after keepalive seconds without a change.
+        """
+        with self._condition:
+            self._listeners += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='dashboard-change-notifier', daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+        try:
+            seen = None
+            while True:
+                with self._condition:
+                    changed = self._condition.wait_for(
+                        lambda: self._state is not None and self._state != seen, timeout=keepalive)
+                    state = self._state
+                if changed:
+                    seen = state
+                    yield state
+                else:
+                    yield None
+        finally:
+            with self._condition:
+                self._listeners -= 1
+
+
+class RenderCache:
+    """
+    Bounded LRU cache of rendered dashboard content, keyed by e.g. (tab, data
+    version). Content is built on first request only and shared by every
+    session; the least recently used entry is dropped beyond max_entries.
+    Builds run under the lock, so sessions asking for the same new key at
+    once wait for a single build.
+    """
+
+    def __init__(self, max_entries: int = 12):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, build: Callable[[], object]):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            value = build()
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return value
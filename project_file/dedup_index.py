@@ -0,0 +1,238 @@
+import hashlib
+import os
+import pickle
+import re
+from typing import Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+SNAPSHOT_VERSION = 2
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for comparison (lowercase, remove extra spaces)."""
+    return re.sub(r'\s+', ' ', text.lower().strip())
+
+
+def normalize_url(url: str) -> str:
+    """Normalize URL for comparison (remove fragments, normalize scheme)."""
+    if not url:
+        return ""
+    return url.split('#')[0].lower().strip()
+
+
+def fingerprint(normalized: str) -> int:
+    """64-bit fingerprint of a normalized title or URL."""
+    return int.from_bytes(hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def article_fingerprints(title: str, link: str) -> Tuple[int, int]:
+    """
+    (Title_Hash, Link_Hash) stored in IPO_Scraped_Articles: fingerprints of the
+    normalized title and URL, enforced unique by the database.
+    """
+    return fingerprint(normalize_text(title)), fingerprint(normalize_url(link))
+
+
+class FingerprintSet:
+    """
+    Compact alternative to a set of normalized strings.
+
+    Stores only 64-bit fingerprints: a sorted NumPy uint64 array searched with
+    binary search, plus a small Python set buffering recent additions. The
+    buffer is merged into the array once it outgrows a fraction of it, so
+    inserts stay amortized cheap. Memory is ~8 bytes per entry instead of the
+    full string plus set overhead; membership is subject to 64-bit collisions
+    (negligible at tens of millions of entries).
+    """
+
+    def __init__(self, buffer_limit: int = 4096):
+        self.buffer_limit = buffer_limit
+        self._sorted = np.empty(0, dtype=np.uint64)
+        self._buffer = set()
+
+    def __contains__(self, item: str) -> bool:
+        return self.contains_fingerprint(fingerprint(item))
+
+    def add(self, item: str) -> None:
+        self.add_fingerprint(fingerprint(item))
+
+    def contains_fingerprint(self, value: int) -> bool:
+        """Membership test for a precomputed fingerprint."""
+        if value in self._buffer:
+            return True
+        key = np.uint64(value)
+        position = self._sorted.searchsorted(key)
+        return position < len(self._sorted) and self._sorted[position] == key
+
+    def add_fingerprint(self, value: int) -> None:
+        """Insert a precomputed fingerprint."""
+        self._buffer.add(value)
+        if len(self._buffer) > max(self.buffer_limit, len(self._sorted) // 32):
+            self._merge()
+
+    def update(self, items: Iterable[str]) -> None:
+        """Bulk insert normalized strings with a single merge."""
+        self._insert_sorted(np.fromiter((fingerprint(item) for item in items), dtype=np.uint64))
+
+    def _merge(self) -> None:
+        """Fold the insertion buffer into the sorted array."""
+        if self._buffer:
+            self._insert_sorted(np.fromiter(self._buffer, dtype=np.uint64, count=len(self._buffer)))
+            self._buffer = set()
+
+    def _insert_sorted(self, values: np.ndarray) -> None:
+        """Insert new values into the sorted array with one linear pass (no full re-sort)."""
+        values = np.unique(values)
+        if not len(self._sorted):
+            self._sorted = values
+            return
+        positions = self._sorted.searchsorted(values)
+        existing = self._sorted[np.minimum(positions, len(self._sorted) - 1)] == values
+        self._sorted = np.insert(self._sorted, positions[~existing], values[~existing])
+
+    def __len__(self) -> int:
+        self._merge()
+        return len(self._sorted)
+
+    def __iter__(self) -> Iterator[int]:
+        self._merge()
+        return (int(value) for value in self._sorted)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the structure, in bytes."""
+        return self._sorted.nbytes + len(self._buffer) * 64
+
+    def __getstate__(self):
+        self._merge()
+        return {'buffer_limit': self.buffer_limit, 'sorted': self._sorted}
+
+    def __setstate__(self, state):
+        self.buffer_limit = state['buffer_limit']
+        self._sorted = state['sorted']
+        self._buffer = set()
+
+
+DEDUP_STORES = {
+    'set': set,
+    'fingerprint': FingerprintSet,
+}
+
+
+class RunView:
+    """
+    Set-like view used for one scraper run: membership checks see both the
+    persistent index and this run's additions, while add() only records the
+    addition for this run. Articles that are found but never stored therefore
+    do not leak into the persistent index.
+    """
+
+    def __init__(self, base):
+        self.base = base
+        self.added = set()
+
+    def __contains__(self, item: str) -> bool:
+        return item in self.added or item in self.base
+
+    def add(self, item: str) -> None:
+        self.added.add(item)
+
+    def __len__(self) -> int:
+        return len(self.base) + len(self.added)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.base
+        yield from self.added
+
+
+class DedupIndex:
+    """
+    Normalized titles and links already stored in IPO_Scraped_Articles,
+    kept in memory across scraper runs and topped up from the highest seen id.
+    Optionally snapshotted to a local file so a restarted process warm-starts.
+
+    Ids are handed out when a row is inserted, not when it commits, so a
+    batch from the streaming pipeline or another scraper can become visible
+    below an id already seen. Each top-up therefore re-reads the last
+    trailing_ids ids below last_id; adding an article twice is harmless.
+
+    store selects the container for titles and links: 'set' keeps the full
+    normalized strings, 'fingerprint' keeps compact 64-bit FingerprintSets.
+    """
+
+    def __init__(self, snapshot_path: Optional[str] = None, source_key: str = '', store: str = 'set',
+                 trailing_ids: int = 1000):
+        """source_key identifies the database the index was built from (e.g. host/db)."""
+        if store not in DEDUP_STORES:
+            raise ValueError(f"Unknown dedup store '{store}'. Choose one of: {', '.join(DEDUP_STORES)}")
+        self.snapshot_path = snapshot_path
+        self.source_key = source_key
+        self.store = store
+        self.titles = DEDUP_STORES[store]()
+        self.links = DEDUP_STORES[store]()
+        self.last_id = 0
+        self.trailing_ids = trailing_ids
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def add(self, normalized_title: str, normalized_link: str) -> None:
+        """Record one stored article."""
+        self.titles.add(normalized_title)
+        self.links.add(normalized_link)
+
+    def reread_from(self) -> int:
+        """Id above which the next top-up reads, trailing_ids below the highest seen id."""
+        return max(self.last_id - self.trailing_ids, 0)
+
+    def reset(self) -> None:
+        """Forget everything, forcing a full reload on the next top-up."""
+        self.titles = DEDUP_STORES[self.store]()
+        self.links = DEDUP_STORES[self.store]()
+        self.last_id = 0
+
+    def run_view(self) -> Tuple[RunView, RunView]:
+        """Return (existing_titles, existing_links) views for a single run."""
+        return RunView(self.titles), RunView(self.links)
+
+    def load_snapshot(self) -> bool:
+        """Load the snapshot file if it exists and belongs to this database."""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            print(f"Could not read duplicate index snapshot {self.snapshot_path}: {e}")
+            return False
+
+        if (snapshot.get('version') != SNAPSHOT_VERSION or snapshot.get('source_key') != self.source_key
+                or snapshot.get('store') != self.store):
+            print("Duplicate index snapshot is from another database, version or store; ignoring it.")
+            return False
+
+        self.titles = snapshot['titles']
+        self.links = snapshot['links']
+        self.last_id = snapshot['last_id']
+        print(f"Warm-started duplicate index with {len(self.titles)} articles (up to id {self.last_id}).")
+        return True
+
+    def save_snapshot(self) -> None:
+        """Atomically write the index to the snapshot file."""
+        if not self.snapshot_path:
+            return
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'source_key': self.source_key,
+            'store': self.store,
+            'last_id': self.last_id,
+            'titles': self.titles,
+            'links': self.links,
+        }
+        try:
+            tmp_path = f"{self.snapshot_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            print(f"Could not write duplicate index snapshot {self.snapshot_path}: {e}")
@@ -1,23 +1,94 @@
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 from urllib.parse import urljoin, urlparse
 import mysql.connector
 import time
 import traceback
 import sys
-import re
 from typing import Set, List, Dict, Tuple, Optional
 import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import os
 
+from article_text import ArticleContentCache, ArticleTextFetcher
+from dedup_index import DedupIndex, RunView, article_fingerprints, fingerprint, normalize_text, normalize_url
+from html_parsers import Document, get_parser_backend, response_encoding
+from http_client import PooledHttpClient
+from keyword_matcher import KeywordMatch, KeywordMatcher
+from metrics import MetricsServer, ScraperMetrics
+from near_duplicates import NearDuplicateIndex, title_tokens
+from parquet_cache import ParquetArticleCache
+from rate_limiter import HostRateLimiter
+from rollups import apply_counts, count_rows, inserted_counts
+from snapshot_store import PageSnapshotStore
+from source_scheduler import SourceScheduler
+from streaming_pipeline import StreamingPipeline
+
+
+# Scraper behaviour defaults; override any key through the scraper_config argument
+DEFAULT_SCRAPER_CONFIG = {
+    'request_timeout': 15,       # Timeout for HTTP requests (seconds)
+    'rate_limit_per_second': 0.5,  # Default requests per second allowed against one host
+    'rate_limit_burst': 1,       # Requests a host may receive back to back before throttling
+    'rate_limits': {},           # Per-host (requests per second, burst) overrides, e.g. {'www.livemint.com': (0.2, 1)}
+    'concurrent_fetch': False,   # Fetch and parse all sources in parallel
+    'max_workers': 8,            # Global limit on concurrent fetches
+    'max_per_host': 2,           # Concurrent fetches allowed against one host
+    'conditional_get': True,     # Send If-None-Match / If-Modified-Since headers
+    'http_cache_path': 'http_cache.json',  # On-disk ETag / Last-Modified cache
+    'http_pool_size': 10,        # Keep-alive connections kept per host
+    'html_parser': 'html.parser',  # Parser backend: html.parser, lxml or lxml-css
+    'dedup_snapshot_path': 'dedup_index.pkl',  # Warm-start file for the duplicate index
+    'dedup_store': 'set',        # Duplicate index container: set or fingerprint (compact 64-bit)
+    'db_fingerprints': False,    # Insert Title_Hash / Link_Hash (run migrate_fingerprints.py first)
+    'preload_existing': True,    # Load the duplicate index before each run
+    'insert_batch_size': 100,    # Articles per executemany round trip and commit
+    'daily_rollups': False,      # Keep IPO_Article_Daily_Counts current on insert (run rollups.py --rebuild first)
+    'scrape_interval_minutes': 90,  # Fixed cycle length, and starting interval for adaptive polling
+    'adaptive_schedule': False,  # Poll each source on its own adaptive interval
+    'min_poll_minutes': 15,      # Shortest adaptive interval for a busy source
+    'max_poll_minutes': 360,     # Longest adaptive interval for a quiet source
+    'schedule_state_path': 'schedule_state.json',  # Persisted adaptive schedule
+    'streaming_pipeline': False,  # Insert articles while other sites are still being scraped
+    'pipeline_queue_size': 100,  # Items buffered between pipeline stages
+    'pipeline_flush_seconds': 2,  # Longest time an article waits for its insert batch to fill
+    'near_duplicates': False,    # Cluster near-identical stories and store Cluster_Id (run migrate_clusters.py first)
+    'near_duplicate_threshold': 0.6,  # Word-set Jaccard similarity that counts as the same story
+    'near_duplicate_window_days': 7,  # How far back new headlines are compared
+    'near_duplicate_snapshot_path': 'near_duplicates.pkl',  # Warm-start file for the near-duplicate index
+    'fetch_article_text': False,  # Fetch relevant articles and store body text in IPO_Article_Content
+    'article_workers': 4,        # Concurrent article page fetches
+    'article_max_per_host': 2,   # Concurrent article fetches allowed against one host
+    'article_cache_dir': 'article_cache',  # On-disk cache of extracted article text
+    'article_cache_max_mb': 200,  # Size cap of the article cache
+    'article_max_chars': 100000,  # Longest body text kept per article
+    'page_snapshots': False,     # Keep every fetched source page for reprocessing
+    'snapshot_dir': 'page_snapshots',  # Root of the content-addressed snapshot store
+    'snapshot_compression': 'gzip',  # gzip, or zstd when the zstandard package is installed
+    'snapshot_retention_days': 30,  # Days of manifests kept (0 keeps everything)
+    'snapshot_max_mb': 1024,     # Size cap for stored pages (0 for no cap)
+    'metrics_enabled': False,    # Record stage timings and counters, served in Prometheus text format
+    'metrics_host': '127.0.0.1',  # Interface the metrics endpoint listens on
+    'metrics_port': 9108,        # Port of the metrics endpoint started by main()
+    'parquet_cache_dir': '',     # Export new articles to this Parquet cache after each run ('' disables)
+}
+
 
 class NewsArticleScraper:
-    def __init__(self, db_config: dict):
-        """Initialize the scraper with database configuration."""
+    def __init__(self, db_config: dict, scraper_config: Optional[dict] = None):
+        """Initialize the scraper with database and optional scraper configuration."""
         self.db_config = db_config
+        self.config = {**DEFAULT_SCRAPER_CONFIG, **(scraper_config or {})}
         self.db = None
+        self.keyword_matcher = None
+
+        # Stage timings and counters; every hot-path call skips recording when None
+        self.metrics = None
+        if self.config['metrics_enabled']:
+            self.metrics = ScraperMetrics()
+
         self.connect_to_database()
         
         # Enhanced keyword mapping with exact word matching
@@ -53,6 +124,10 @@ class NewsArticleScraper:
             'Entrackr': "https://entrackr.com/",
             'Livemint': "https://www.livemint.com/"
         }
+
+        # Per-source (requests per second, burst) overrides of the default rate
+        # limit, keyed like self.urls; sources sharing a host get the strictest limit
+        self.rate_limits = {}
         
         # Request headers
         self.headers = {
@@ -64,6 +139,105 @@ class NewsArticleScraper:
             'Upgrade-Insecure-Requests': '1',
         }
 
+        # HTML parser backend used by fetch_and_parse and the extract_articles_* methods
+        self.parser = get_parser_backend(self.config['html_parser'])
+
+        # Duplicate index kept across runs and topped up incrementally from the database
+        self.dedup_index = DedupIndex(
+            self.config['dedup_snapshot_path'],
+            source_key=f"{self.db_config.get('host')}/{self.db_config.get('database')}",
+            store=self.config['dedup_store']
+        )
+        self.dedup_index.load_snapshot()
+
+        # Near-duplicate story clusters across sources (recent window only)
+        self.near_duplicates = None
+        if self.config['near_duplicates']:
+            self.near_duplicates = NearDuplicateIndex(
+                threshold=self.config['near_duplicate_threshold'],
+                window_seconds=self.config['near_duplicate_window_days'] * 24 * 3600,
+                snapshot_path=self.config['near_duplicate_snapshot_path']
+            )
+            if not self.near_duplicates.load_snapshot():
+                self.load_recent_clusters()
+
+        # One pooled client for the lifetime of the scraper so connections are reused
+        self.http = PooledHttpClient(
+            self.headers,
+            cache_path=self.config['http_cache_path'],
+            conditional_get=self.config['conditional_get'],
+            pool_size=self.config['http_pool_size']
+        )
+
+        # Token bucket per host, applied in fetch_page to outbound requests only
+        self.rate_limiter = HostRateLimiter(self.config['rate_limit_per_second'], self.config['rate_limit_burst'],
+                                            self.config['rate_limits'])
+        self.rate_limiter.configure(self.urls, self.rate_limits)
+
+        # Compressed copies of fetched pages, so extractors can be re-run offline
+        self.snapshots = None
+        if self.config['page_snapshots']:
+            self.snapshots = PageSnapshotStore(
+                self.config['snapshot_dir'],
+                compression=self.config['snapshot_compression'],
+                retention_days=self.config['snapshot_retention_days'],
+                max_bytes=self.config['snapshot_max_mb'] * 1024 * 1024
+            )
+
+        # Columnar copy of the article table read by the dashboards instead of MySQL
+        self.parquet_cache = None
+        if self.config['parquet_cache_dir']:
+            try:
+                self.parquet_cache = ParquetArticleCache(self.config['parquet_cache_dir'])
+            except RuntimeError as e:
+                print(f"{e}; the Parquet cache is disabled.")
+
+        # Follow-up full-text extraction for relevant articles (stored off the hot path)
+        self.article_text = None
+        if self.config['fetch_article_text']:
+            self.article_text = ArticleTextFetcher(
+                self.http,
+                self.rate_limiter,
+                self.parser,
+                ArticleContentCache(self.config['article_cache_dir'], self.config['article_cache_max_mb'] * 1024 * 1024),
+                max_workers=self.config['article_workers'],
+                max_per_host=self.config['article_max_per_host'],
+                timeout=self.config['request_timeout'],
+                max_chars=self.config['article_max_chars']
+            )
+
+    @property
+    def keyword_mapping(self) -> Dict[str, List[str]]:
+        """Category -> keywords used to classify headlines."""
+        return self._keyword_mapping
+
+    @keyword_mapping.setter
+    def keyword_mapping(self, mapping: Dict[str, List[str]]) -> None:
+        self._keyword_mapping = mapping
+        self.reload_keywords()
+
+    @property
+    def exclusion_keywords(self) -> List[str]:
+        """Keywords that exclude an otherwise relevant headline."""
+        return self._exclusion_keywords
+
+    @exclusion_keywords.setter
+    def exclusion_keywords(self, keywords: List[str]) -> None:
+        self._exclusion_keywords = keywords
+        self.reload_keywords()
+
+    def reload_keywords(self) -> None:
+        """
+        Recompile the keyword matcher from keyword_mapping and exclusion_keywords.
+        Runs automatically when either attribute is assigned; call it after
+        mutating one of them in place.
+        """
+        mapping = getattr(self, '_keyword_mapping', None)
+        exclusions = getattr(self, '_exclusion_keywords', None)
+        if mapping is None or exclusions is None:
+            return
+        self.keyword_matcher = KeywordMatcher(mapping, exclusions)
+
     def connect_to_database(self) -> None:
         """Establish database connection with error handling."""
         try:
@@ -86,61 +260,95 @@ class NewsArticleScraper:
             print(f"Failed to reconnect to database: {err}")
             return False
 
-    def get_existing_articles(self) -> Tuple[Set[str], Set[str]]:
+    def get_existing_articles(self) -> Tuple[RunView, RunView]:
         """
-        Fetch existing article titles and links from database to prevent duplicates.
-        Returns tuple of (title_hashes, link_hashes) for efficient duplicate checking.
+        Top up the in-memory duplicate index with rows inserted since the last seen id
+        (plus the trailing window that late commits can land in, see DedupIndex)
+        instead of re-reading the whole table, then snapshot it for warm restarts.
+        Returns (existing_titles, existing_links) views for one run.
         """
-        existing_titles = set()
-        existing_links = set()
+        index = self.dedup_index
         
         if not self.ensure_db_connection():
-            return set(), set()
+            return index.run_view()
 
         cursor = self.db.cursor()
         try:
-            cursor.execute("SELECT Title, Article_Link FROM IPO_Scraped_Articles")
-            for title, link in cursor.fetchall():
-                # Use hash for efficient comparison and normalize case
-                existing_titles.add(self.normalize_text(title))
-                existing_links.add(self.normalize_url(link))
+            query_start = time.perf_counter()
+            cursor.execute("SELECT MAX(id) FROM IPO_Scraped_Articles")
+            max_id = cursor.fetchall()[0][0] or 0
+            if self.metrics is not None:
+                self.metrics.observe_db('max_id', time.perf_counter() - query_start)
+            if max_id < index.last_id:
+                # Table was truncated or restored from an older backup
+                print("Article ids went backwards since the last load; rebuilding duplicate index.")
+                index.reset()
+
+            query_start = time.perf_counter()
+            cursor.execute(
+                "SELECT id, Title, Article_Link FROM IPO_Scraped_Articles WHERE id > %s ORDER BY id",
+                (index.reread_from(),)
+            )
+            seen_id = index.last_id
+            new_rows = 0
+            for row_id, title, link in cursor:
+                normalized_title, normalized_link = self.normalize_text(title), self.normalize_url(link)
+                # Rows of the trailing window are usually indexed already
+                if row_id > seen_id or normalized_title not in index.titles or normalized_link not in index.links:
+                    index.add(normalized_title, normalized_link)
+                    new_rows += 1
+                index.last_id = max(index.last_id, row_id)
+            if self.metrics is not None:
+                # Includes streaming the rows into the index, which is how long the load blocks a run
+                self.metrics.observe_db('load_existing', time.perf_counter() - query_start)
                 
-            print(f"Loaded {len(existing_titles)} existing articles from database.")
+            print(f"Loaded {new_rows} new articles from database ({len(index)} indexed in total).")
+            if new_rows:
+                index.save_snapshot()
         except mysql.connector.Error as err:
             print(f"Error fetching existing articles from DB: {err}")
         finally:
             cursor.close()
             
-        return existing_titles, existing_links
+        return index.run_view()
+
+    def load_recent_clusters(self) -> None:
+        """Seed the near-duplicate index with articles stored within the comparison window."""
+        if not self.ensure_db_connection():
+            return
+
+        cursor = self.db.cursor()
+        try:
+            cursor.execute(
+                "SELECT Title, Cluster_Id, UNIX_TIMESTAMP(inserted_at) FROM IPO_Scraped_Articles "
+                "WHERE inserted_at >= NOW() - INTERVAL %s DAY ORDER BY id",
+                (self.config['near_duplicate_window_days'],)
+            )
+            for title, cluster_id, inserted_at in cursor:
+                if cluster_id is None:
+                    self.near_duplicates.assign(title, float(inserted_at))
+                else:
+                    self.near_duplicates.add(title_tokens(title), cluster_id, float(inserted_at))
+            print(f"Loaded {len(self.near_duplicates)} recent articles into the near-duplicate index.")
+        except mysql.connector.Error as err:
+            print(f"Could not load recent article clusters: {err}")
+        finally:
+            cursor.close()
 
     def normalize_text(self, text: str) -> str:
         """Normalize text for comparison (lowercase, remove extra spaces)."""
-        return re.sub(r'\s+', ' ', text.lower().strip())
+        return normalize_text(text)
 
     def normalize_url(self, url: str) -> str:
         """Normalize URL for comparison (remove fragments, normalize scheme)."""
-        if not url:
-            return ""
-        return url.split('#')[0].lower().strip()
+        return normalize_url(url)
 
-    def exact_keyword_match(self, text: str, keywords: List[str]) -> Tuple[bool, str]:
+    def classify_article(self, heading: str) -> KeywordMatch:
         """
-        Check if any keyword appears as a complete word in the text.
-        Returns (is_match, matched_keyword)
+        Scan a headline once with the compiled keyword matcher.
+        Returns KeywordMatch(category, keyword, exclusion)
         """
-        if not text:
-            return False, ""
-            
-        # Normalize text for matching
-        normalized_text = text.lower()
-        
-        for keyword in keywords:
-            # Create word boundary pattern for exact matching
-            pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-            if re.search(pattern, normalized_text):
-                return True, keyword
-                
-        return False, ""
+        return self.keyword_matcher.match(heading)
 
     def is_excluded_article(self, heading: str) -> Tuple[bool, str]:
         """
@@ -150,55 +358,62 @@ class NewsArticleScraper:
         if not heading:
             return False, ""
             
-        # Check for exclusion keywords using exact word matching
-        is_excluded, matched_keyword = self.exact_keyword_match(heading, self.exclusion_keywords)
-        return is_excluded, matched_keyword
+        match = self.classify_article(heading)
+        return bool(match.exclusion), match.exclusion
 
     def categorize_article(self, heading: str) -> Tuple[bool, str, bool]:
         """
         Categorize article based on exact keyword matching.
         Returns (is_relevant, category, has_relevant_but_excluded)
         """
-        # First check for relevant keywords
-        has_relevant_keyword = False
-        relevant_category = "Other"
+        match = self.classify_article(heading)
         
-        for category, keywords in self.keyword_mapping.items():
-            is_match, matched_keyword = self.exact_keyword_match(heading, keywords)
-            if is_match:
-                has_relevant_keyword = True
-                relevant_category = category
-                break
+        # No relevant keywords found
+        if match.category is None:
+            return False, "Other", False
         
-        # If has relevant keywords, check for exclusion keywords
-        if has_relevant_keyword:
-            is_excluded, _ = self.is_excluded_article(heading)
-            if is_excluded:
-                # This article has relevant keywords but is excluded
-                return False, "Excluded", True
-            else:
-                # This article has relevant keywords and is not excluded
-                return True, relevant_category, False
+        # This article has relevant keywords but is excluded
+        if match.exclusion:
+            return False, "Excluded", True
         
-        # No relevant keywords found
-        return False, "Other", False
+        # This article has relevant keywords and is not excluded
+        return True, match.category, False
 
-    def fetch_and_parse(self, url: str, timeout: int = 15) -> Optional[BeautifulSoup]:
-        """Fetch URL and return BeautifulSoup object with enhanced error handling."""
+    def fetch_page(self, url: str, timeout: int = 15) -> Optional[requests.Response]:
+        """
+        Fetch URL through the pooled client with enhanced error handling.
+        Returns the response (status 200, or 304 when the page is unchanged) or None on failure.
+        """
+        site_name = None if self.metrics is None else self.site_for_url(url)
         try:
-            session = requests.Session()
-            session.headers.update(self.headers)
-            
-            response = session.get(url, timeout=timeout, allow_redirects=True)
+            waited = self.rate_limiter.acquire(url)
+            fetch_start = time.perf_counter()
+            response = self.http.get(url, timeout=timeout)
+            if site_name is not None:
+                self.metrics.observe_stage('throttle', site_name, waited)
+                self.metrics.observe_stage('fetch', site_name, time.perf_counter() - fetch_start)
+                self.metrics.bytes_downloaded.inc(site_name, amount=len(response.content))
+
+            if response.status_code == 304:
+                if site_name is not None:
+                    self.metrics.pages.inc(site_name, 'not_modified')
+                return response
+
             response.raise_for_status()
             
             # Check if response is HTML
             content_type = response.headers.get('content-type', '').lower()
             if 'html' not in content_type:
                 print(f"Non-HTML content received from {url}")
+                self.http.forget(url)
                 return None
+
+            if self.snapshots is not None:
+                self.snapshots.record(self.site_for_url(url), url, response.content)
+            if site_name is not None:
+                self.metrics.pages.inc(site_name, 'ok')
                 
-            return BeautifulSoup(response.content, 'html.parser')
+            return response
             
         except requests.exceptions.Timeout:
             print(f"Request timed out for {url}")
@@ -207,14 +422,64 @@ class NewsArticleScraper:
         except requests.exceptions.RequestException as e:
             print(f"Request error for {url}: {e}")
         except Exception as e:
-            print(f"Unexpected error parsing {url}: {e}")
-            
+            print(f"Unexpected error fetching {url}: {e}")
+
+        if site_name is not None:
+            self.metrics.pages.inc(site_name, 'failed')
         return None
 
-    def extract_articles_moneycontrol(self, soup: BeautifulSoup, base_url: str) -> List[Tuple[str, str]]:
-        """Extract articles from MoneyControl with multiple selectors."""
+    def site_for_url(self, url: str) -> str:
+        """Configured site name for a source URL, or its host for other URLs."""
+        for site_name, site_url in self.urls.items():
+            if site_url == url:
+                return site_name
+        return urlparse(url).netloc.lower()
+
+    def parse_html(self, url: str, content: bytes, encoding: Optional[str] = None) -> Optional[Document]:
+        """Parse a fetched page with the configured backend, returning None if it cannot be parsed."""
+        try:
+            if self.metrics is None:
+                return self.parser.parse(content, encoding)
+            parse_start = time.perf_counter()
+            document = self.parser.parse(content, encoding)
+            self.metrics.observe_stage('parse', self.site_for_url(url), time.perf_counter() - parse_start)
+            return document
+        except Exception as e:
+            print(f"Unexpected error parsing {url}: {e}")
+            self.http.forget(url)
+            return None
+
+    def fetch_and_parse(self, url: str, timeout: int = 15) -> Optional[Document]:
+        """Fetch URL and return the parsed document, or None if unavailable or unchanged."""
+        response = self.fetch_page(url, timeout=timeout)
+        if response is None or response.status_code == 304:
+            return None
+        return self.parse_html(url, response.content, response_encoding(response))
+
+    def extract_links(self, soup: Document, base_url: str, selectors: List[str],
+                      use_title_attr: bool = True, skip_prefix: Optional[str] = None) -> List[Tuple[str, str]]:
+        """
+        Extract (url, title) pairs from the anchors matched by any of the selectors.
+        The selectors are combined into one selector group, so the page is walked
+        once and every anchor is returned once, in document order.
+        """
         articles = []
         
+        for element in self.parser.select(soup, ', '.join(selectors)):
+            if use_title_attr:
+                title = self.parser.attr(element, 'title') or self.parser.text(element)
+            else:
+                title = self.parser.text(element)
+            href = self.parser.attr(element, 'href')
+            
+            if title and href and not (skip_prefix and href.startswith(skip_prefix)):
+                full_url = urljoin(base_url, href)
+                articles.append((full_url, title))
+                
+        return articles
+
+    def extract_articles_moneycontrol(self, soup: Document, base_url: str) -> List[Tuple[str, str]]:
+        """Extract articles from MoneyControl with multiple selectors."""
         # Try multiple selectors for robustness
         selectors = [
             'div.item a',
@@ -223,44 +488,18 @@ class NewsArticleScraper:
             '.news-item a',
             '.story-card a'
         ]
-        
-        for selector in selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                title = element.get('title') or element.get_text(strip=True)
-                href = element.get('href')
-                
-                if title and href:
-                    full_url = urljoin(base_url, href)
-                    articles.append((full_url, title))
-                    
-        return articles
+        return self.extract_links(soup, base_url, selectors)
 
-    def extract_articles_zeebiz(self, soup: BeautifulSoup, base_url: str, is_economy: bool = False) -> List[Tuple[str, str]]:
+    def extract_articles_zeebiz(self, soup: Document, base_url: str, is_economy: bool = False) -> List[Tuple[str, str]]:
         """Extract articles from ZeeBiz with different selectors for economy vs general."""
-        articles = []
-        
         if is_economy:
             selectors = ['a.swdetl-mrgn0', '.story-title a', 'h2 a', 'h3 a']
         else:
             selectors = ['h3 a', 'h2 a', '.story-title a', '.news-title a']
-            
-        for selector in selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                title = element.get('title') or element.get_text(strip=True)
-                href = element.get('href')
-                
-                if title and href:
-                    full_url = urljoin(base_url, href)
-                    articles.append((full_url, title))
-                    
-        return articles
+        return self.extract_links(soup, base_url, selectors)
 
-    def extract_articles_economic_times(self, soup: BeautifulSoup, base_url: str) -> List[Tuple[str, str]]:
+    def extract_articles_economic_times(self, soup: Document, base_url: str) -> List[Tuple[str, str]]:
         """Extract articles from Economic Times."""
-        articles = []
-        
         selectors = [
             'article a',
             '.story-card a',
@@ -268,66 +507,41 @@ class NewsArticleScraper:
             'h3 a',
             '.eachStory a'
         ]
-        
-        for selector in selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                title = element.get('title') or element.get_text(strip=True)
-                href = element.get('href')
-                
-                if title and href and not href.startswith('javascript:'):
-                    full_url = urljoin(base_url, href)
-                    articles.append((full_url, title))
-                    
-        return articles
+        return self.extract_links(soup, base_url, selectors, skip_prefix='javascript:')
 
-    def extract_articles_mna_critique(self, soup: BeautifulSoup, base_url: str) -> List[Tuple[str, str]]:
+    def extract_articles_mna_critique(self, soup: Document, base_url: str) -> List[Tuple[str, str]]:
         """Extract articles from MNA Critique."""
-        articles = []
-        
-        elements = soup.select('h2.entry-title a, .entry-title a')
-        for element in elements:
-            title = element.get_text(strip=True)
-            href = element.get('href')
-            
-            if title and href:
-                full_url = urljoin(base_url, href)
-                articles.append((full_url, title))
-                
-        return articles
+        selectors = ['h2.entry-title a', '.entry-title a']
+        return self.extract_links(soup, base_url, selectors, use_title_attr=False)
 
-    def extract_articles_entrackr(self, soup: BeautifulSoup, base_url: str) -> List[Tuple[str, str]]:
+    def extract_articles_entrackr(self, soup: Document, base_url: str) -> List[Tuple[str, str]]:
         """Extract articles from Entrackr."""
         articles = []
         
         # Look for headings within links or parent links of headings
         selectors = ['h2 a', 'h3 a', 'a h2', 'a h3', '.post-title a']
         
-        for selector in selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                if element.name == 'a':
-                    title = element.get_text(strip=True)
-                    href = element.get('href')
+        for element in self.parser.select(soup, ', '.join(selectors)):
+            if self.parser.tag(element) == 'a':
+                title = self.parser.text(element)
+                href = self.parser.attr(element, 'href')
+            else:
+                # If element is heading, find parent link
+                parent_link = self.parser.parent_link(element)
+                if parent_link is not None:
+                    title = self.parser.text(element)
+                    href = self.parser.attr(parent_link, 'href')
                 else:
-                    # If element is heading, find parent link
-                    parent_link = element.find_parent('a')
-                    if parent_link:
-                        title = element.get_text(strip=True)
-                        href = parent_link.get('href')
-                    else:
-                        continue
-                
-                if title and href:
-                    full_url = urljoin(base_url, href)
-                    articles.append((full_url, title))
+                    continue
+            
+            if title and href:
+                full_url = urljoin(base_url, href)
+                articles.append((full_url, title))
                     
         return articles
 
-    def extract_articles_livemint(self, soup: BeautifulSoup, base_url: str) -> List[Tuple[str, str]]:
+    def extract_articles_livemint(self, soup: Document, base_url: str) -> List[Tuple[str, str]]:
         """Extract articles from Livemint."""
-        articles = []
-        
         selectors = [
             'h2.imgStory a',
             'h3 a',
@@ -335,58 +549,209 @@ class NewsArticleScraper:
             '.headline a',
             'h2 a'
         ]
+        return self.extract_links(soup, base_url, selectors, use_title_attr=False, skip_prefix='#')
+
+    def dedupe_articles(self, raw_articles: List[Tuple[str, str]]) -> Tuple[List[Tuple[str, str]], int]:
+        """
+        Drop repeated (url, title) pairs, keeping the first occurrence.
+        Returns (unique_articles, duplicates_dropped)
+        """
+        seen = set()
+        unique_articles = []
+        for article in raw_articles:
+            if article not in seen:
+                seen.add(article)
+                unique_articles.append(article)
+        return unique_articles, len(raw_articles) - len(unique_articles)
+
+    def extract_site_articles(self, site_name: str, soup: Document, url: str) -> Tuple[List[Tuple[str, str]], int]:
+        """
+        Dispatch a parsed page to the extractor for its site.
+        Returns (unique_articles, duplicates_dropped)
+        """
+        extract_start = time.perf_counter()
+        raw_articles = []
+        if site_name == 'MoneyControl':
+            raw_articles = self.extract_articles_moneycontrol(soup, url)
+        elif site_name == 'ZeeBiz Economy':
+            raw_articles = self.extract_articles_zeebiz(soup, url, is_economy=True)
+        elif site_name == 'ZeeBiz':
+            raw_articles = self.extract_articles_zeebiz(soup, url, is_economy=False)
+        elif site_name == 'Economic Times':
+            raw_articles = self.extract_articles_economic_times(soup, url)
+        elif site_name == 'MNA Critique':
+            raw_articles = self.extract_articles_mna_critique(soup, url)
+        elif site_name == 'Entrackr':
+            raw_articles = self.extract_articles_entrackr(soup, url)
+        elif site_name == 'Livemint':
+            raw_articles = self.extract_articles_livemint(soup, url)
+        extraction = self.dedupe_articles(raw_articles)
+        if self.metrics is not None:
+            self.metrics.observe_stage('extract', site_name, time.perf_counter() - extract_start)
+        return extraction
+
+    def fetch_site_articles(self, site_name: str, url: str) -> Optional[Tuple[List[Tuple[str, str]], int]]:
+        """
+        Fetch, parse and extract unique (url, title) pairs for one site.
+        Returns (articles, duplicates_dropped), or None if the page could not be fetched.
+        """
+        response = self.fetch_page(url, timeout=self.config['request_timeout'])
+        if response is None:
+            return None
+
+        # Unchanged since the last completed run: skip parsing and extraction entirely
+        if response.status_code == 304:
+            print(f"{site_name} not modified since last run, skipping.")
+            return [], 0
+
+        soup = self.parse_html(url, response.content, response_encoding(response))
+        if soup is None:
+            return None
+        return self.extract_site_articles(site_name, soup, url)
+
+    def build_host_limits(self, sites: Dict[str, str]) -> Dict[str, threading.BoundedSemaphore]:
+        """One semaphore per host allowing max_per_host concurrent fetches."""
+        host_limits = {}
+        for url in sites.values():
+            host = urlparse(url).netloc.lower()
+            if host not in host_limits:
+                host_limits[host] = threading.BoundedSemaphore(self.config['max_per_host'])
+        return host_limits
+
+    def fetch_all_sources(self, sites: Dict[str, str]) -> Dict[str, Optional[Tuple[List[Tuple[str, str]], int]]]:
+        """
+        Fetch and extract every site in parallel.
+        Concurrency is bounded globally by max_workers and per host by max_per_host.
+        Returns a dict of site_name -> (articles, duplicates_dropped), None when the fetch failed.
+        """
+        host_limits = self.build_host_limits(sites)
+
+        def fetch_with_host_limit(site_name: str, url: str) -> Optional[Tuple[List[Tuple[str, str]], int]]:
+            with host_limits[urlparse(url).netloc.lower()]:
+                return self.fetch_site_articles(site_name, url)
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.config['max_workers']) as executor:
+            futures = {
+                site_name: executor.submit(fetch_with_host_limit, site_name, url)
+                for site_name, url in sites.items()
+            }
+            for site_name, future in futures.items():
+                try:
+                    results[site_name] = future.result()
+                except Exception as e:
+                    print(f"Unexpected error scraping {site_name}: {e}")
+                    results[site_name] = None
+
+        return results
+
+    def process_article(self, site_name: str, article_url: str, heading: str, scraped_date: str,
+                        existing_titles: Set[str], existing_links: Set[str]) -> Tuple[str, Optional[Dict]]:
+        """
+        Evaluate one extracted article (see evaluate_article), recording its
+        classify time and outcome when metrics are enabled.
+        """
+        if self.metrics is None:
+            return self.evaluate_article(site_name, article_url, heading, scraped_date, existing_titles, existing_links)
+        classify_start = time.perf_counter()
+        outcome, record = self.evaluate_article(
+            site_name, article_url, heading, scraped_date, existing_titles, existing_links
+        )
+        self.metrics.observe_stage('classify', site_name, time.perf_counter() - classify_start)
+        self.metrics.articles.inc(site_name, outcome)
+        return outcome, record
+
+    def evaluate_article(self, site_name: str, article_url: str, heading: str, scraped_date: str,
+                         existing_titles: Set[str], existing_links: Set[str]) -> Tuple[str, Optional[Dict]]:
+        """
+        Validate, dedupe and classify one extracted (url, title) pair.
+        Relevant articles are added to existing_titles / existing_links so later
+        copies in the same run are treated as duplicates.
+        Returns tuple of (outcome, record): outcome is 'invalid', 'duplicate',
+        'irrelevant', 'excluded' (record describes the exclusion) or 'relevant'
+        (record is the article to insert).
+        """
+        # Skip invalid articles
+        if not article_url or not heading or len(heading.strip()) < 10:
+            return 'invalid', None
         
-        for selector in selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                title = element.get_text(strip=True)
-                href = element.get('href')
-                
-                if title and href and not href.startswith('#'):
-                    full_url = urljoin(base_url, href)
-                    articles.append((full_url, title))
-                    
-        return articles
+        # Normalize for duplicate checking
+        normalized_title = self.normalize_text(heading)
+        normalized_url = self.normalize_url(article_url)
+        
+        # Check for duplicates
+        if normalized_title in existing_titles or normalized_url in existing_links:
+            return 'duplicate', None
+        
+        # Check keyword relevance and exclusion in a single scan
+        match = self.classify_article(heading)
+        
+        if match.category is None:
+            return 'irrelevant', None
+
+        if match.exclusion:
+            # Article has relevant keywords but contains exclusion keywords
+            return 'excluded', {
+                'website': site_name,
+                'heading': heading.strip(),
+                'link': article_url,
+                'exclusion_reason': match.exclusion,
+                'relevant_category': match.category
+            }
+        
+        # Add to existing sets to prevent duplicates in current run
+        existing_titles.add(normalized_title)
+        existing_links.add(normalized_url)
+        record = {
+            'scraped_date': scraped_date,
+            'website': site_name,
+            'keyword': match.category,
+            'heading': heading.strip(),
+            'link': article_url
+        }
+        if self.near_duplicates is not None:
+            record['cluster_id'], record['near_duplicate'] = self.near_duplicates.assign(record['heading'])
+        return 'relevant', record
 
-    def scrape_articles(self, scraped_date: str, existing_titles: Set[str], existing_links: Set[str]) -> Tuple[List[Dict], List[Dict]]:
+    def scrape_articles(self, scraped_date: str, existing_titles: Set[str], existing_links: Set[str],
+                        sites: Optional[Dict[str, str]] = None) -> Tuple[List[Dict], List[Dict]]:
         """
-        Scrape articles from all configured websites with enhanced duplicate detection.
+        Scrape articles from the given websites (all configured websites by default)
+        with enhanced duplicate detection.
         Returns tuple of (scraped_articles, relevant_but_excluded_articles)
         """
+        if sites is None:
+            sites = self.urls
         scraped_articles = []
         relevant_but_excluded_articles = []  # Only articles with relevant keywords but excluded
         total_processed = 0
         total_relevant = 0
         total_duplicates = 0
+        total_links_dropped = 0
         total_relevant_but_excluded = 0
 
-        for site_name, url in self.urls.items():
+        # In concurrent mode every page is fetched up front; articles are still
+        # processed in sites order so results match the sequential path
+        prefetched = None
+        if self.config['concurrent_fetch']:
+            print(f"\nFetching {len(sites)} sources concurrently...")
+            prefetched = self.fetch_all_sources(sites)
+
+        for site_name, url in sites.items():
             print(f"\n--- Scraping {site_name} ---")
             
-            soup = self.fetch_and_parse(url)
-            if not soup:
+            if prefetched is not None:
+                extraction = prefetched.get(site_name)
+            else:
+                extraction = self.fetch_site_articles(site_name, url)
+
+            if extraction is None:
                 print(f"Failed to fetch {site_name}")
                 continue
 
-            # Extract articles based on site
-            raw_articles = []
-            
-            if site_name == 'MoneyControl':
-                raw_articles = self.extract_articles_moneycontrol(soup, url)
-            elif site_name == 'ZeeBiz Economy':
-                raw_articles = self.extract_articles_zeebiz(soup, url, is_economy=True)
-            elif site_name == 'ZeeBiz':
-                raw_articles = self.extract_articles_zeebiz(soup, url, is_economy=False)
-            elif site_name == 'Economic Times':
-                raw_articles = self.extract_articles_economic_times(soup, url)
-            elif site_name == 'MNA Critique':
-                raw_articles = self.extract_articles_mna_critique(soup, url)
-            elif site_name == 'Entrackr':
-                raw_articles = self.extract_articles_entrackr(soup, url)
-            elif site_name == 'Livemint':
-                raw_articles = self.extract_articles_livemint(soup, url)
-
-            print(f"Found {len(raw_articles)} raw articles from {site_name}")
+            raw_articles, duplicates_dropped = extraction
+            print(f"Found {len(raw_articles)} raw articles from {site_name} "
+                  f"({duplicates_dropped} duplicate links dropped)")
 
             # Process articles for keywords and duplicates
             site_processed = 0
@@ -396,131 +761,251 @@ class NewsArticleScraper:
             
             for article_url, heading in raw_articles:
                 site_processed += 1
-                
-                # Skip invalid articles
-                if not article_url or not heading or len(heading.strip()) < 10:
-                    continue
-                
-                # Normalize for duplicate checking
-                normalized_title = self.normalize_text(heading)
-                normalized_url = self.normalize_url(article_url)
-                
-                # Check for duplicates
-                if normalized_title in existing_titles or normalized_url in existing_links:
+                outcome, record = self.process_article(
+                    site_name, article_url, heading, scraped_date, existing_titles, existing_links
+                )
+                if outcome == 'duplicate':
                     site_duplicates += 1
-                    continue
-                
-                # Check keyword relevance and exclusion
-                is_relevant, category, has_relevant_but_excluded = self.categorize_article(heading)
-                
-                if has_relevant_but_excluded:
-                    # Article has relevant keywords but contains exclusion keywords
+                elif outcome == 'excluded':
                     site_relevant_but_excluded += 1
-                    is_excluded, matched_exclusion = self.is_excluded_article(heading)
-                    relevant_but_excluded_articles.append({
-                        'website': site_name,
-                        'heading': heading.strip(),
-                        'link': article_url,
-                        'exclusion_reason': matched_exclusion,
-                        'relevant_category': category
-                    })
-                    continue
-                
-                if is_relevant:
+                    relevant_but_excluded_articles.append(record)
+                elif outcome == 'relevant':
                     site_relevant += 1
-                    
-                    # Add to results
-                    scraped_articles.append({
-                        'scraped_date': scraped_date,
-                        'website': site_name,
-                        'keyword': category,
-                        'heading': heading.strip(),
-                        'link': article_url
-                    })
-                    
-                    # Add to existing sets to prevent duplicates in current run
-                    existing_titles.add(normalized_title)
-                    existing_links.add(normalized_url)
-                    
-                    # Batch pause every 10 relevant articles
-                    if len(scraped_articles) % 10 == 0:
-                        print(f"Found {len(scraped_articles)} relevant articles, pausing 30 seconds...")
-                        time.sleep(30)
+                    scraped_articles.append(record)
 
             print(f"{site_name}: Processed={site_processed}, Relevant={site_relevant}, Duplicates={site_duplicates}, Relevant_but_Excluded={site_relevant_but_excluded}")
             
             total_processed += site_processed
             total_relevant += site_relevant
             total_duplicates += site_duplicates
+            total_links_dropped += duplicates_dropped
             total_relevant_but_excluded += site_relevant_but_excluded
-            
-            # Small delay between sites
-            time.sleep(2)
 
         print(f"\n--- Scraping Summary ---")
         print(f"Total processed: {total_processed}")
         print(f"Total relevant: {total_relevant}")
         print(f"Total duplicates skipped: {total_duplicates}")
+        print(f"Total repeated links dropped during extraction: {total_links_dropped}")
         print(f"Total relevant but excluded: {total_relevant_but_excluded}")
         print(f"New articles to insert: {len(scraped_articles)}")
 
         return scraped_articles, relevant_but_excluded_articles
 
-    def insert_into_db(self, scraped_articles: List[Dict]) -> None:
-        """Insert scraped articles into database with enhanced error handling."""
+    def build_insert_rows(self, scraped_articles: List[Dict]) -> List[Tuple]:
+        """
+        Convert scraped articles into parameter tuples for the INSERT statement.
+        Each distinct scraped_date string is parsed once; fingerprint columns are
+        appended when db_fingerprints is enabled, then Cluster_Id with near_duplicates.
+        """
+        parsed_dates = {}
+        rows = []
+        for article in scraped_articles:
+            scraped_date = article['scraped_date']
+            if scraped_date not in parsed_dates:
+                parsed_dates[scraped_date] = datetime.strptime(scraped_date, '%d-%m-%y').date()
+
+            row = (
+                parsed_dates[scraped_date],
+                article['website'],
+                article['keyword'],
+                article['heading'],
+                article['link']
+            )
+            if self.config['db_fingerprints']:
+                row += article_fingerprints(article['heading'], article['link'])
+            if self.near_duplicates is not None:
+                row += (article.get('cluster_id'),)
+            rows.append(row)
+        return rows
+
+    def insert_rows_individually(self, cursor, query: str, rows: List[Tuple]) -> Tuple[List[int], int]:
+        """
+        Fallback for a batch that failed as a whole: insert and commit row by row
+        so one bad article does not cost the rest of the batch.
+        Returns tuple of (positions of the rows written, rows failed).
+        """
+        written = []
+        failed = 0
+        for position, row in enumerate(rows):
+            try:
+                row_start = time.perf_counter()
+                cursor.execute(query, row)
+                row_written = max(cursor.rowcount, 0)
+                if self.config['daily_rollups'] and row_written:
+                    apply_counts(cursor, count_rows([row]))
+                self.db.commit()
+                if self.metrics is not None:
+                    self.metrics.observe_db('insert_row', time.perf_counter() - row_start)
+                if row_written:
+                    written.append(position)
+            except mysql.connector.Error as err:
+                print(f"Error inserting article '{row[3][:60]}': {err}")
+                self.db.rollback()
+                failed += 1
+        return written, failed
+
+    def update_rollups(self, cursor, batch: List[Tuple], written: int) -> None:
+        """
+        Add a batch's new articles to the daily rollup table, inside the batch's
+        transaction. When fingerprints made MySQL skip some rows, the rows
+        actually written are looked up before counting.
+        """
+        if written == len(batch):
+            counts = count_rows(batch)
+        else:
+            counts = inserted_counts(cursor, batch, cursor.lastrowid)
+        apply_counts(cursor, counts)
+
+    def written_articles(self, cursor, articles: List[Dict], batch: List[Tuple],
+                         written: int, first_id: int) -> List[Dict]:
+        """
+        Articles of a batch that its INSERT actually wrote. When fingerprints
+        made MySQL skip some rows, the batch's own rows are looked up by
+        Link_Hash and id, as for the rollups (see inserted_counts).
+        """
+        if written == len(batch):
+            return articles
+        if not written:
+            return []
+        link_hashes = [row[6] for row in batch]
+        cursor.execute(
+            f"SELECT Link_Hash FROM IPO_Scraped_Articles "
+            f"WHERE id >= %s AND Link_Hash IN ({', '.join(['%s'] * len(link_hashes))})",
+            [first_id] + link_hashes
+        )
+        stored = {link_hash for (link_hash,) in cursor.fetchall()}
+        return [article for article, row in zip(articles, batch) if row[6] in stored]
+
+    def insert_into_db(self, scraped_articles: List[Dict], batch_size: Optional[int] = None) -> bool:
+        """
+        Insert scraped articles into database in batches.
+        Each batch is one executemany round trip and one commit; a batch that
+        fails is rolled back and retried row by row. With db_fingerprints the
+        Title_Hash / Link_Hash unique indexes make MySQL skip articles that are
+        already stored, even when another scraper process inserted them.
+        With fetch_article_text, the articles each batch wrote are queued for
+        text extraction once it commits; skipped duplicates are not.
+        Returns True when every article was written.
+        """
         if not scraped_articles:
             print("No new articles to insert.")
-            return
+            return True
 
         if not self.ensure_db_connection():
             print("Database connection failed. Cannot insert articles.")
-            return
+            return False
 
-        cursor = self.db.cursor()
-        query = """
+        insert_start = time.perf_counter()
+        batch_size = batch_size or self.config['insert_batch_size']
+        columns = ['Scraped_Date', 'Website', 'Keyword', 'Title', 'Article_Link']
+        if self.config['db_fingerprints']:
+            columns += ['Title_Hash', 'Link_Hash']
+        if self.near_duplicates is not None:
+            columns.append('Cluster_Id')
+        query = f"""
         INSERT INTO IPO_Scraped_Articles 
-        (Scraped_Date, Website, Keyword, Title, Article_Link, sent_status, inserted_at)
-        VALUES (%s, %s, %s, %s, %s, 0, NOW())
+        ({', '.join(columns)}, sent_status, inserted_at)
+        VALUES ({', '.join(['%s'] * len(columns))}, 0, NOW())
         """
-        
-        successful_inserts = 0
+        if self.config['db_fingerprints']:
+            query += "ON DUPLICATE KEY UPDATE id = id"
+
+        cursor = self.db.cursor()
+        total = len(scraped_articles)
+        total_batches = (total + batch_size - 1) // batch_size
+        new_rows = 0
+        already_stored = 0
         failed_inserts = 0
 
         try:
-            for i, article in enumerate(scraped_articles):
+            rows = self.build_insert_rows(scraped_articles)
+            for batch_number, start in enumerate(range(0, total, batch_size), 1):
+                batch = rows[start:start + batch_size]
+                batch_articles = scraped_articles[start:start + batch_size]
+                batch_start = time.perf_counter()
                 try:
-                    article_date = datetime.strptime(article['scraped_date'], '%d-%m-%y').date()
-                    
-                    cursor.execute(query, (
-                        article_date,
-                        article['website'],
-                        article['keyword'],
-                        article['heading'],
-                        article['link']
-                    ))
-                    
-                    successful_inserts += 1
-                    
-                    # Commit in batches
-                    if successful_inserts % 10 == 0:
-                        self.db.commit()
-                        print(f"Inserted {successful_inserts}/{len(scraped_articles)} articles...")
-                        
+                    cursor.executemany(query, batch)
+                    # Rows skipped by ON DUPLICATE KEY UPDATE id = id report 0 affected rows
+                    written = max(cursor.rowcount, 0)
+                    first_id = cursor.lastrowid
+                    if self.config['daily_rollups'] and written:
+                        self.update_rollups(cursor, batch, written)
+                    self.db.commit()
+                    if self.metrics is not None:
+                        self.metrics.observe_db('insert_batch', time.perf_counter() - batch_start)
+                    failed = 0
+                    written_articles = None
                 except mysql.connector.Error as err:
-                    print(f"Error inserting article: {err}")
-                    failed_inserts += 1
+                    print(f"Batch {batch_number}/{total_batches} failed ({err}); retrying row by row...")
                     self.db.rollback()
+                    positions, failed = self.insert_rows_individually(cursor, query, batch)
+                    written = len(positions)
+                    written_articles = [batch_articles[position] for position in positions]
+
+                new_rows += written
+                failed_inserts += failed
+                already_stored += len(batch) - written - failed
+                elapsed_ms = (time.perf_counter() - batch_start) * 1000
+                print(f"Batch {batch_number}/{total_batches}: {written}/{len(batch)} inserted "
+                      f"in {elapsed_ms:.1f} ms")
+
+                if self.article_text is not None:
+                    if written_articles is None:
+                        written_articles = self.written_articles(cursor, batch_articles, batch, written, first_id)
+                    self.article_text.submit(written_articles)
 
-            # Final commit
-            self.db.commit()
-            
         except Exception as e:
             print(f"Unexpected error during insertion: {e}")
             self.db.rollback()
+            # Everything not confirmed written or skipped as a duplicate counts as failed
+            failed_inserts = total - new_rows - already_stored
         finally:
             cursor.close()
 
-        print(f"Insertion complete: {successful_inserts} successful, {failed_inserts} failed")
+        if self.metrics is not None:
+            self.metrics.observe_stage('insert', 'all', time.perf_counter() - insert_start)
+            self.metrics.inserted.inc(amount=new_rows)
+
+        if self.config['db_fingerprints']:
+            print(f"Insertion complete: {new_rows} new, {already_stored} already in database, "
+                  f"{failed_inserts} failed")
+        else:
+            print(f"Insertion complete: {new_rows} successful, {failed_inserts} failed")
+        return failed_inserts == 0
+
+    def store_article_texts(self) -> bool:
+        """
+        Wait for queued full-text extractions and upsert them into IPO_Article_Content,
+        keyed by the article's Link_Hash. Returns True when every row was written.
+        """
+        texts = self.article_text.collect()
+        self.article_text.print_stats()
+        if not texts:
+            return True
+
+        if not self.ensure_db_connection():
+            print("Database connection failed. Cannot store article text.")
+            return False
+
+        cursor = self.db.cursor()
+        try:
+            cursor.executemany("""
+            INSERT INTO IPO_Article_Content (Link_Hash, Article_Link, Body, Published_At)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE Body = VALUES(Body), Published_At = VALUES(Published_At)
+            """, [
+                (fingerprint(normalize_url(text.url)), text.url, text.body, text.published_at)
+                for text in texts
+            ])
+            self.db.commit()
+            print(f"Stored text for {len(texts)} articles.")
+            return True
+        except mysql.connector.Error as err:
+            print(f"Error storing article text: {err}")
+            self.db.rollback()
+            return False
+        finally:
+            cursor.close()
 
     def print_relevant_but_excluded_articles(self, relevant_but_excluded_articles: List[Dict]) -> None:
         """Print details of articles that had relevant keywords but were excluded."""
@@ -560,47 +1045,239 @@ class NewsArticleScraper:
         print(f"{'='*80}")
 
         for i, article in enumerate(articles, 1):
-            print(f"\n[{i}] {article['keyword']} | {article['website']}")
+            similar = " | similar story already seen" if article.get('near_duplicate') else ""
+            print(f"\n[{i}] {article['keyword']} | {article['website']}{similar}")
             print(f"Title: {article['heading']}")
             print(f"Link: {article['link']}")
             print("-" * 80)
 
-    def run_scraper(self) -> None:
-        """Execute the complete scraping process."""
+    def run_scraper(self, sites: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+        """
+        Execute the complete scraping process for the given websites (all by default).
+        Returns the number of new relevant articles found per website.
+        """
+        if sites is None:
+            sites = self.urls
         print(f"\n{'='*80}")
         print(f"SCRAPER RUN STARTED: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{'='*80}")
 
+        run_start = time.perf_counter()
         scraped_date = datetime.now().strftime('%d-%m-%y')
+        self.http.reset_stats()
+        self.rate_limiter.reset_stats()
+        if self.article_text is not None:
+            self.article_text.reset_stats()
+        if self.snapshots is not None:
+            self.snapshots.start_run()
+        self.rate_limiter.configure(self.urls, self.rate_limits)
 
-        # Get existing articles to prevent duplicates
-        existing_titles, existing_links = self.get_existing_articles()
+        # Get existing articles to prevent duplicates. With database-enforced
+        # fingerprints the preload is optional: MySQL rejects stored articles itself
+        if self.config['db_fingerprints'] and not self.config['preload_existing']:
+            existing_titles, existing_links = self.dedup_index.run_view()
+        else:
+            existing_titles, existing_links = self.get_existing_articles()
 
-        # Scrape new articles and get relevant but excluded ones
-        scraped_articles, relevant_but_excluded_articles = self.scrape_articles(scraped_date, existing_titles, existing_links)
+        if self.config['streaming_pipeline']:
+            # Scrape, classify and insert concurrently, batch by batch
+            pipeline = StreamingPipeline(
+                self,
+                queue_size=self.config['pipeline_queue_size'],
+                flush_seconds=self.config['pipeline_flush_seconds'],
+                batch_size=self.config['insert_batch_size']
+            )
+            new_per_site, all_inserted = pipeline.run(scraped_date, existing_titles, existing_links, sites)
+        else:
+            # Scrape new articles and get relevant but excluded ones
+            scraped_articles, relevant_but_excluded_articles = self.scrape_articles(
+                scraped_date, existing_titles, existing_links, sites
+            )
 
-        # Display results
-        self.print_articles(scraped_articles)
-        
-        # Display relevant articles that were excluded due to exclusion keywords
-        self.print_relevant_but_excluded_articles(relevant_but_excluded_articles)
+            # Display results
+            self.print_articles(scraped_articles)
+            
+            # Display relevant articles that were excluded due to exclusion keywords
+            self.print_relevant_but_excluded_articles(relevant_but_excluded_articles)
+
+            # Insert into database
+            all_inserted = True
+            if scraped_articles:
+                all_inserted = self.insert_into_db(scraped_articles)
+
+            new_per_site = {site_name: 0 for site_name in sites}
+            for article in scraped_articles:
+                new_per_site[article['website']] += 1
+
+        if self.article_text is not None:
+            self.store_article_texts()
 
-        # Insert into database
-        if scraped_articles:
-            self.insert_into_db(scraped_articles)
+        # Only trust this run's validators once its articles are stored
+        if all_inserted:
+            self.http.commit_validators()
+        else:
+            self.http.discard_pending()
+        self.http.print_stats()
+        self.rate_limiter.print_stats()
+        if self.near_duplicates is not None:
+            self.near_duplicates.save_snapshot()
+        if self.snapshots is not None:
+            self.snapshots.finish_run()
+            self.snapshots.print_stats()
+        if self.parquet_cache is not None:
+            self.export_parquet_cache()
+        if self.metrics is not None:
+            self.metrics.observe_stage('run', 'all', time.perf_counter() - run_start)
+            self.metrics.runs.inc()
+            self.metrics.last_run.set(time.time())
 
         print(f"\n{'='*80}")
         print(f"SCRAPER RUN COMPLETED: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{'='*80}")
+        return new_per_site
+
+    def export_parquet_cache(self) -> None:
+        """Append this run's articles to the Parquet article cache."""
+        if not self.db or not self.db.is_connected():
+            return
+        try:
+            exported = self.parquet_cache.export(self.db)
+            print(f"Parquet cache: {exported} articles exported to {self.parquet_cache.root}")
+        except (mysql.connector.Error, OSError, ValueError) as e:
+            # pyarrow's ArrowInvalid / ArrowIOError derive from ValueError / OSError
+            print(f"Could not export the Parquet cache: {e}")
 
     def close_connection(self) -> None:
-        """Close database connection."""
+        """Close database connection, the article text workers and the pooled HTTP client."""
+        if self.article_text is not None:
+            self.article_text.close()
+        self.http.close()
         if self.db and self.db.is_connected():
             self.db.close()
             print("Database connection closed.")
 
 load_dotenv()
 
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Read a boolean flag (true/false, 1/0, yes/no) from the environment."""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def env_int(name: str, default: int) -> int:
+    """Read an integer from the environment, falling back to the default."""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return int(value)
+
+
+def env_float(name: str, default: float) -> float:
+    """Read a float from the environment, falling back to the default."""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return float(value)
+
+
+def env_rate_limits(name: str, default_burst: int) -> Dict[str, Tuple[float, int]]:
+    """
+    Read per-host rate limits from the environment as comma-separated
+    host=rate or host=rate:burst pairs, e.g. "www.livemint.com=0.2,entrackr.com=1:3".
+    """
+    limits = {}
+    for pair in (os.getenv(name) or '').split(','):
+        if not pair.strip():
+            continue
+        host, separator, value = pair.partition('=')
+        if not separator or not host.strip():
+            raise ValueError(f"{name}: expected host=rate or host=rate:burst, got '{pair.strip()}'")
+        rate, _, burst = value.partition(':')
+        limits[host.strip().lower()] = (float(rate), int(burst) if burst.strip() else default_burst)
+    return limits
+
+
+def get_scraper_config() -> dict:
+    """Build the scraper configuration from environment variables."""
+    return {
+        'request_timeout': env_int('REQUEST_TIMEOUT_SECONDS', DEFAULT_SCRAPER_CONFIG['request_timeout']),
+        'rate_limit_per_second': env_float('RATE_LIMIT_PER_SECOND', DEFAULT_SCRAPER_CONFIG['rate_limit_per_second']),
+        'rate_limit_burst': env_int('RATE_LIMIT_BURST', DEFAULT_SCRAPER_CONFIG['rate_limit_burst']),
+        'rate_limits': env_rate_limits(
+            'RATE_LIMITS', env_int('RATE_LIMIT_BURST', DEFAULT_SCRAPER_CONFIG['rate_limit_burst'])),
+        'concurrent_fetch': env_flag('CONCURRENT_FETCH', DEFAULT_SCRAPER_CONFIG['concurrent_fetch']),
+        'max_workers': env_int('MAX_FETCH_WORKERS', DEFAULT_SCRAPER_CONFIG['max_workers']),
+        'max_per_host': env_int('MAX_FETCH_PER_HOST', DEFAULT_SCRAPER_CONFIG['max_per_host']),
+        'conditional_get': env_flag('CONDITIONAL_GET', DEFAULT_SCRAPER_CONFIG['conditional_get']),
+        'http_cache_path': os.getenv('HTTP_CACHE_PATH', DEFAULT_SCRAPER_CONFIG['http_cache_path']),
+        'html_parser': os.getenv('HTML_PARSER', DEFAULT_SCRAPER_CONFIG['html_parser']),
+        'dedup_snapshot_path': os.getenv('DEDUP_SNAPSHOT_PATH', DEFAULT_SCRAPER_CONFIG['dedup_snapshot_path']),
+        'dedup_store': os.getenv('DEDUP_STORE', DEFAULT_SCRAPER_CONFIG['dedup_store']),
+        'db_fingerprints': env_flag('DB_FINGERPRINTS', DEFAULT_SCRAPER_CONFIG['db_fingerprints']),
+        'preload_existing': env_flag('PRELOAD_EXISTING', DEFAULT_SCRAPER_CONFIG['preload_existing']),
+        'insert_batch_size': env_int('INSERT_BATCH_SIZE', DEFAULT_SCRAPER_CONFIG['insert_batch_size']),
+        'daily_rollups': env_flag('DAILY_ROLLUPS', DEFAULT_SCRAPER_CONFIG['daily_rollups']),
+        'scrape_interval_minutes': env_int('SCRAPE_INTERVAL_MINUTES', DEFAULT_SCRAPER_CONFIG['scrape_interval_minutes']),
+        'adaptive_schedule': env_flag('ADAPTIVE_SCHEDULE', DEFAULT_SCRAPER_CONFIG['adaptive_schedule']),
+        'min_poll_minutes': env_int('MIN_POLL_MINUTES', DEFAULT_SCRAPER_CONFIG['min_poll_minutes']),
+        'max_poll_minutes': env_int('MAX_POLL_MINUTES', DEFAULT_SCRAPER_CONFIG['max_poll_minutes']),
+        'schedule_state_path': os.getenv('SCHEDULE_STATE_PATH', DEFAULT_SCRAPER_CONFIG['schedule_state_path']),
+        'streaming_pipeline': env_flag('STREAMING_PIPELINE', DEFAULT_SCRAPER_CONFIG['streaming_pipeline']),
+        'pipeline_queue_size': env_int('PIPELINE_QUEUE_SIZE', DEFAULT_SCRAPER_CONFIG['pipeline_queue_size']),
+        'pipeline_flush_seconds': env_float('PIPELINE_FLUSH_SECONDS', DEFAULT_SCRAPER_CONFIG['pipeline_flush_seconds']),
+        'near_duplicates': env_flag('NEAR_DUPLICATES', DEFAULT_SCRAPER_CONFIG['near_duplicates']),
+        'near_duplicate_threshold': env_float('NEAR_DUPLICATE_THRESHOLD',
+                                              DEFAULT_SCRAPER_CONFIG['near_duplicate_threshold']),
+        'near_duplicate_window_days': env_int('NEAR_DUPLICATE_WINDOW_DAYS',
+                                              DEFAULT_SCRAPER_CONFIG['near_duplicate_window_days']),
+        'near_duplicate_snapshot_path': os.getenv('NEAR_DUPLICATE_SNAPSHOT_PATH',
+                                                  DEFAULT_SCRAPER_CONFIG['near_duplicate_snapshot_path']),
+        'fetch_article_text': env_flag('FETCH_ARTICLE_TEXT', DEFAULT_SCRAPER_CONFIG['fetch_article_text']),
+        'article_workers': env_int('ARTICLE_WORKERS', DEFAULT_SCRAPER_CONFIG['article_workers']),
+        'article_max_per_host': env_int('ARTICLE_MAX_PER_HOST', DEFAULT_SCRAPER_CONFIG['article_max_per_host']),
+        'article_cache_dir': os.getenv('ARTICLE_CACHE_DIR', DEFAULT_SCRAPER_CONFIG['article_cache_dir']),
+        'article_cache_max_mb': env_int('ARTICLE_CACHE_MAX_MB', DEFAULT_SCRAPER_CONFIG['article_cache_max_mb']),
+        'article_max_chars': env_int('ARTICLE_MAX_CHARS', DEFAULT_SCRAPER_CONFIG['article_max_chars']),
+        'page_snapshots': env_flag('PAGE_SNAPSHOTS', DEFAULT_SCRAPER_CONFIG['page_snapshots']),
+        'snapshot_dir': os.getenv('SNAPSHOT_DIR', DEFAULT_SCRAPER_CONFIG['snapshot_dir']),
+        'snapshot_compression': os.getenv('SNAPSHOT_COMPRESSION', DEFAULT_SCRAPER_CONFIG['snapshot_compression']),
+        'snapshot_retention_days': env_int('SNAPSHOT_RETENTION_DAYS', DEFAULT_SCRAPER_CONFIG['snapshot_retention_days']),
+        'snapshot_max_mb': env_int('SNAPSHOT_MAX_MB', DEFAULT_SCRAPER_CONFIG['snapshot_max_mb']),
+        'metrics_enabled': env_flag('METRICS_ENABLED', DEFAULT_SCRAPER_CONFIG['metrics_enabled']),
+        'metrics_host': os.getenv('METRICS_HOST', DEFAULT_SCRAPER_CONFIG['metrics_host']),
+        'metrics_port': env_int('METRICS_PORT', DEFAULT_SCRAPER_CONFIG['metrics_port']),
+        'parquet_cache_dir': os.getenv('PARQUET_CACHE_DIR', DEFAULT_SCRAPER_CONFIG['parquet_cache_dir']),
+    }
+
+
+def run_adaptive_schedule(scraper: NewsArticleScraper) -> None:
+    """Poll each source only when it is due, adapting its interval to its yield of new articles."""
+    config = scraper.config
+    scheduler = SourceScheduler(
+        scraper.urls,
+        base_interval=config['scrape_interval_minutes'] * 60,
+        min_interval=config['min_poll_minutes'] * 60,
+        max_interval=config['max_poll_minutes'] * 60,
+        state_path=config['schedule_state_path']
+    )
+
+    while True:
+        due_sites = scheduler.due()
+        if due_sites:
+            new_per_site = scraper.run_scraper({site_name: scraper.urls[site_name] for site_name in due_sites})
+            for site_name in due_sites:
+                scheduler.record(site_name, new_per_site.get(site_name, 0))
+            scheduler.save_state()
+            scheduler.print_schedule()
+
+        wait_seconds = scheduler.seconds_until_next_due()
+        print(f"\nWaiting {wait_seconds / 60:.1f} minutes until the next source is due...")
+        time.sleep(wait_seconds)
+
+
 def main():
     """Main function to run the scraper continuously."""
     
@@ -614,18 +1291,29 @@ def main():
         'use_unicode': True,
         'charset': 'utf8mb4'
     }
-    scraper = NewsArticleScraper(db_config)
+    scraper = NewsArticleScraper(db_config, get_scraper_config())
+
+    metrics_server = None
+    if scraper.metrics is not None:
+        try:
+            metrics_server = MetricsServer(scraper.metrics, scraper.config['metrics_host'], scraper.config['metrics_port'])
+            metrics_server.start()
+        except OSError as e:
+            print(f"Could not start metrics endpoint: {e}")
 
     print("Enhanced News Scraper initialized. Starting in 5 seconds...")
     time.sleep(5)
 
     try:
-        while True:
-            scraper.run_scraper()
-            
-            wait_minutes = int(os.getenv('SCRAPE_INTERVAL_MINUTES'))
-            print(f"\nWaiting {wait_minutes} minutes before next run...")
-            time.sleep(wait_minutes * 60)
+        if scraper.config['adaptive_schedule']:
+            run_adaptive_schedule(scraper)
+        else:
+            while True:
+                scraper.run_scraper()
+
+                wait_minutes = scraper.config['scrape_interval_minutes']
+                print(f"\nWaiting {wait_minutes} minutes before next run...")
+                time.sleep(wait_minutes * 60)
             
     except KeyboardInterrupt:
         print("\nScraper interrupted by user.")
@@ -634,6 +1322,8 @@ def main():
         traceback.print_exc()
     finally:
         scraper.close_connection()
+        if metrics_server is not None:
+            metrics_server.stop()
         print("Scraper shutdown complete.")
 
 
@@ -0,0 +1,146 @@
+import codecs
+import threading
+from typing import Any, Dict, List, Optional
+
+from bs4 import BeautifulSoup, UnicodeDammit
+
+# Parsed page as returned by a backend (BeautifulSoup or lxml root element)
+Document = Any
+# Element selected from a Document
+Node = Any
+
+
+class Bs4Backend:
+    """BeautifulSoup backend using one of its tree builders (html.parser or lxml)."""
+
+    def __init__(self, features: str = 'html.parser'):
+        self.name = features
+        self.features = features
+
+    def parse(self, content: bytes, encoding: Optional[str] = None) -> Document:
+        """
+        Parse raw page content into a BeautifulSoup tree. encoding is the
+        charset from the HTTP headers; without it the page's own declaration
+        or a guess is used.
+        """
+        return BeautifulSoup(content, self.features, from_encoding=encoding)
+
+    def select(self, document: Document, selector: str) -> List[Node]:
+        """Return elements matching a CSS selector (group selectors allowed) in document order."""
+        return document.select(selector)
+
+    def attr(self, node: Node, name: str) -> Optional[str]:
+        """Return an attribute value or None."""
+        return node.get(name)
+
+    def text(self, node: Node) -> str:
+        """Return the element's text, stripped per fragment, like get_text(strip=True)."""
+        return node.get_text(strip=True)
+
+    def tag(self, node: Node) -> str:
+        """Return the element's tag name."""
+        return node.name
+
+    def parent_link(self, node: Node) -> Optional[Node]:
+        """Return the nearest enclosing <a> element, if any."""
+        return node.find_parent('a')
+
+
+class LxmlBackend:
+    """
+    Native lxml backend with compiled CSS selectors (via cssselect).
+    Produces the same (url, title) output as the BeautifulSoup backends at a
+    fraction of the parse and select cost.
+    """
+
+    name = 'lxml-css'
+
+    def __init__(self):
+        # Imported lazily so the default backend works without cssselect installed
+        import lxml.html
+        from lxml import etree
+        from lxml.cssselect import CSSSelector
+
+        self._html = lxml.html
+        self._css_selector = CSSSelector
+        self._selectors: Dict[str, Any] = {}
+        # One parser per encoding and thread: a shared lxml parser serializes its users
+        self._local = threading.local()
+        # BeautifulSoup's get_text() skips strings inside these containers
+        self._text_xpath = etree.XPath(
+            './/text()[not(ancestor::script or ancestor::style or ancestor::template'
+            ' or ancestor::rt or ancestor::rp)]'
+        )
+
+    def parse(self, content: bytes, encoding: Optional[str] = None) -> Document:
+        """
+        Parse raw page content into an lxml root element. Without an encoding
+        from the HTTP headers, the charset is detected the way BeautifulSoup
+        does it (page declaration, then UTF-8, then windows-1252); libxml2
+        alone would read an undeclared UTF-8 page as Latin-1.
+        """
+        if encoding is None:
+            encoding = UnicodeDammit(content, is_html=True).original_encoding
+        if encoding is None:  # Pure ASCII or already text
+            return self._html.document_fromstring(content)
+        parsers = getattr(self._local, 'parsers', None)
+        if parsers is None:
+            parsers = self._local.parsers = {}
+        parser = parsers.get(encoding)
+        if parser is None:
+            parser = parsers[encoding] = self._html.HTMLParser(encoding=encoding)
+        return self._html.document_fromstring(content, parser=parser)
+
+    def select(self, document: Document, selector: str) -> List[Node]:
+        """Return elements matching a CSS selector, compiling each selector only once."""
+        compiled = self._selectors.get(selector)
+        if compiled is None:
+            compiled = self._css_selector(selector, translator='html')
+            self._selectors[selector] = compiled
+        return compiled(document)
+
+    def attr(self, node: Node, name: str) -> Optional[str]:
+        """Return an attribute value or None."""
+        return node.get(name)
+
+    def text(self, node: Node) -> str:
+        """Return the element's text, stripped per fragment, like get_text(strip=True)."""
+        return ''.join(fragment.strip() for fragment in self._text_xpath(node))
+
+    def tag(self, node: Node) -> str:
+        """Return the element's tag name."""
+        return node.tag
+
+    def parent_link(self, node: Node) -> Optional[Node]:
+        """Return the nearest enclosing <a> element, if any."""
+        return next(node.iterancestors('a'), None)
+
+
+def response_encoding(response) -> Optional[str]:
+    """
+    Charset declared in a response's Content-Type header, or None to let the
+    backend detect it (requests reports ISO-8859-1 for any undeclared text/html).
+    """
+    if 'charset' not in response.headers.get('content-type', '').lower() or not response.encoding:
+        return None
+    try:
+        return codecs.lookup(response.encoding).name
+    except LookupError:
+        return None
+
+
+PARSER_BACKENDS = {
+    'html.parser': lambda: Bs4Backend('html.parser'),
+    'lxml': lambda: Bs4Backend('lxml'),
+    'lxml-css': LxmlBackend,
+}
+
+
+def get_parser_backend(name: str):
+    """Create the parser backend configured by name ('html.parser', 'lxml' or 'lxml-css')."""
+    try:
+        factory = PARSER_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown HTML parser backend '{name}'. "
+                         f"Choose one of: {', '.join(PARSER_BACKENDS)}")
+    return factory()
@@ -0,0 +1,152 @@
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class PooledHttpClient:
+    """
+    Long-lived HTTP client shared by every fetch of the scraper.
+
+    Keeps one requests.Session with a connection pool so keep-alive connections
+    are reused across sites and runs, and remembers ETag / Last-Modified
+    validators per URL so unchanged pages come back as 304 Not Modified.
+    """
+
+    def __init__(self, headers: Dict[str, str], cache_path: Optional[str] = None,
+                 conditional_get: bool = True, pool_size: int = 10):
+        """Create the pooled session and load validators from cache_path if it exists."""
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.cache_path = cache_path
+        self.conditional_get = conditional_get
+        self._lock = threading.Lock()
+
+        # Validators confirmed by a completed run, and those seen in the current run
+        self.validators = self._load_validators() if conditional_get else {}
+        self.pending_validators = {}
+        self.forgotten_urls = set()
+
+        self.stats = {}
+        self.reset_stats()
+
+    def _load_validators(self) -> Dict[str, Dict]:
+        """Load the validator cache from disk, ignoring a missing or corrupt file."""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                validators = json.load(f)
+            print(f"Loaded HTTP validators for {len(validators)} URLs.")
+            return validators
+        except (OSError, ValueError) as e:
+            print(f"Could not read HTTP cache {self.cache_path}: {e}")
+            return {}
+
+    def reset_stats(self) -> None:
+        """Reset the per-run request counters."""
+        with self._lock:
+            self.stats = {
+                'requests': 0,
+                'not_modified': 0,
+                'bytes_downloaded': 0,
+                'bytes_saved': 0,
+            }
+
+    def get(self, url: str, timeout: int = 15, conditional: bool = True) -> requests.Response:
+        """
+        GET a URL through the pooled session, sending conditional headers when
+        validators for the URL are known. conditional=False fetches without
+        reading or recording validators (e.g. one-off article pages).
+        Exceptions from requests propagate.
+        """
+        use_validators = self.conditional_get and conditional
+        headers = {}
+        with self._lock:
+            entry = self.validators.get(url) if use_validators else None
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self.session.get(url, timeout=timeout, allow_redirects=True, headers=headers)
+
+        with self._lock:
+            self.stats['requests'] += 1
+            if response.status_code == 304 and entry:
+                self.stats['not_modified'] += 1
+                self.stats['bytes_saved'] += entry.get('length', 0)
+            elif response.ok and response.status_code != 304:
+                self.stats['bytes_downloaded'] += len(response.content)
+                if use_validators:
+                    etag = response.headers.get('ETag')
+                    last_modified = response.headers.get('Last-Modified')
+                    if etag or last_modified:
+                        self.pending_validators[url] = {
+                            'etag': etag,
+                            'last_modified': last_modified,
+                            'length': len(response.content),
+                        }
+                    else:
+                        self.forgotten_urls.add(url)
+
+        return response
+
+    def forget(self, url: str) -> None:
+        """Drop validators for a URL whose response could not be processed."""
+        with self._lock:
+            self.pending_validators.pop(url, None)
+            self.forgotten_urls.add(url)
+
+    def commit_validators(self) -> None:
+        """
+        Promote validators seen in this run and persist them to disk.
+        Call only once the run's articles are safely stored, otherwise a later
+        304 would hide articles that were never processed.
+        """
+        if not self.conditional_get:
+            return
+        with self._lock:
+            for url in self.forgotten_urls:
+                self.validators.pop(url, None)
+            self.validators.update(self.pending_validators)
+            self.pending_validators = {}
+            self.forgotten_urls = set()
+            validators = dict(self.validators)
+
+        if not self.cache_path:
+            return
+        try:
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(validators, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Could not write HTTP cache {self.cache_path}: {e}")
+
+    def discard_pending(self) -> None:
+        """Throw away validators from a run that did not complete."""
+        with self._lock:
+            self.pending_validators = {}
+            self.forgotten_urls = set()
+
+    def print_stats(self) -> None:
+        """Print the per-run request counters."""
+        with self._lock:
+            stats = dict(self.stats)
+        print(f"HTTP requests: {stats['requests']}, "
+              f"Not modified (skipped): {stats['not_modified']}, "
+              f"Downloaded: {stats['bytes_downloaded'] / 1024:.1f} KB, "
+              f"Saved: {stats['bytes_saved'] / 1024:.1f} KB")
+
+    def close(self) -> None:
+        """Close the pooled session."""
+        self.session.close()
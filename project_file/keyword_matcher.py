@@ -0,0 +1,74 @@
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+
+class KeywordMatch(NamedTuple):
+    """Result of scanning one headline."""
+    category: Optional[str]  # First matching category, None when no relevant keyword matched
+    keyword: str             # Keyword that selected the category ('' when none)
+    exclusion: str           # First matching exclusion keyword ('' when none)
+
+
+class KeywordMatcher:
+    """
+    Whole-word keyword matcher compiled once from the category and exclusion lists.
+
+    All keywords are folded into one alternation, so a headline is scanned in a
+    single pass. Results keep the first-match-wins semantics of checking each
+    category's keywords in order with r'\\bkeyword\\b': every keyword occurring
+    in the text is collected, then the earliest one in list order wins.
+    """
+
+    def __init__(self, keyword_mapping: Dict[str, List[str]], exclusion_keywords: List[str]):
+        """Compile the combined pattern for the given keywords."""
+        # Keyword ids follow priority order: categories in order, then exclusions
+        self._entries = []
+        for category, keywords in keyword_mapping.items():
+            for keyword in keywords:
+                self._entries.append((category, keyword))
+        self._exclusion_start = len(self._entries)
+        for keyword in exclusion_keywords:
+            self._entries.append((None, keyword))
+
+        ids_by_literal = {}
+        for keyword_id, (_, keyword) in enumerate(self._entries):
+            ids_by_literal.setdefault(keyword.lower(), []).append(keyword_id)
+
+        # Longest alternatives first, so at any position the longest keyword wins;
+        # shorter keywords that are whole-word prefixes of it are implied below
+        literals = sorted(ids_by_literal, key=len, reverse=True)
+        self._pattern = re.compile(r'\b(?:' + '|'.join(re.escape(literal) for literal in literals) + r')\b')
+
+        self._implied_ids = {}
+        for literal in literals:
+            implied = set()
+            for other, other_ids in ids_by_literal.items():
+                if re.match(re.escape(other) + r'\b', literal):
+                    implied.update(other_ids)
+            self._implied_ids[literal] = frozenset(implied)
+
+    def match(self, text: str) -> KeywordMatch:
+        """Scan text once and return the matching category, keyword and exclusion keyword."""
+        if not text:
+            return KeywordMatch(None, "", "")
+
+        normalized_text = text.lower()
+        found = set()
+        position = 0
+        while True:
+            found_match = self._pattern.search(normalized_text, position)
+            if found_match is None:
+                break
+            found.update(self._implied_ids[found_match.group()])
+            # Resume just after the match start so overlapping keywords are not missed
+            position = found_match.start() + 1
+
+        category, keyword, exclusion = None, "", ""
+        relevant_ids = [keyword_id for keyword_id in found if keyword_id < self._exclusion_start]
+        if relevant_ids:
+            category, keyword = self._entries[min(relevant_ids)]
+        exclusion_ids = [keyword_id for keyword_id in found if keyword_id >= self._exclusion_start]
+        if exclusion_ids:
+            exclusion = self._entries[min(exclusion_ids)][1]
+
+        return KeywordMatch(category, keyword, exclusion)
@@ -0,0 +1,168 @@
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Sequence, Tuple
+
+# Upper bounds (seconds) for timing histograms, from sub-millisecond classify
+# calls up to slow page fetches
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+class Counter:
+    """Monotonic counter with one series per label-value tuple."""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+
+
+class Gauge(Counter):
+    """Value that can be set to anything, e.g. the time of the last run."""
+
+    kind = 'gauge'
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one series per label-value tuple."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last slot is +Inf), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        with self._lock:
+            snapshot = {labels: (list(counts), total, count) for labels, (counts, total, count) in self._series.items()}
+        names = self.labelnames + ('le',)
+        for labels, (counts, total, count) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                yield f"{self.name}_bucket{_format_labels(names, labels + (le,))} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {total}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}"
+
+
+class ScraperMetrics:
+    """
+    Counters and histograms for one scraper process.
+
+    Only created when metrics are enabled; the scraper keeps None otherwise
+    and skips every recording call, so a disabled build pays for a single
+    attribute check per hot-path call. render() produces the Prometheus text
+    exposition format served by MetricsServer.
+    """
+
+    def __init__(self):
+        self.stage_seconds = Histogram(
+            'scraper_stage_seconds', "Time spent in each pipeline stage", ('stage', 'site'))
+        self.db_seconds = Histogram(
+            'scraper_db_round_trip_seconds', "Database round-trip time by operation", ('operation',))
+        self.articles = Counter(
+            'scraper_articles_total', "Extracted articles by site and outcome", ('site', 'outcome'))
+        self.pages = Counter(
+            'scraper_pages_total', "Source page fetches by site and result", ('site', 'result'))
+        self.bytes_downloaded = Counter(
+            'scraper_bytes_downloaded_total', "Response bytes downloaded for source pages", ('site',))
+        self.inserted = Counter(
+            'scraper_rows_inserted_total', "Rows written by insert_into_db", ())
+        self.runs = Counter(
+            'scraper_runs_total', "Completed scraper runs", ())
+        self.last_run = Gauge(
+            'scraper_last_run_timestamp_seconds', "Unix time the last run completed", ())
+        self._metrics = [self.stage_seconds, self.db_seconds, self.articles, self.pages,
+                         self.bytes_downloaded, self.inserted, self.runs, self.last_run]
+
+    def observe_stage(self, stage: str, site: str, seconds: float) -> None:
+        self.stage_seconds.observe(seconds, stage, site)
+
+    def observe_db(self, operation: str, seconds: float) -> None:
+        self.db_seconds.observe(seconds, operation)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsServer:
+    """Serves ScraperMetrics.render() at /metrics from a background thread."""
+
+    def __init__(self, metrics: ScraperMetrics, host: str = '127.0.0.1', port: int = 9108):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name='metrics-server', daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+        host, port = self.server.server_address[:2]
+        print(f"Metrics available at http://{host}:{port}/metrics")
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,74 @@
+"""
+Create the IPO_Article_Content side table for full-text extraction.
+
+The table holds the extracted body text and publish time of each relevant
+article, keyed by the Link_Hash fingerprint of its normalized Article_Link,
+so article listings never read the large Body column.
+
+Safe to re-run: an existing table is left as it is. After migrating, set
+FETCH_ARTICLE_TEXT=true.
+
+Usage:
+    python migrate_article_content.py
+"""
+import argparse
+import os
+import sys
+
+import mysql.connector
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CONTENT_TABLE = """
+CREATE TABLE IF NOT EXISTS IPO_Article_Content (
+    Link_Hash BIGINT UNSIGNED PRIMARY KEY,
+    Article_Link TEXT NOT NULL,
+    Body MEDIUMTEXT,
+    Published_At DATETIME NULL,
+    Fetched_At TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+)
+"""
+
+
+def create_table(db) -> None:
+    """Create IPO_Article_Content if it is missing."""
+    cursor = db.cursor()
+    try:
+        cursor.execute("SHOW TABLES LIKE 'IPO_Article_Content'")
+        if cursor.fetchall():
+            print("Table IPO_Article_Content already exists.")
+        else:
+            cursor.execute(CONTENT_TABLE)
+            print("Created table IPO_Article_Content.")
+        db.commit()
+    finally:
+        cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create the article full-text table.")
+    parser.parse_args()
+
+    try:
+        db = mysql.connector.connect(
+            host=os.getenv('DB_HOST'),
+            user=os.getenv('DB_USER'),
+            password=os.getenv('MYSQL_ROOT_PASSWORD'),
+            database=os.getenv('DB_NAME')
+        )
+    except mysql.connector.Error as err:
+        sys.exit(f"Database connection error: {err}")
+
+    try:
+        create_table(db)
+        print("Migration complete. Set FETCH_ARTICLE_TEXT=true to store article text.")
+    except mysql.connector.Error as err:
+        db.rollback()
+        sys.exit(f"Migration failed: {err}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Add near-duplicate story clusters to IPO_Scraped_Articles.
+
+Adds the Cluster_Id column (the Title_Hash fingerprint of the first headline
+of each story) with an index, and backfills it by replaying every stored
+article in id order through the same near-duplicate index the scraper uses,
+comparing each headline against those inserted within the window before it.
+
+Safe to re-run: the column and index are detected and skipped, and the
+backfill recomputes every row. After migrating, set NEAR_DUPLICATES=true.
+
+Usage:
+    python migrate_clusters.py [--batch-size 5000] [--threshold 0.6] [--window-days 7]
+"""
+import argparse
+import os
+import sys
+
+import mysql.connector
+from dotenv import load_dotenv
+
+from near_duplicates import NearDuplicateIndex
+
+load_dotenv()
+
+
+def add_column(db) -> None:
+    """Add the nullable Cluster_Id column and its index if they are missing."""
+    cursor = db.cursor()
+    try:
+        cursor.execute("SHOW COLUMNS FROM IPO_Scraped_Articles LIKE 'Cluster_Id'")
+        if cursor.fetchall():
+            print("Column Cluster_Id already exists.")
+        else:
+            cursor.execute("ALTER TABLE IPO_Scraped_Articles ADD COLUMN Cluster_Id BIGINT UNSIGNED NULL")
+            print("Added column Cluster_Id.")
+
+        cursor.execute("SHOW INDEX FROM IPO_Scraped_Articles WHERE Key_name = 'idx_cluster_id'")
+        if cursor.fetchall():
+            print("Index idx_cluster_id already exists.")
+        else:
+            cursor.execute("ALTER TABLE IPO_Scraped_Articles ADD INDEX idx_cluster_id (Cluster_Id)")
+            print("Added index idx_cluster_id.")
+        db.commit()
+    finally:
+        cursor.close()
+
+
+def backfill(db, batch_size: int, threshold: float, window_days: int) -> None:
+    """Assign a cluster to every row, walking the table in id order."""
+    index = NearDuplicateIndex(threshold=threshold, window_seconds=window_days * 24 * 3600)
+    read_cursor = db.cursor()
+    write_cursor = db.cursor()
+    last_id = 0
+    updated = 0
+    near_duplicates = 0
+
+    try:
+        while True:
+            read_cursor.execute(
+                "SELECT id, Title, UNIX_TIMESTAMP(inserted_at) FROM IPO_Scraped_Articles "
+                "WHERE id > %s ORDER BY id LIMIT %s",
+                (last_id, batch_size)
+            )
+            rows = read_cursor.fetchall()
+            if not rows:
+                break
+
+            updates = []
+            for row_id, title, inserted_at in rows:
+                cluster_id, is_near_duplicate = index.assign(title, float(inserted_at))
+                near_duplicates += is_near_duplicate
+                updates.append((cluster_id, row_id))
+                last_id = row_id
+
+            write_cursor.executemany("UPDATE IPO_Scraped_Articles SET Cluster_Id = %s WHERE id = %s", updates)
+            db.commit()
+            updated += len(updates)
+            print(f"Clustered {updated} rows (up to id {last_id})...")
+    finally:
+        read_cursor.close()
+        write_cursor.close()
+
+    print(f"Backfill complete: {updated} rows, {near_duplicates} grouped with an earlier story.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add and backfill near-duplicate story clusters.")
+    parser.add_argument('--batch-size', type=int, default=5000, help="Rows per backfill batch")
+    parser.add_argument('--threshold', type=float, default=float(os.getenv('NEAR_DUPLICATE_THRESHOLD', 0.6)),
+                        help="Word-set Jaccard similarity that counts as the same story")
+    parser.add_argument('--window-days', type=int, default=int(os.getenv('NEAR_DUPLICATE_WINDOW_DAYS', 7)),
+                        help="How far back each headline is compared")
+    args = parser.parse_args()
+
+    try:
+        db = mysql.connector.connect(
+            host=os.getenv('DB_HOST'),
+            user=os.getenv('DB_USER'),
+            password=os.getenv('MYSQL_ROOT_PASSWORD'),
+            database=os.getenv('DB_NAME')
+        )
+    except mysql.connector.Error as err:
+        sys.exit(f"Database connection error: {err}")
+
+    try:
+        add_column(db)
+        backfill(db, args.batch_size, args.threshold, args.window_days)
+        print("Migration complete. Set NEAR_DUPLICATES=true to cluster new articles.")
+    except mysql.connector.Error as err:
+        db.rollback()
+        sys.exit(f"Migration failed: {err}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Add database-enforced duplicate detection to IPO_Scraped_Articles.
+
+Adds the Title_Hash / Link_Hash columns (64-bit fingerprints of the
+normalized title and URL), backfills them for existing rows in batches and
+creates unique indexes on both. Rows that duplicate an earlier article are
+kept but left with NULL hashes so the unique indexes can be built.
+
+Safe to re-run: existing columns and indexes are detected and skipped.
+After migrating, set DB_FINGERPRINTS=true for the scraper.
+
+Usage:
+    python migrate_fingerprints.py [--batch-size 5000]
+"""
+import argparse
+import os
+import sys
+
+import mysql.connector
+from dotenv import load_dotenv
+
+from dedup_index import article_fingerprints
+
+load_dotenv()
+
+
+def column_exists(cursor, column: str) -> bool:
+    cursor.execute("SHOW COLUMNS FROM IPO_Scraped_Articles LIKE %s", (column,))
+    return bool(cursor.fetchall())
+
+
+def index_exists(cursor, index: str) -> bool:
+    cursor.execute("SHOW INDEX FROM IPO_Scraped_Articles WHERE Key_name = %s", (index,))
+    return bool(cursor.fetchall())
+
+
+def add_columns(db) -> None:
+    """Add the nullable fingerprint columns if they are missing."""
+    cursor = db.cursor()
+    try:
+        for column in ('Title_Hash', 'Link_Hash'):
+            if column_exists(cursor, column):
+                print(f"Column {column} already exists.")
+                continue
+            cursor.execute(f"ALTER TABLE IPO_Scraped_Articles ADD COLUMN {column} BIGINT UNSIGNED NULL")
+            print(f"Added column {column}.")
+        db.commit()
+    finally:
+        cursor.close()
+
+
+def backfill(db, batch_size: int) -> None:
+    """Compute fingerprints for every row, walking the table in id order."""
+    read_cursor = db.cursor()
+    write_cursor = db.cursor()
+    seen_titles = set()
+    seen_links = set()
+    last_id = 0
+    updated = 0
+    duplicates = 0
+
+    try:
+        while True:
+            read_cursor.execute(
+                "SELECT id, Title, Article_Link FROM IPO_Scraped_Articles "
+                "WHERE id > %s ORDER BY id LIMIT %s",
+                (last_id, batch_size)
+            )
+            rows = read_cursor.fetchall()
+            if not rows:
+                break
+
+            updates = []
+            for row_id, title, link in rows:
+                title_hash, link_hash = article_fingerprints(title, link)
+                if title_hash in seen_titles or link_hash in seen_links:
+                    # Historical duplicate: keep the row, leave it out of the unique indexes
+                    updates.append((None, None, row_id))
+                    duplicates += 1
+                else:
+                    seen_titles.add(title_hash)
+                    seen_links.add(link_hash)
+                    updates.append((title_hash, link_hash, row_id))
+                last_id = row_id
+
+            write_cursor.executemany(
+                "UPDATE IPO_Scraped_Articles SET Title_Hash = %s, Link_Hash = %s WHERE id = %s",
+                updates
+            )
+            db.commit()
+            updated += len(updates)
+            print(f"Backfilled {updated} rows (up to id {last_id})...")
+    finally:
+        read_cursor.close()
+        write_cursor.close()
+
+    print(f"Backfill complete: {updated} rows, {duplicates} historical duplicates left without hashes.")
+
+
+def add_unique_indexes(db) -> None:
+    """Create the unique indexes that let MySQL reject duplicate articles."""
+    cursor = db.cursor()
+    try:
+        for index, column in (('uq_title_hash', 'Title_Hash'), ('uq_link_hash', 'Link_Hash')):
+            if index_exists(cursor, index):
+                print(f"Index {index} already exists.")
+                continue
+            cursor.execute(f"ALTER TABLE IPO_Scraped_Articles ADD UNIQUE INDEX {index} ({column})")
+            print(f"Added unique index {index}.")
+        db.commit()
+    finally:
+        cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add and backfill article fingerprint columns.")
+    parser.add_argument('--batch-size', type=int, default=5000, help="Rows per backfill batch")
+    args = parser.parse_args()
+
+    try:
+        db = mysql.connector.connect(
+            host=os.getenv('DB_HOST'),
+            user=os.getenv('DB_USER'),
+            password=os.getenv('MYSQL_ROOT_PASSWORD'),
+            database=os.getenv('DB_NAME')
+        )
+    except mysql.connector.Error as err:
+        sys.exit(f"Database connection error: {err}")
+
+    try:
+        add_columns(db)
+        backfill(db, args.batch_size)
+        add_unique_indexes(db)
+        print("Migration complete. Set DB_FINGERPRINTS=true to enable database-enforced dedup.")
+    except mysql.connector.Error as err:
+        db.rollback()
+        sys.exit(f"Migration failed: {err}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import hashlib
+import os
+import pickle
+import re
+import time
+from collections import deque
+from typing import FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+from dedup_index import fingerprint, normalize_text
+
+SNAPSHOT_VERSION = 1
+
+# Words that carry no story identity in headlines
+STOPWORDS = frozenset((
+    'a', 'an', 'the', 'of', 'in', 'on', 'for', 'to', 'and', 'or', 'with', 'by', 'at', 'from', 'as',
+    'is', 'are', 'was', 'be', 'its', 'it', 'this', 'that', 'after', 'over', 'via', 'amid', 'says',
+))
+
+
+def title_tokens(title: str) -> FrozenSet[int]:
+    """Hashed word set of a headline, lowercased, without punctuation or stopwords."""
+    return frozenset(
+        int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'big')
+        for word in re.findall(r'[a-z0-9]+', title.lower()) if word not in STOPWORDS
+    )
+
+
+def jaccard(first: FrozenSet[int], second: FrozenSet[int]) -> float:
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+class NearDuplicateIndex:
+    """
+    Groups headlines that tell the same story across sources.
+
+    Each headline is reduced to its word set and a MinHash signature of
+    num_perm values. Signatures are split into bands of `rows` values and
+    indexed with LSH: headlines whose word sets are similar are very likely to
+    share at least one band exactly, so a lookup only compares against titles
+    in the matching buckets (checked with the exact Jaccard similarity).
+    That keeps lookups well under a millisecond regardless of corpus size.
+
+    Each cluster is identified by the Title_Hash fingerprint of the first
+    headline seen for that story. Only titles added within window_seconds are
+    kept, so the index covers the recent corpus and stays small.
+    """
+
+    def __init__(self, threshold: float = 0.6, num_perm: int = 32, rows: int = 2,
+                 window_seconds: float = 7 * 24 * 3600, snapshot_path: Optional[str] = None, seed: int = 1):
+        if not 0 < threshold <= 1:
+            raise ValueError("Near-duplicate threshold must be in (0, 1]")
+        if num_perm % rows:
+            raise ValueError("num_perm must be a multiple of rows")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.rows = rows
+        self.window_seconds = window_seconds
+        self.snapshot_path = snapshot_path
+        self.seed = seed
+
+        # Multiply-shift hash family: h(x) = (a * x + b) mod 2**64 >> 32, with odd a
+        generator = np.random.default_rng(seed)
+        self._a = generator.integers(0, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = generator.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+
+        self._entries = {}       # entry id -> (tokens, band keys, cluster_id)
+        self._order = deque()    # (added_at, entry id), oldest first, for expiry
+        self._buckets = {}       # (band, band key) -> [entry id, ...]
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _band_keys(self, tokens: FrozenSet[int]) -> List[bytes]:
+        """MinHash signature of the token set, cut into LSH band keys."""
+        if not tokens:
+            return []
+        values = np.fromiter(tokens, dtype=np.uint64, count=len(tokens))
+        with np.errstate(over='ignore'):
+            hashed = (np.multiply.outer(values, self._a) + self._b) >> np.uint64(32)
+        signature = hashed.min(axis=0)
+        return [signature[start:start + self.rows].tobytes() for start in range(0, self.num_perm, self.rows)]
+
+    def find(self, tokens: FrozenSet[int], band_keys: Optional[List[bytes]] = None) -> Optional[Tuple[int, float]]:
+        """Return (cluster_id, similarity) of the most similar indexed title at or above threshold, if any."""
+        if band_keys is None:
+            band_keys = self._band_keys(tokens)
+        best = None
+        seen = set()
+        for band, key in enumerate(band_keys):
+            for entry_id in self._buckets.get((band, key), ()):
+                if entry_id in seen:
+                    continue
+                seen.add(entry_id)
+                other_tokens, _, cluster_id = self._entries[entry_id]
+                similarity = jaccard(tokens, other_tokens)
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (cluster_id, similarity)
+        return best
+
+    def add(self, tokens: FrozenSet[int], cluster_id: int, added_at: Optional[float] = None,
+            band_keys: Optional[List[bytes]] = None) -> None:
+        """Index a title's token set under a cluster."""
+        added_at = time.time() if added_at is None else added_at
+        if band_keys is None:
+            band_keys = self._band_keys(tokens)
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = (tokens, band_keys, cluster_id)
+        self._order.append((added_at, entry_id))
+        for band, key in enumerate(band_keys):
+            self._buckets.setdefault((band, key), []).append(entry_id)
+
+    def assign(self, title: str, added_at: Optional[float] = None) -> Tuple[int, bool]:
+        """
+        Cluster a new headline and index it.
+        Returns tuple of (cluster_id, is_near_duplicate).
+        """
+        self.expire(added_at)
+        tokens = title_tokens(title)
+        band_keys = self._band_keys(tokens)
+        match = self.find(tokens, band_keys)
+        cluster_id = match[0] if match is not None else fingerprint(normalize_text(title))
+        self.add(tokens, cluster_id, added_at, band_keys)
+        return cluster_id, match is not None
+
+    def expire(self, now: Optional[float] = None) -> None:
+        """Drop titles older than the window."""
+        now = time.time() if now is None else now
+        cutoff = now - self.window_seconds
+        while self._order and self._order[0][0] < cutoff:
+            _, entry_id = self._order.popleft()
+            _, band_keys, _ = self._entries.pop(entry_id)
+            for band, key in enumerate(band_keys):
+                bucket = self._buckets[(band, key)]
+                bucket.remove(entry_id)
+                if not bucket:
+                    del self._buckets[(band, key)]
+
+    def _settings(self) -> Tuple:
+        return self.threshold, self.num_perm, self.rows, self.seed
+
+    def load_snapshot(self) -> bool:
+        """Load the snapshot file if it exists and matches this configuration."""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            print(f"Could not read near-duplicate snapshot {self.snapshot_path}: {e}")
+            return False
+
+        if snapshot.get('version') != SNAPSHOT_VERSION or snapshot.get('settings') != self._settings():
+            print("Near-duplicate snapshot is from another version or configuration; ignoring it.")
+            return False
+
+        cutoff = time.time() - self.window_seconds
+        for added_at, tokens, band_keys, cluster_id in snapshot['entries']:
+            if added_at >= cutoff:
+                self.add(tokens, cluster_id, added_at, band_keys)
+        print(f"Warm-started near-duplicate index with {len(self)} recent titles.")
+        return True
+
+    def save_snapshot(self) -> None:
+        """Atomically write the indexed titles (hashed word sets only) to the snapshot file."""
+        if not self.snapshot_path:
+            return
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'settings': self._settings(),
+            'entries': [(added_at, *self._entries[entry_id]) for added_at, entry_id in self._order],
+        }
+        try:
+            tmp_path = f"{self.snapshot_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            print(f"Could not write near-duplicate snapshot {self.snapshot_path}: {e}")
@@ -0,0 +1,318 @@
+"""
+Columnar Parquet cache of IPO_Scraped_Articles.
+
+Layout under the cache directory:
+    state.json                    last exported id and the current file set
+    YYYY-MM-<generation>.parquet  articles scraped in a finished month
+    delta-<generation>.parquet    articles of the current month
+
+The generation goes up by one with every export that writes files.
+
+export() reads only the rows above the last exported id, appends them to
+the delta file, and folds rows of finished months into their month file.
+Ids are assigned at insert time, so a batch can commit below an id that was
+already exported; each export also re-reads the last trailing_ids ids and
+adds the rows it has not exported yet.
+Every write goes to a new file name, then state.json is replaced, so
+readers always see a consistent file set, even while an export runs.
+Files an export replaces stay on disk until the export after it, so a
+reader that read the previous state.json can still open them; a reader
+that is slower than that re-reads the state and tries again.
+Readers memory-map the files through pyarrow.dataset and read only the
+columns they ask for. Month files outside a date range are skipped by
+name, and filters on Scraped_Date and id skip row groups by their
+statistics.
+
+Usage:
+    python parquet_cache.py --export [--dir parquet_cache] [--watch 300]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import mysql.connector
+import pandas as pd
+from dotenv import load_dotenv
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    from pyarrow import fs
+except ImportError:  # Optional: the cache is only used when pyarrow is installed
+    pa = None
+
+load_dotenv()
+
+EXPORT_QUERY = """
+SELECT id, Scraped_Date, Website, Keyword, Title, Article_Link, inserted_at
+FROM IPO_Scraped_Articles
+WHERE id > %s AND id <= %s
+ORDER BY id
+"""
+
+COUNT_KEYS = ['Scraped_Date', 'Website', 'Keyword']
+
+
+def article_schema():
+    return pa.schema([
+        ('id', pa.int64()),
+        ('Scraped_Date', pa.date32()),
+        # A handful of sources and keywords: dictionary-encoded, read back as categoricals
+        ('Website', pa.dictionary(pa.int32(), pa.string())),
+        ('Keyword', pa.dictionary(pa.int32(), pa.string())),
+        ('Title', pa.string()),
+        ('Article_Link', pa.string()),
+        ('inserted_at', pa.timestamp('s')),
+    ])
+
+
+def month_key(day: date) -> str:
+    return day.strftime('%Y-%m')
+
+
+class ParquetArticleCache:
+    """Incrementally exported, month-partitioned Parquet copy of the article table."""
+
+    def __init__(self, root: str, trailing_ids: int = 1000):
+        if pa is None:
+            raise RuntimeError("pyarrow is required for the Parquet article cache (pip install pyarrow)")
+        self.root = root
+        self.trailing_ids = trailing_ids
+        self.state_path = os.path.join(root, 'state.json')
+        self.schema = article_schema()
+        self.filesystem = fs.LocalFileSystem(use_mmap=True)
+
+    def read_state(self) -> Dict:
+        """
+        Last exported id, month files ({month: file name}), delta file name,
+        the files the last export replaced (retired) and the generation.
+        """
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'last_id': 0, 'months': {}, 'delta': None, 'retired': [], 'generation': 0}
+
+    def version(self) -> Optional[int]:
+        """Highest exported article id, or None for an empty cache (like MAX(id) on an empty table)."""
+        return self.read_state()['last_id'] or None
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def _read_file(self, name: Optional[str]):
+        if name is None:
+            return self.schema.empty_table()
+        return pq.read_table(self._path(name), schema=self.schema)
+
+    def _write_file(self, table, name: str) -> None:
+        path = self._path(name)
+        tmp_path = f"{path}.tmp"
+        pq.write_table(table.unify_dictionaries().combine_chunks(), tmp_path)
+        os.replace(tmp_path, path)
+
+    def _write_state(self, state: Dict) -> None:
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    @staticmethod
+    def _files(state: Dict) -> set:
+        """Data files of a state's current generation."""
+        names = set(state['months'].values())
+        if state['delta']:
+            names.add(state['delta'])
+        return names
+
+    def _remove_unreferenced(self, state: Dict) -> None:
+        """Delete data files that are neither current nor retired by the last export."""
+        referenced = self._files(state) | set(state.get('retired', []))
+        for name in os.listdir(self.root):
+            if name.endswith('.parquet') and name not in referenced:
+                try:
+                    os.remove(self._path(name))
+                except OSError:
+                    pass  # Still open elsewhere (Windows); removed by a later export
+
+    def _rows_to_table(self, rows: List[tuple]):
+        columns = list(zip(*rows))
+        return pa.Table.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, self.schema)],
+            schema=self.schema
+        )
+
+    def export(self, db, fetch_size: int = 50000) -> int:
+        """Append articles committed since the last export. Returns the number of rows exported."""
+        os.makedirs(self.root, exist_ok=True)
+        previous = state = self.read_state()
+        cursor = db.cursor()
+        try:
+            cursor.execute("SELECT MAX(id) FROM IPO_Scraped_Articles")
+            max_id = cursor.fetchone()[0] or 0
+            if max_id < state['last_id']:
+                print("Article ids went backwards (table emptied or restored); rebuilding the Parquet cache.")
+                state = {'last_id': 0, 'months': {}, 'delta': None, 'retired': [],
+                         'generation': previous.get('generation', previous['last_id'])}
+            if not max_id:
+                return 0
+
+            # Ids of the trailing window that are already exported
+            after_id = max(state['last_id'] - self.trailing_ids, 0)
+            exported = self.scan(['id'], after_id=after_id).column('id') if state['last_id'] else None
+
+            chunks = []
+            cursor.execute(EXPORT_QUERY, (after_id, max_id))
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                chunks.append(self._rows_to_table(rows))
+        finally:
+            cursor.close()
+            # End the read transaction, so the next export sees rows committed after this one
+            db.commit()
+
+        new_rows = pa.concat_tables(chunks) if chunks else self.schema.empty_table()
+        if exported is not None and len(exported):
+            new_rows = new_rows.filter(pc.invert(pc.is_in(new_rows.column('id'), value_set=exported)))
+        if not new_rows.num_rows:
+            return 0
+        pending = pa.concat_tables([self._read_file(state['delta']), new_rows])
+
+        # Fold rows of finished months into their month files
+        current_month = month_key(date.today())
+        months = pending.column('Scraped_Date').to_pandas().map(month_key)
+        # Caches written before generations were tracked named their files by max id
+        generation = state.get('generation', state['last_id']) + 1
+        new_state = {'last_id': max_id, 'months': dict(state['months']), 'delta': None, 'generation': generation}
+        for month in sorted(set(months) - {current_month}):
+            month_rows = pending.filter(pa.array(months == month))
+            existing = self._read_file(state['months'].get(month))
+            name = f"{month}-{generation}.parquet"
+            self._write_file(pa.concat_tables([existing, month_rows]), name)
+            new_state['months'][month] = name
+
+        delta = pending.filter(pa.array(months == current_month))
+        if delta.num_rows:
+            new_state['delta'] = f"delta-{generation}.parquet"
+            self._write_file(delta, new_state['delta'])
+
+        # Readers of the previous state may still open its files; they are deleted by the next export
+        new_state['retired'] = sorted(self._files(previous) - self._files(new_state))
+        self._write_state(new_state)
+        self._remove_unreferenced(new_state)
+        return new_rows.num_rows
+
+    def scan(self, columns: Optional[List[str]] = None, start: Optional[date] = None, end: Optional[date] = None,
+             after_id: int = 0, through_id: Optional[int] = None):
+        """
+        Articles as a pyarrow Table with only the given columns, scraped
+        between start and end inclusive and with after_id < id <= through_id.
+        """
+        conditions = []
+        if start is not None:
+            conditions.append(ds.field('Scraped_Date') >= pa.scalar(start, pa.date32()))
+        if end is not None:
+            conditions.append(ds.field('Scraped_Date') <= pa.scalar(end, pa.date32()))
+        if after_id:
+            conditions.append(ds.field('id') > after_id)
+        if through_id is not None:
+            conditions.append(ds.field('id') <= through_id)
+        condition = None
+        for part in conditions:
+            condition = part if condition is None else condition & part
+
+        schema = self.schema if columns is None else pa.schema([self.schema.field(column) for column in columns])
+        for attempt in range(3):
+            state = self.read_state()
+            names = [
+                name for month, name in sorted(state['months'].items())
+                if (start is None or month >= month_key(start)) and (end is None or month <= month_key(end))
+            ]
+            if state['delta']:
+                names.append(state['delta'])
+            if not names:
+                return schema.empty_table()
+            try:
+                dataset = ds.dataset([self._path(name) for name in names], schema=self.schema,
+                                     format='parquet', filesystem=self.filesystem)
+                return dataset.to_table(columns=columns, filter=condition)
+            except FileNotFoundError:
+                # Two exports finished since the state was read; read the new one
+                if attempt == 2:
+                    raise
+
+    def tail(self, after_id: int = 0) -> Tuple[Optional[int], int]:
+        """
+        Returns tuple of (highest exported id, exported rows with id > after_id),
+        with None as the id when there are no such rows (like the dashboards' probe query).
+        """
+        ids = self.scan(['id'], after_id=after_id).column('id')
+        if not len(ids):
+            return None, 0
+        return pc.max(ids).as_py(), len(ids)
+
+    def daily_counts(self, after_id: int = 0, through_id: Optional[int] = None,
+                     start: Optional[date] = None, end: Optional[date] = None) -> pd.DataFrame:
+        """
+        Counts per (Scraped_Date, Website, Keyword), the frame the dashboards
+        build ArticleAggregates from. Reads only those three columns and id.
+        """
+        table = self.scan(['id'] + COUNT_KEYS, start, end, after_id, through_id)
+        # Group on plain strings; dictionaries of different files need not match
+        table = table.set_column(2, 'Website', table.column('Website').cast(pa.string()))
+        table = table.set_column(3, 'Keyword', table.column('Keyword').cast(pa.string()))
+        counts = table.group_by(COUNT_KEYS).aggregate([('id', 'count')]).to_pandas()
+        return counts.rename(columns={'id_count': 'Count'})[COUNT_KEYS + ['Count']]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export IPO_Scraped_Articles to the Parquet article cache.")
+    parser.add_argument('--export', action='store_true', help="Export articles inserted since the last export")
+    parser.add_argument('--dir', default=os.getenv('PARQUET_CACHE_DIR') or 'parquet_cache',
+                        help="Cache directory (default: PARQUET_CACHE_DIR or parquet_cache)")
+    parser.add_argument('--watch', type=float, metavar='SECONDS',
+                        help="Keep exporting every SECONDS seconds")
+    args = parser.parse_args()
+    if not args.export:
+        parser.print_help()
+        return
+
+    try:
+        cache = ParquetArticleCache(args.dir)
+    except RuntimeError as err:
+        sys.exit(str(err))
+    try:
+        db = mysql.connector.connect(
+            host=os.getenv('DB_HOST'),
+            user=os.getenv('DB_USER'),
+            password=os.getenv('MYSQL_ROOT_PASSWORD'),
+            database=os.getenv('DB_NAME')
+        )
+    except mysql.connector.Error as err:
+        sys.exit(f"Database connection error: {err}")
+
+    try:
+        while True:
+            exported = cache.export(db)
+            print(f"Exported {exported} articles to {args.dir} (last id {cache.version()}).")
+            if not args.watch:
+                break
+            time.sleep(args.watch)
+    except mysql.connector.Error as err:
+        sys.exit(f"Export failed: {err}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: refills at `rate` tokens per second up to `burst`
+    tokens. Each acquire() takes one token, sleeping until it is available.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, waiting if necessary. Returns seconds spent waiting."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token up front (the balance may go negative) so
+            # concurrent callers queue up behind each other instead of racing
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """
+    One token bucket per host, applied to outbound requests only.
+
+    Limits are configured per host (host_limits, from the RATE_LIMITS setting)
+    and per source (site name, resolved to the source's host); when several
+    apply to one host the strictest rate and burst win. Other hosts fall back
+    to the default limit.
+    """
+
+    def __init__(self, default_rate: float, default_burst: int = 1,
+                 host_limits: Optional[Dict[str, Tuple[float, int]]] = None):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.host_overrides = {host.lower(): limit for host, limit in (host_limits or {}).items()}
+        self._host_limits = dict(self.host_overrides)
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.stats = {}
+        self.reset_stats()
+
+    def configure(self, urls: Dict[str, str], site_limits: Optional[Dict[str, Tuple[float, int]]] = None) -> None:
+        """
+        Resolve per-site (rate, burst) overrides to per-host limits.
+        Buckets whose limit is unchanged keep their state across calls.
+        """
+        site_limits = site_limits or {}
+        host_limits = dict(self.host_overrides)
+        for site_name, url in urls.items():
+            host = urlparse(url).netloc.lower()
+            rate, burst = site_limits.get(site_name, host_limits.get(host, (self.default_rate, self.default_burst)))
+            if host in host_limits:
+                rate = min(rate, host_limits[host][0])
+                burst = min(burst, host_limits[host][1])
+            host_limits[host] = (rate, burst)
+
+        with self._lock:
+            self._host_limits = host_limits
+            for host, bucket in list(self._buckets.items()):
+                if (bucket.rate, bucket.burst) != host_limits.get(host, (self.default_rate, self.default_burst)):
+                    del self._buckets[host]
+
+    def _bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self._host_limits.get(host, (self.default_rate, self.default_burst))
+                bucket = TokenBucket(rate, burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str) -> float:
+        """Wait for a request slot on the URL's host. Returns seconds spent waiting."""
+        host = urlparse(url).netloc.lower()
+        waited = self._bucket(host).acquire()
+
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['wait_seconds'] += waited
+            if waited > 0:
+                self.stats['waited_requests'] += 1
+                self.stats['max_wait_seconds'] = max(self.stats['max_wait_seconds'], waited)
+                per_host = self.stats['wait_seconds_by_host']
+                per_host[host] = per_host.get(host, 0.0) + waited
+        return waited
+
+    def reset_stats(self) -> None:
+        """Reset the per-run wait counters."""
+        with self._lock:
+            self.stats = {
+                'requests': 0,
+                'waited_requests': 0,
+                'wait_seconds': 0.0,
+                'max_wait_seconds': 0.0,
+                'wait_seconds_by_host': {},
+            }
+
+    def print_stats(self) -> None:
+        """Print the per-run wait counters."""
+        with self._lock:
+            stats = dict(self.stats)
+            by_host = dict(stats['wait_seconds_by_host'])
+        print(f"Rate limiter: {stats['requests']} requests, "
+              f"{stats['waited_requests']} waited, "
+              f"Total wait: {stats['wait_seconds']:.2f}s, "
+              f"Max wait: {stats['max_wait_seconds']:.2f}s")
+        for host, waited in sorted(by_host.items(), key=lambda item: item[1], reverse=True):
+            print(f"  {host}: {waited:.2f}s waiting")
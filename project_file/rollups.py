@@ -0,0 +1,129 @@
+"""
+Daily article count rollups.
+
+IPO_Article_Daily_Counts holds the number of articles per
+(Scraped_Date, Website, Keyword). With DAILY_ROLLUPS=true the scraper adds
+to it in the same transaction that inserts the articles, and both analytics
+dashboards read it instead of counting IPO_Scraped_Articles, so their
+queries cost the same however many years of articles are stored.
+
+--rebuild creates the table if needed and recounts it from every stored
+article in one transaction (readers keep seeing the old counts until it
+commits). Run it once before enabling DAILY_ROLLUPS, and again after any
+manual change to IPO_Scraped_Articles.
+
+Usage:
+    python rollups.py --rebuild
+"""
+import argparse
+import os
+import sys
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import mysql.connector
+from dotenv import load_dotenv
+
+load_dotenv()
+
+ROLLUP_TABLE = """
+CREATE TABLE IF NOT EXISTS IPO_Article_Daily_Counts (
+    Scraped_Date DATE NOT NULL,
+    Website VARCHAR(100) NOT NULL,
+    Keyword VARCHAR(50) NOT NULL,
+    Article_Count INT UNSIGNED NOT NULL DEFAULT 0,
+    PRIMARY KEY (Scraped_Date, Website, Keyword)
+)
+"""
+
+INCREMENT_QUERY = """
+INSERT INTO IPO_Article_Daily_Counts (Scraped_Date, Website, Keyword, Article_Count)
+VALUES (%s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE Article_Count = Article_Count + VALUES(Article_Count)
+"""
+
+REBUILD_QUERY = """
+INSERT INTO IPO_Article_Daily_Counts (Scraped_Date, Website, Keyword, Article_Count)
+SELECT Scraped_Date, Website, Keyword, COUNT(*)
+FROM IPO_Scraped_Articles
+GROUP BY Scraped_Date, Website, Keyword
+"""
+
+RollupKey = Tuple[object, str, str]
+
+
+def count_rows(rows: List[Tuple]) -> Dict[RollupKey, int]:
+    """Articles per (Scraped_Date, Website, Keyword) in insert rows (see build_insert_rows)."""
+    return Counter((row[0], row[1], row[2]) for row in rows)
+
+
+def inserted_counts(cursor, rows: List[Tuple], first_id: int) -> Dict[RollupKey, int]:
+    """
+    Articles per rollup key among rows that a fingerprinted batch actually
+    wrote. Rows skipped by ON DUPLICATE KEY UPDATE either were not written or
+    already existed with an id below first_id, the first id this batch
+    inserted, so the batch's own rows are found by Link_Hash and id.
+    """
+    link_hashes = [row[6] for row in rows]
+    cursor.execute(
+        f"SELECT Scraped_Date, Website, Keyword, COUNT(*) FROM IPO_Scraped_Articles "
+        f"WHERE id >= %s AND Link_Hash IN ({', '.join(['%s'] * len(link_hashes))}) "
+        f"GROUP BY Scraped_Date, Website, Keyword",
+        [first_id] + link_hashes
+    )
+    return {(scraped_date, website, keyword): count for scraped_date, website, keyword, count in cursor.fetchall()}
+
+
+def apply_counts(cursor, counts: Dict[RollupKey, int]) -> None:
+    """Add counts to the rollup table. The caller commits, together with the article rows."""
+    if counts:
+        cursor.executemany(INCREMENT_QUERY, [key + (count,) for key, count in counts.items()])
+
+
+def rebuild(db) -> int:
+    """Recount the rollup table from IPO_Scraped_Articles. Returns the number of rollup rows."""
+    cursor = db.cursor()
+    try:
+        cursor.execute(ROLLUP_TABLE)
+        cursor.execute("DELETE FROM IPO_Article_Daily_Counts")
+        cursor.execute(REBUILD_QUERY)
+        rollup_rows = cursor.rowcount
+        db.commit()
+        return rollup_rows
+    except mysql.connector.Error:
+        db.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the daily article count rollup table.")
+    parser.add_argument('--rebuild', action='store_true', help="Create the table and recount every article")
+    args = parser.parse_args()
+    if not args.rebuild:
+        parser.print_help()
+        return
+
+    try:
+        db = mysql.connector.connect(
+            host=os.getenv('DB_HOST'),
+            user=os.getenv('DB_USER'),
+            password=os.getenv('MYSQL_ROOT_PASSWORD'),
+            database=os.getenv('DB_NAME')
+        )
+    except mysql.connector.Error as err:
+        sys.exit(f"Database connection error: {err}")
+
+    try:
+        rollup_rows = rebuild(db)
+        print(f"Rebuilt IPO_Article_Daily_Counts: {rollup_rows} (date, source, keyword) rows.")
+        print("Set DAILY_ROLLUPS=true to keep it current and read it from the dashboards.")
+    except mysql.connector.Error as err:
+        sys.exit(f"Rebuild failed: {err}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import threading
+from datetime import date, datetime, timedelta
+from typing import Iterator, NamedTuple, Optional, Set
+
+try:
+    import zstandard
+except ImportError:  # Optional: gzip is used when zstandard is not installed
+    zstandard = None
+
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+class PageSnapshot(NamedTuple):
+    """One fetched page as recorded in a run manifest."""
+    site: str
+    url: str
+    fetched_at: datetime
+    content_hash: str
+    size: int
+    path: str
+
+    def read(self) -> bytes:
+        """Decompress and return the page content."""
+        return read_object(self.path)
+
+
+def read_object(path: str) -> bytes:
+    """Decompress a stored page object based on its suffix."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if path.endswith('.zst'):
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read .zst snapshots (pip install zstandard)")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class PageSnapshotStore:
+    """
+    Content-addressed store of every page the scraper fetched.
+
+    Layout under root:
+        objects/<first 2 hex chars>/<sha256>.html.gz|.zst   compressed page bodies
+        manifests/<YYYY-MM-DD>/<run id>.jsonl               one line per fetched page
+
+    A page body is written once per content hash, so a page that did not
+    change between runs costs only a manifest line. Manifests are grouped by
+    date, so iterating a site over a date range reads only those manifests and
+    decompresses only the matching pages. evict() removes manifest days past
+    retention_days (and the oldest days while objects exceed max_bytes), then
+    deletes objects that no remaining manifest references.
+    """
+
+    def __init__(self, root: str, compression: str = 'gzip', retention_days: int = 30, max_bytes: int = 0):
+        if compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"Unknown snapshot compression '{compression}'. "
+                             f"Choose one of: {', '.join(COMPRESSION_SUFFIXES)}")
+        if compression == 'zstd' and zstandard is None:
+            print("zstandard is not installed; page snapshots fall back to gzip.")
+            compression = 'gzip'
+        self.root = root
+        self.compression = compression
+        self.retention_days = retention_days
+        self.max_bytes = max_bytes
+        self.objects_dir = os.path.join(root, 'objects')
+        self.manifests_dir = os.path.join(root, 'manifests')
+        self._lock = threading.Lock()
+        self._manifest = None
+        self.stats = {}
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Reset the per-run counters."""
+        self.stats = {'pages': 0, 'new_objects': 0, 'bytes_raw': 0, 'bytes_written': 0}
+
+    def start_run(self) -> None:
+        """Open a new manifest for this run."""
+        with self._lock:
+            self._close_manifest()
+            self._open_manifest()
+        self.reset_stats()
+
+    def _open_manifest(self) -> None:
+        now = datetime.now()
+        day_dir = os.path.join(self.manifests_dir, now.strftime('%Y-%m-%d'))
+        os.makedirs(day_dir, exist_ok=True)
+        run_id = f"{now.strftime('%H%M%S')}-{os.getpid()}"
+        self._manifest = open(os.path.join(day_dir, f"{run_id}.jsonl"), 'a', encoding='utf-8')
+
+    def _close_manifest(self) -> None:
+        if self._manifest is not None:
+            self._manifest.close()
+            self._manifest = None
+
+    def _object_path(self, content_hash: str, suffix: str) -> str:
+        return os.path.join(self.objects_dir, content_hash[:2], f"{content_hash}.html{suffix}")
+
+    def _find_object(self, content_hash: str) -> Optional[str]:
+        """Existing object for a hash in any compression, or None."""
+        for suffix in COMPRESSION_SUFFIXES.values():
+            path = self._object_path(content_hash, suffix)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _compress(self, content: bytes) -> bytes:
+        if self.compression == 'zstd':
+            return zstandard.ZstdCompressor(level=10).compress(content)
+        return gzip.compress(content, compresslevel=6)
+
+    def record(self, site: str, url: str, content: bytes) -> None:
+        """Store a fetched page (once per distinct content) and add it to the run manifest."""
+        content_hash = hashlib.sha256(content).hexdigest()
+        try:
+            path = self._find_object(content_hash)
+            new_object = path is None
+            if new_object:
+                path = self._object_path(content_hash, COMPRESSION_SUFFIXES[self.compression])
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                data = self._compress(content)
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+
+            entry = {
+                'site': site,
+                'url': url,
+                'fetched_at': datetime.now().isoformat(timespec='seconds'),
+                'hash': content_hash,
+                'size': len(content),
+                'object': os.path.relpath(path, self.root),
+            }
+            with self._lock:
+                # Pages fetched outside run_scraper (e.g. benchmarks) still get a manifest
+                if self._manifest is None:
+                    self._open_manifest()
+                self._manifest.write(json.dumps(entry) + '\n')
+                self._manifest.flush()
+                self.stats['pages'] += 1
+                self.stats['bytes_raw'] += len(content)
+                if new_object:
+                    self.stats['new_objects'] += 1
+                    self.stats['bytes_written'] += len(data)
+        except OSError as e:
+            print(f"Could not snapshot page {url}: {e}")
+
+    def finish_run(self) -> None:
+        """Close the run manifest and apply the eviction policy."""
+        with self._lock:
+            self._close_manifest()
+        self.evict()
+
+    def _manifest_days(self):
+        """Manifest day directories as (date, path), oldest first."""
+        if not os.path.isdir(self.manifests_dir):
+            return []
+        days = []
+        for name in os.listdir(self.manifests_dir):
+            try:
+                days.append((datetime.strptime(name, '%Y-%m-%d').date(), os.path.join(self.manifests_dir, name)))
+            except ValueError:
+                continue
+        return sorted(days)
+
+    def _referenced_objects(self) -> Set[str]:
+        referenced = set()
+        for _, day_dir in self._manifest_days():
+            for name in os.listdir(day_dir):
+                with open(os.path.join(day_dir, name), 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if line.strip():
+                            referenced.add(json.loads(line)['object'])
+        return referenced
+
+    def _object_sizes(self):
+        """(relative path, size, mtime) of every stored object."""
+        objects = []
+        if not os.path.isdir(self.objects_dir):
+            return objects
+        for prefix in os.listdir(self.objects_dir):
+            prefix_dir = os.path.join(self.objects_dir, prefix)
+            for entry in os.scandir(prefix_dir):
+                if not entry.name.endswith('.tmp'):
+                    stat = entry.stat()
+                    objects.append((os.path.relpath(entry.path, self.root), stat.st_size, stat.st_mtime))
+        return objects
+
+    def _collect_garbage(self) -> int:
+        """Delete objects no manifest references. Returns bytes still stored."""
+        referenced = self._referenced_objects()
+        total = 0
+        for relative_path, size, _ in self._object_sizes():
+            if relative_path in referenced:
+                total += size
+            else:
+                os.remove(os.path.join(self.root, relative_path))
+        return total
+
+    def evict(self) -> None:
+        """Apply retention and size limits. The current day is never evicted."""
+        with self._lock:
+            try:
+                today = date.today()
+                days = self._manifest_days()
+                if self.retention_days:
+                    cutoff = today - timedelta(days=self.retention_days)
+                    for day, day_dir in days:
+                        if day < cutoff:
+                            shutil.rmtree(day_dir)
+                    days = [(day, day_dir) for day, day_dir in days if day >= cutoff]
+
+                total = self._collect_garbage()
+                while self.max_bytes and total > self.max_bytes and days and days[0][0] < today:
+                    _, day_dir = days.pop(0)
+                    shutil.rmtree(day_dir)
+                    total = self._collect_garbage()
+            except OSError as e:
+                print(f"Could not evict page snapshots: {e}")
+
+    def iter_snapshots(self, site: Optional[str] = None, start: Optional[date] = None,
+                       end: Optional[date] = None) -> Iterator[PageSnapshot]:
+        """
+        Yield recorded pages for a site (all sites by default) fetched between
+        start and end inclusive, oldest first. Only the manifests for those days
+        are read; page bodies are decompressed on PageSnapshot.read().
+        """
+        for day, day_dir in self._manifest_days():
+            if (start and day < start) or (end and day > end):
+                continue
+            for name in sorted(os.listdir(day_dir)):
+                with open(os.path.join(day_dir, name), 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        entry = json.loads(line)
+                        if site is not None and entry['site'] != site:
+                            continue
+                        yield PageSnapshot(
+                            entry['site'],
+                            entry['url'],
+                            datetime.fromisoformat(entry['fetched_at']),
+                            entry['hash'],
+                            entry['size'],
+                            os.path.join(self.root, entry['object'])
+                        )
+
+    def print_stats(self) -> None:
+        """Print the per-run counters."""
+        stats = dict(self.stats)
+        print(f"Page snapshots: {stats['pages']} pages, {stats['new_objects']} new, "
+              f"{stats['bytes_raw'] / 1024:.1f} KB fetched, {stats['bytes_written'] / 1024:.1f} KB written")
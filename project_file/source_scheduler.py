@@ -0,0 +1,114 @@
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+
+
+class SourceScheduler:
+    """
+    Per-source polling schedule that adapts to how often each source yields
+    new relevant articles.
+
+    Every source keeps its own interval and next-due time. After each poll the
+    source's arrival rate (new relevant articles per second) is updated as an
+    exponentially weighted average, and the next interval is chosen so that a
+    poll is expected to find about `target_per_poll` new articles, clamped to
+    [min_interval, max_interval]. Sources that have never produced anything back
+    off multiplicatively towards max_interval instead.
+    """
+
+    def __init__(self, sources: Iterable[str], base_interval: float, min_interval: float, max_interval: float,
+                 state_path: Optional[str] = None, smoothing: float = 0.3, target_per_poll: float = 1.0,
+                 backoff: float = 1.5):
+        """Intervals are in seconds; state_path persists the schedule across restarts."""
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("Poll interval bounds must satisfy 0 < min_interval <= max_interval")
+        self.base_interval = min(max(base_interval, min_interval), max_interval)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.state_path = state_path
+        self.smoothing = smoothing
+        self.target_per_poll = target_per_poll
+        self.backoff = backoff
+
+        saved = self._load_state()
+        now = time.time()
+        self.sources = {}
+        for source in sources:
+            state = saved.get(source)
+            if state is None:
+                # New sources are due immediately at the base interval
+                state = {'interval': self.base_interval, 'next_due': now, 'rate': 0.0, 'last_poll': None}
+            state['interval'] = self._clamp(state['interval'])
+            self.sources[source] = state
+
+    def _clamp(self, interval: float) -> float:
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def _load_state(self) -> Dict[str, Dict]:
+        """Load the saved schedule, ignoring a missing or corrupt file."""
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not read schedule state {self.state_path}: {e}")
+            return {}
+
+    def save_state(self) -> None:
+        """Atomically write the schedule to state_path."""
+        if not self.state_path:
+            return
+        try:
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.sources, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"Could not write schedule state {self.state_path}: {e}")
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """Sources whose next-due time has passed, in configuration order."""
+        now = time.time() if now is None else now
+        return [source for source, state in self.sources.items() if state['next_due'] <= now]
+
+    def seconds_until_next_due(self, now: Optional[float] = None) -> float:
+        """Seconds until the earliest source becomes due (0 when one already is)."""
+        now = time.time() if now is None else now
+        if not self.sources:
+            return self.max_interval
+        return max(0.0, min(state['next_due'] for state in self.sources.values()) - now)
+
+    def record(self, source: str, new_articles: int, now: Optional[float] = None) -> float:
+        """
+        Record the outcome of polling a source and schedule its next poll.
+        Returns the source's new interval in seconds.
+        """
+        now = time.time() if now is None else now
+        state = self.sources[source]
+        if state['last_poll'] is None:
+            # First poll: the page shows roughly one base interval of history
+            state['rate'] = new_articles / state['interval']
+        else:
+            # Downtime between runs is capped so a restart does not erase the estimate
+            elapsed = min(max(now - state['last_poll'], 1.0), self.max_interval)
+            observed_rate = new_articles / elapsed
+            state['rate'] = self.smoothing * observed_rate + (1 - self.smoothing) * state['rate']
+
+        if state['rate'] > 0:
+            interval = self.target_per_poll / state['rate']
+        else:
+            interval = state['interval'] * self.backoff
+        state['interval'] = self._clamp(interval)
+        state['last_poll'] = now
+        state['next_due'] = now + state['interval']
+        return state['interval']
+
+    def print_schedule(self, now: Optional[float] = None) -> None:
+        """Print each source's interval and time until it is next due."""
+        now = time.time() if now is None else now
+        print("\nPolling schedule:")
+        for source, state in sorted(self.sources.items(), key=lambda item: item[1]['next_due']):
+            due_in = max(0.0, state['next_due'] - now) / 60
+            print(f"  {source:<16} every {state['interval'] / 60:6.1f} min, next in {due_in:6.1f} min")
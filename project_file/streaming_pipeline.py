@@ -0,0 +1,228 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Set, Tuple
+from urllib.parse import urlparse
+
+from html_parsers import response_encoding
+
+# End-of-stream marker passed down each queue once a stage has finished
+_DONE = object()
+
+
+class StreamingPipeline:
+    """
+    Streaming alternative to scrape_articles + insert_into_db for one run.
+
+    Stages run concurrently and are connected by bounded queues:
+
+        fetch (worker pool) -> parse/extract -> normalize/dedup/classify -> batched insert
+
+    Relevant articles are inserted as soon as a batch fills up or the oldest
+    buffered article has waited flush_seconds, instead of after the slowest
+    site finishes. Memory is bounded by the queue sizes rather than the run:
+    at most queue_size fetched pages, extracted links and pending articles
+    are held at once. The insert stage runs on the calling thread, so the
+    scraper's database connection is only ever used from one thread.
+    """
+
+    def __init__(self, scraper, queue_size: int = 100, flush_seconds: float = 2.0, batch_size: int = 100):
+        self.scraper = scraper
+        self.queue_size = queue_size
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+
+    def run(self, scraped_date: str, existing_titles: Set[str], existing_links: Set[str],
+            sites: Dict[str, str]) -> Tuple[Dict[str, int], bool]:
+        """
+        Stream every site through the pipeline.
+        Returns tuple of (new relevant articles per site, whether every insert succeeded).
+        """
+        pages = queue.Queue(maxsize=self.queue_size)
+        candidates = queue.Queue(maxsize=self.queue_size)
+        records = queue.Queue(maxsize=self.queue_size)
+
+        self.new_per_site = {site_name: 0 for site_name in sites}
+        self.relevant_but_excluded_articles = []
+        self.totals = {'processed': 0, 'relevant': 0, 'duplicates': 0, 'links_dropped': 0,
+                       'relevant_but_excluded': 0, 'failed_sites': 0}
+        self.latencies = []
+
+        stages = [
+            threading.Thread(target=self._fetch_stage, args=(sites, pages), name='pipeline-fetch', daemon=True),
+            threading.Thread(target=self._extract_stage, args=(pages, candidates), name='pipeline-extract',
+                             daemon=True),
+            threading.Thread(target=self._process_stage,
+                             args=(candidates, records, scraped_date, existing_titles, existing_links),
+                             name='pipeline-process', daemon=True),
+        ]
+        for stage in stages:
+            stage.start()
+
+        all_inserted = self._insert_stage(records)
+
+        for stage in stages:
+            stage.join()
+
+        self.print_summary()
+        self.scraper.print_relevant_but_excluded_articles(self.relevant_but_excluded_articles)
+        return self.new_per_site, all_inserted
+
+    def _fetch_stage(self, sites: Dict[str, str], pages: queue.Queue) -> None:
+        """Fetch pages in parallel (bounded globally and per host) and queue the responses."""
+        scraper = self.scraper
+        host_limits = scraper.build_host_limits(sites)
+
+        def fetch(site_name: str, url: str) -> None:
+            response = None
+            try:
+                with host_limits[urlparse(url).netloc.lower()]:
+                    response = scraper.fetch_page(url, timeout=scraper.config['request_timeout'])
+            except Exception as e:
+                print(f"Unexpected error fetching {site_name}: {e}")
+            pages.put((site_name, url, response))
+
+        try:
+            with ThreadPoolExecutor(max_workers=scraper.config['max_workers']) as executor:
+                for site_name, url in sites.items():
+                    executor.submit(fetch, site_name, url)
+        finally:
+            pages.put(_DONE)
+
+    def _extract_stage(self, pages: queue.Queue, candidates: queue.Queue) -> None:
+        """Parse each fetched page and queue its (url, title) pairs followed by a per-site marker."""
+        scraper = self.scraper
+        try:
+            while True:
+                item = pages.get()
+                if item is _DONE:
+                    break
+                site_name, url, response = item
+
+                extraction = None
+                try:
+                    if response is not None and response.status_code == 304:
+                        print(f"{site_name} not modified since last run, skipping.")
+                        extraction = [], 0
+                    elif response is not None:
+                        soup = scraper.parse_html(url, response.content, response_encoding(response))
+                        if soup is not None:
+                            extraction = scraper.extract_site_articles(site_name, soup, url)
+                except Exception as e:
+                    print(f"Unexpected error extracting {site_name}: {e}")
+
+                if extraction is None:
+                    print(f"Failed to fetch {site_name}")
+                    candidates.put(('site_failed', site_name, None))
+                    continue
+
+                raw_articles, duplicates_dropped = extraction
+                parsed_at = time.monotonic()
+                for article_url, heading in raw_articles:
+                    candidates.put(('article', site_name, (article_url, heading, parsed_at)))
+                candidates.put(('site_done', site_name, (len(raw_articles), duplicates_dropped)))
+        finally:
+            candidates.put(_DONE)
+
+    def _process_stage(self, candidates: queue.Queue, records: queue.Queue, scraped_date: str,
+                       existing_titles: Set[str], existing_links: Set[str]) -> None:
+        """Normalize, dedupe and classify candidates; queue relevant articles for insertion."""
+        site_counts = {}
+        try:
+            while True:
+                item = candidates.get()
+                if item is _DONE:
+                    break
+                kind, site_name, payload = item
+                counts = site_counts.setdefault(site_name, {'processed': 0, 'relevant': 0, 'duplicates': 0,
+                                                            'relevant_but_excluded': 0})
+
+                if kind == 'site_failed':
+                    self.totals['failed_sites'] += 1
+                    continue
+
+                if kind == 'site_done':
+                    raw_count, duplicates_dropped = payload
+                    print(f"{site_name}: Found={raw_count} ({duplicates_dropped} duplicate links dropped), "
+                          f"Processed={counts['processed']}, Relevant={counts['relevant']}, "
+                          f"Duplicates={counts['duplicates']}, "
+                          f"Relevant_but_Excluded={counts['relevant_but_excluded']}")
+                    self.totals['links_dropped'] += duplicates_dropped
+                    for key in ('processed', 'relevant', 'duplicates', 'relevant_but_excluded'):
+                        self.totals[key] += counts[key]
+                    continue
+
+                article_url, heading, parsed_at = payload
+                counts['processed'] += 1
+                try:
+                    outcome, record = self.scraper.process_article(
+                        site_name, article_url, heading, scraped_date, existing_titles, existing_links
+                    )
+                except Exception as e:
+                    print(f"Unexpected error processing article from {site_name}: {e}")
+                    continue
+
+                if outcome == 'duplicate':
+                    counts['duplicates'] += 1
+                elif outcome == 'excluded':
+                    counts['relevant_but_excluded'] += 1
+                    self.relevant_but_excluded_articles.append(record)
+                elif outcome == 'relevant':
+                    counts['relevant'] += 1
+                    self.new_per_site[site_name] += 1
+                    records.put((record, parsed_at))
+        finally:
+            records.put(_DONE)
+
+    def _insert_stage(self, records: queue.Queue) -> bool:
+        """Insert relevant articles in batches, flushing on batch size or flush_seconds."""
+        all_inserted = True
+        batch = []
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = records.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is not None and item is not _DONE:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_seconds
+
+            flush_due = deadline is not None and time.monotonic() >= deadline
+            if batch and (item is _DONE or len(batch) >= self.batch_size or flush_due):
+                all_inserted = self._flush(batch) and all_inserted
+                batch = []
+                deadline = None
+
+            if item is _DONE:
+                return all_inserted
+
+    def _flush(self, batch: List[Tuple[Dict, float]]) -> bool:
+        """Write one batch and record how long each article waited since its page was parsed."""
+        articles = [record for record, _ in batch]
+        self.scraper.print_articles(articles)
+        inserted = self.scraper.insert_into_db(articles)
+        now = time.monotonic()
+        self.latencies.extend(now - parsed_at for _, parsed_at in batch)
+        return inserted
+
+    def print_summary(self) -> None:
+        """Print run totals and parse-to-insert latency."""
+        totals = self.totals
+        print(f"\n--- Streaming Summary ---")
+        print(f"Total processed: {totals['processed']}")
+        print(f"Total relevant: {totals['relevant']}")
+        print(f"Total duplicates skipped: {totals['duplicates']}")
+        print(f"Total repeated links dropped during extraction: {totals['links_dropped']}")
+        print(f"Total relevant but excluded: {totals['relevant_but_excluded']}")
+        print(f"Sites failed: {totals['failed_sites']}")
+        if self.latencies:
+            ordered = sorted(self.latencies)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            print(f"Parse-to-insert latency: avg {sum(ordered) / len(ordered):.2f}s, "
+                  f"p95 {p95:.2f}s, max {ordered[-1]:.2f}s")